@@ -34,6 +34,7 @@ async def get_ai_settings(
     # Migrate legacy key if needed
     if current_user.ai_api_key and not current_user.api_key_token:
         try:
+            db.add(current_user)  # Resolved users are detached
             APITokenService.migrate_legacy_key(db, current_user)
         except Exception as e:
             logger.warning(f"Failed to migrate legacy API key for user {current_user.username}: {e}")
@@ -55,6 +56,8 @@ async def update_ai_settings(
 ):
     """Update user's AI settings"""
     try:
+        db.add(current_user)  # Resolved users are detached
+
         # Update AI settings
         current_user.ai_provider = settings.ai_provider.value
         current_user.ai_model = settings.ai_model
@@ -132,6 +135,7 @@ async def clear_api_key(
 ):
     """Clear user's API key"""
     try:
+        db.add(current_user)  # Resolved users are detached
         APITokenService.delete_api_key(db, current_user)
 
         logger.info(f"Cleared API key for user {current_user.username}")
@@ -155,6 +159,7 @@ async def rotate_api_token(
     Useful if the token is accidentally exposed.
     """
     try:
+        db.add(current_user)  # Resolved users are detached
         new_token = APITokenService.rotate_token(db, current_user)
 
         logger.info(f"Rotated API token for user {current_user.username}")
@@ -8,7 +8,7 @@ import logging
 from datetime import timedelta
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
@@ -16,8 +16,11 @@ from ...models.database import get_db
 from ...models.user import User
 from ...schemas.user import UserCreate, UserResponse, UserUpdate
 from ...auth import (
+    AUTH_COOKIE_NAME,
     Token,
     create_access_token,
+    oauth2_scheme,
+    principal_cache,
     get_current_active_user,
     set_auth_cookie,
     clear_auth_cookie,
@@ -121,8 +124,15 @@ async def login(
 
 
 @router.post("/logout")
-async def logout(response: Response):
-    """Clear authentication cookie"""
+async def logout(
+    request: Request,
+    response: Response,
+    header_token: Optional[str] = Depends(oauth2_scheme)
+):
+    """Clear authentication cookie and the cached user of the token"""
+    token = header_token or request.cookies.get(AUTH_COOKIE_NAME)
+    if token:
+        principal_cache.invalidate_token(token)
     clear_auth_cookie(response)
     return {"message": "Successfully logged out"}
 
@@ -149,6 +159,8 @@ async def update_user_info(
     db: Session = Depends(get_db)
 ):
     """Update current user information"""
+    db.add(current_user)  # Resolved users are detached
+
     # Check email if provided
     if user_data.email and user_data.email != current_user.email:
         if not validate_email(user_data.email):
@@ -6,12 +6,14 @@ import pandas as pd
 from datetime import datetime, timedelta
 import logging
 import hashlib
+import asyncio
 import warnings
 
 from ...models.database import get_db
 from ...auth import get_current_user
 from ...schemas.hot_stocks import HotStockResponse
 from ...services.cache_service import cache
+from ...services.fundamentals_service import fundamentals_service
 
 # Deaktiviere yfinance Debug-Logs und Warnungen
 logging.getLogger('yfinance').setLevel(logging.WARNING)
@@ -54,14 +56,15 @@ async def get_hot_stocks(
         # Get market data for popular symbols (limit to first 10 for speed)
         symbols_to_fetch = POPULAR_SYMBOLS[:min(limit, 10)]
         
+        # Company names from the fundamentals service (no ticker.info per request)
+        fundamentals = await asyncio.to_thread(fundamentals_service.get_many, symbols_to_fetch)
+        
         for symbol in symbols_to_fetch:
             try:
                 # Get stock data with timeout
                 stock = yf.Ticker(symbol)
                 
-                # Get basic info first
-                info = stock.info
-                company_name = info.get('longName', symbol)
+                company_name = (fundamentals.get(symbol) or {}).get('name') or symbol
                 
                 # Get historical data (only 2 days for speed)
                 hist = stock.history(period="2d", interval="1d")
@@ -8,36 +8,51 @@ Provides endpoints for:
 - Signal Performance Tracking
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import json
+import numpy as np
+import pandas as pd
 import logging
 
-from ...models.database import get_db
+from ...models.database import get_async_db, get_db, session_scope
 from ...auth import get_current_active_user, User
 from ...api.utils.market_utils import (
-    fetch_yfinance_data,
     get_market_data_info,
     _to_builtin,
-    TIMEFRAME_MAP,
     get_timestamp
 )
+from ...services.market_data import fetch_yfinance_data, epoch_seconds
 
 # Import functions from existing services (not classes!)
 from ...services.technical_indicators import calculate_technical_indicators
 from ...services.pattern_detection import detect_patterns
 from ...services.signal_generation import generate_signals
-from ...services.risk_metrics import calculate_risk_metrics
+from ...services.risk_engine import risk_engine
+from ...services.portfolio_risk import calculate_portfolio_risk
+from ...services.bar_store import bar_store
+from ...services.correlation_service import correlation_service
+from ...models.watchlist import Watchlist
+from .hot_stocks import POPULAR_SYMBOLS
 from ...services.master_score_service import MasterScoreService
+from ...services.scoring_profiles import COMPONENTS, CompiledScoringProfile, scoring_profiles, validate_profile
+from ...models.investment_engine import ScoringProfile
 from ...services.sentiment_service import SentimentAnalysisService
+from ...services.sentiment_correlation import sentiment_correlation, sentiment_history
 from ...services.unusual_activity_service import UnusualActivityService
-from ...services.signal_performance_service import SignalPerformanceService
+from ...services.signal_performance_service import SignalPerformanceService, signal_from_recommendation
 
 from ...schemas.investment_engine import (
     MasterScoreResponse,
     SentimentAnalysisResponse,
     UnusualActivityResponse,
     SignalPerformanceResponse,
-    InvestmentDecisionResponse
+    InvestmentDecisionResponse,
+    ScoringProfileBase,
+    ScoringProfileCreate,
+    ScoringProfileResponse
 )
 
 logger = logging.getLogger(__name__)
@@ -45,21 +60,26 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/investment-engine", tags=["Investment Decision Engine"])
 
 
-# Helper function to convert hist to market data list
-def _hist_to_market_data_list(hist):
-    """Convert pandas DataFrame to market data list format"""
-    import pandas as pd
-    market_data = []
-    for idx, row in hist.iterrows():
-        market_data.append({
-            'timestamp': idx.isoformat(),
-            'open': float(row['Open']),
-            'high': float(row['High']),
-            'low': float(row['Low']),
-            'close': float(row['Close']),
-            'volume': int(row['Volume']) if 'Volume' in row and pd.notna(row['Volume']) else 0
-        })
-    return market_data
+def _resolve_universe(symbols: Optional[str], universe: str, db: Session, user: User) -> List[str]:
+    """Symbols from an explicit comma-separated list, the user's watchlist or the hot stocks list"""
+    if symbols:
+        return list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
+    if universe == "hot_stocks":
+        return list(POPULAR_SYMBOLS)
+    return [
+        row.symbol for row in db.query(Watchlist.symbol).filter(
+            Watchlist.user_id == user.id,
+            Watchlist.is_active == True
+        ).distinct()
+    ]
+
+
+def _resolve_profile(db: Session, name: Optional[str], user: User) -> CompiledScoringProfile:
+    """Resolve the scoring profile for a request (404 if an explicit name is unknown)"""
+    profile = scoring_profiles.resolve(db, name, user)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Scoring profile '{name}' not found")
+    return profile
 
 
 # ============================================================================
@@ -70,6 +90,7 @@ def _hist_to_market_data_list(hist):
 async def get_master_score(
     symbol: str,
     timeframe: str = Query("1Y", regex="^(1D|1W|1M|3M|6M|YTD|1Y)$"),
+    profile: Optional[str] = Query(None, description="Scoring profile (defaults to the user's profile)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -83,8 +104,11 @@ async def get_master_score(
     - Risk metrics (20%): Volatility, Drawdown
 
     Returns a score with recommendation (STRONG_BUY to STRONG_SELL).
+    Weights and thresholds follow the selected scoring profile.
     """
     try:
+        scoring_profile = _resolve_profile(db, profile, current_user)
+
         # Fetch market data using existing utility
         hist = fetch_yfinance_data(symbol, timeframe)
 
@@ -97,8 +121,8 @@ async def get_master_score(
         # Generate signals (using existing function)
         signals = generate_signals(hist, technical_indicators)
 
-        # Calculate risk metrics (using existing function)
-        risk_metrics = calculate_risk_metrics(hist, technical_indicators)
+        # Calculate risk metrics (incremental per symbol/timeframe)
+        risk_metrics = risk_engine.get_risk_metrics(f"{symbol}:{timeframe}", hist, technical_indicators)
 
         # Detect patterns
         patterns = detect_patterns(hist)
@@ -109,7 +133,8 @@ async def get_master_score(
             technical_indicators=technical_indicators,
             signals=signals,
             risk_metrics=risk_metrics,
-            patterns=patterns
+            patterns=patterns,
+            profile=scoring_profile
         )
 
         return _to_builtin(result)
@@ -121,6 +146,429 @@ async def get_master_score(
         raise HTTPException(status_code=500, detail=f"Error calculating master score: {str(e)}")
 
 
+@router.get("/master-score/{symbol}/history")
+async def get_master_score_history(
+    symbol: str,
+    timeframe: str = Query("1Y", regex="^(1D|1W|1M|3M|6M|YTD|1Y)$"),
+    profile: Optional[str] = Query(None, description="Scoring profile (defaults to the user's profile)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Calculate the Master Investment Score for every bar of the history.
+
+    Uses the same weights and thresholds as /master-score/{symbol}, computed
+    in one vectorized pass. Suitable for score charts, score-crossing alerts
+    and backtests.
+    """
+    try:
+        scoring_profile = _resolve_profile(db, profile, current_user)
+        hist = fetch_yfinance_data(symbol, timeframe)
+
+        if hist is None or hist.empty:
+            raise HTTPException(status_code=404, detail=f"Market data not found for {symbol}")
+
+        score_service = MasterScoreService()
+        series = score_service.calculate_master_score_series(hist, profile=scoring_profile)
+
+        return _to_builtin({
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "timestamps": epoch_seconds(series.index).tolist(),
+            "master_score": series['master_score'].round(2).tolist(),
+            "short_term": series['short_term'].round(2).tolist(),
+            "medium_term": series['medium_term'].round(2).tolist(),
+            "long_term": series['long_term'].round(2).tolist(),
+            "risk": series['risk'].round(2).tolist(),
+            "recommendation": series['recommendation'].tolist(),
+            "weights": scoring_profile.weights,
+            "profile": scoring_profile.name,
+            "timestamp": get_timestamp()
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error calculating master score history for {symbol}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error calculating master score history: {str(e)}")
+
+
+# ============================================================================
+# Scoring Profile Endpoints
+# ============================================================================
+
+@router.get("/scoring-profiles", response_model=List[ScoringProfileResponse])
+async def list_scoring_profiles(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List built-in and custom scoring profiles"""
+    return [profile.to_dict() for profile in scoring_profiles.list(db)]
+
+
+@router.post("/scoring-profiles", response_model=ScoringProfileResponse, status_code=201)
+async def create_scoring_profile(
+    request: ScoringProfileCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Create a custom scoring profile"""
+    if scoring_profiles.get(db, request.name) is not None:
+        raise HTTPException(status_code=400, detail=f"Scoring profile '{request.name}' already exists")
+    try:
+        weights, thresholds = validate_profile(request.weights, request.thresholds)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    row = ScoringProfile(
+        name=request.name,
+        description=request.description,
+        weights=json.dumps(weights),
+        thresholds=json.dumps(thresholds),
+        created_by=current_user.id
+    )
+    db.add(row)
+    db.commit()
+    scoring_profiles.invalidate(request.name)
+    return scoring_profiles.get(db, request.name).to_dict()
+
+
+@router.put("/scoring-profiles/{name}", response_model=ScoringProfileResponse)
+async def update_scoring_profile(
+    name: str,
+    request: ScoringProfileBase,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Update a custom scoring profile (creator or admin only)"""
+    row = _get_editable_profile(db, name, current_user)
+    try:
+        weights, thresholds = validate_profile(request.weights, request.thresholds)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    row.description = request.description
+    row.weights = json.dumps(weights)
+    row.thresholds = json.dumps(thresholds)
+    db.commit()
+    scoring_profiles.invalidate(name)
+    return scoring_profiles.get(db, name).to_dict()
+
+
+@router.delete("/scoring-profiles/{name}")
+async def delete_scoring_profile(
+    name: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Delete a custom scoring profile (creator or admin only)"""
+    row = _get_editable_profile(db, name, current_user)
+    db.delete(row)
+    db.query(User).filter(User.scoring_profile == name).update({"scoring_profile": None})
+    db.commit()
+    scoring_profiles.invalidate(name)
+    return {"message": f"Scoring profile '{name}' deleted"}
+
+
+@router.put("/scoring-profiles/{name}/select")
+async def select_scoring_profile(
+    name: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Make a scoring profile the user's default"""
+    if scoring_profiles.get(db, name) is None:
+        raise HTTPException(status_code=404, detail=f"Scoring profile '{name}' not found")
+    db.add(current_user)  # Resolved users are detached
+    current_user.scoring_profile = name
+    db.commit()
+    return {"message": f"Scoring profile '{name}' selected", "profile": name}
+
+
+def _record_signals(signals: List[dict]) -> int:
+    """Record signals for performance tracking (blocking: benchmark lookup and bulk insert)"""
+    with session_scope() as session:
+        return SignalPerformanceService(session).record_signals(signals)
+
+
+def _screen_components(histories: Dict[str, pd.DataFrame], timeframe: str) -> Tuple[List[str], np.ndarray, List[float]]:
+    """
+    Component matrix for the screener (blocking: indicators, signals, risk
+    and patterns per symbol).
+
+    Returns:
+        Screened symbols, their component rows (COMPONENTS order) and
+        confidences; symbols whose analysis fails are skipped
+    """
+    score_service = MasterScoreService()
+    screened, rows, confidences = [], [], []
+    for symbol, hist in histories.items():
+        try:
+            technical_indicators = calculate_technical_indicators(hist)
+            signals = generate_signals(hist, technical_indicators)
+            risk_metrics = risk_engine.get_risk_metrics(f"{symbol}:{timeframe}", hist, technical_indicators)
+            patterns = detect_patterns(hist)
+            components = score_service.calculate_components(
+                technical_indicators, signals, risk_metrics, patterns
+            )
+        except Exception as e:
+            logger.warning(f"Screener skipped {symbol}: {e}")
+            continue
+
+        screened.append(symbol)
+        rows.append([components[c] for c in COMPONENTS])
+        confidences.append(score_service.get_confidence(technical_indicators.get('current', {})))
+    return screened, np.array(rows, dtype=float), confidences
+
+
+def _get_editable_profile(db: Session, name: str, user: User) -> ScoringProfile:
+    if scoring_profiles.is_builtin(name):
+        raise HTTPException(status_code=400, detail="Built-in scoring profiles cannot be changed")
+    row = db.query(ScoringProfile).filter(ScoringProfile.name == name).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Scoring profile '{name}' not found")
+    if row.created_by != user.id and not user.is_admin:
+        raise HTTPException(status_code=403, detail="Not allowed to change this scoring profile")
+    return row
+
+
+# ============================================================================
+# Screener Endpoint
+# ============================================================================
+
+@router.get("/screener")
+async def screen_symbols(
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols (overrides universe)"),
+    universe: str = Query("hot_stocks", regex="^(watchlist|hot_stocks)$"),
+    profiles: Optional[str] = Query(None, description="Comma-separated scoring profiles (defaults to the user's profile)"),
+    timeframe: str = Query("1Y", regex="^(1M|3M|6M|YTD|1Y)$"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Rank symbols by master score under one or more scoring profiles.
+
+    Indicators, signals, risk metrics and patterns are computed once per
+    symbol; each profile is then applied to the shared component matrix.
+    Signals are not recorded here (see POST /screener/record-signals).
+    """
+    try:
+        universe_symbols = _resolve_universe(symbols, universe, db, current_user)
+        if not universe_symbols:
+            raise HTTPException(status_code=400, detail="No symbols to screen")
+
+        profile_names = [p.strip() for p in profiles.split(",") if p.strip()] if profiles else [None]
+        selected = [_resolve_profile(db, name, current_user) for name in profile_names]
+
+        histories = await asyncio.to_thread(bar_store.get_histories, universe_symbols, timeframe)
+        screened, matrix, confidences = await asyncio.to_thread(_screen_components, histories, timeframe)
+        if not screened:
+            raise HTTPException(status_code=404, detail="No market data available for the requested symbols")
+
+        results = {}
+        for profile in selected:
+            scores = profile.score(matrix)
+            labels = profile.classify(scores)
+            order = np.argsort(-scores, kind="stable")[:limit]
+            results[profile.name] = [
+                {
+                    "symbol": screened[i],
+                    "master_score": round(float(scores[i]), 2),
+                    "recommendation": str(labels[i]),
+                    "confidence": confidences[i]
+                }
+                for i in order
+            ]
+
+        return _to_builtin({
+            "profiles": results,
+            "components": {
+                symbol: dict(zip(COMPONENTS, np.round(matrix[i], 2).tolist()))
+                for i, symbol in enumerate(screened)
+            },
+            "missing_symbols": sorted(set(universe_symbols) - set(screened)),
+            "timeframe": timeframe,
+            "timestamp": get_timestamp()
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error running screener: {e}")
+        raise HTTPException(status_code=500, detail=f"Error running screener: {str(e)}")
+
+
+@router.post("/screener/record-signals")
+async def record_screener_signals(
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols (overrides universe)"),
+    universe: str = Query("hot_stocks", regex="^(watchlist|hot_stocks)$"),
+    timeframe: str = Query("1Y", regex="^(1M|3M|6M|YTD|1Y)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Screen symbols with the default scoring profile and record the signals
+    for performance tracking (at most one pending signal per symbol, type
+    and day).
+    """
+    try:
+        universe_symbols = _resolve_universe(symbols, universe, db, current_user)
+        if not universe_symbols:
+            raise HTTPException(status_code=400, detail="No symbols to screen")
+
+        histories = await asyncio.to_thread(bar_store.get_histories, universe_symbols, timeframe)
+        screened, matrix, confidences = await asyncio.to_thread(_screen_components, histories, timeframe)
+        if not screened:
+            raise HTTPException(status_code=404, detail="No market data available for the requested symbols")
+
+        tracked = scoring_profiles.default
+        scores = tracked.score(matrix)
+        labels = tracked.classify(scores)
+        generated = []
+        for i, symbol in enumerate(screened):
+            signal_type, signal_strength = signal_from_recommendation(str(labels[i]), confidences[i])
+            generated.append({
+                "symbol": symbol,
+                "signal_type": signal_type,
+                "signal_strength": signal_strength,
+                "master_score": float(scores[i]),
+                "entry_price": float(histories[symbol]['Close'].iloc[-1]),
+            })
+        recorded = await asyncio.to_thread(_record_signals, generated)
+
+        return {
+            "profile": tracked.name,
+            "signals": len(generated),
+            "recorded": recorded,
+            "timestamp": get_timestamp()
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error recording screener signals: {e}")
+        raise HTTPException(status_code=500, detail=f"Error recording screener signals: {str(e)}")
+
+
+# ============================================================================
+# Portfolio Risk Endpoints
+# ============================================================================
+
+@router.get("/portfolio-risk")
+async def get_portfolio_risk(
+    timeframe: str = Query("1Y", regex="^(3M|6M|YTD|1Y)$"),
+    benchmark: str = Query("SPY", description="Benchmark symbol for beta"),
+    confidence: float = Query(0.95, ge=0.8, le=0.999, description="VaR/CVaR confidence level"),
+    include_covariance: bool = Query(False, description="Include the covariance matrix"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Calculate portfolio risk for the user's watchlist (equal-weighted).
+
+    Returns:
+    - Portfolio volatility and diversification ratio
+    - Historical VaR / CVaR
+    - Maximum and current drawdown
+    - Beta to the benchmark
+    - Per-holding volatility, beta and risk contribution
+    """
+    try:
+        # The bar store keys symbols upper-case
+        symbols = list(dict.fromkeys(
+            row.symbol.upper() for row in db.query(Watchlist.symbol).filter(
+                Watchlist.user_id == current_user.id,
+                Watchlist.is_active == True
+            )
+        ))
+        if not symbols:
+            raise HTTPException(status_code=404, detail="Watchlist is empty")
+
+        benchmark = benchmark.upper()
+        closes = await asyncio.to_thread(bar_store.get_close_matrix, symbols + [benchmark], timeframe)
+        if closes.empty:
+            raise HTTPException(status_code=404, detail="Market data not found for watchlist symbols")
+
+        benchmark_closes = closes[benchmark] if benchmark in closes.columns else None
+        holdings = closes[[s for s in closes.columns if s in symbols]]
+
+        result = calculate_portfolio_risk(
+            holdings,
+            benchmark=benchmark_closes,
+            confidence=confidence,
+            include_covariance=include_covariance
+        )
+        if not result:
+            raise HTTPException(status_code=422, detail="Not enough overlapping history to calculate portfolio risk")
+
+        result.update({
+            "benchmark": benchmark,
+            "timeframe": timeframe,
+            "missing_symbols": sorted(set(symbols) - set(holdings.columns)),
+            "timestamp": get_timestamp()
+        })
+        return _to_builtin(result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error calculating portfolio risk for user {current_user.id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error calculating portfolio risk: {str(e)}")
+
+
+@router.get("/correlations")
+async def get_correlations(
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols (overrides universe)"),
+    universe: str = Query("watchlist", regex="^(watchlist|hot_stocks)$"),
+    timeframe: str = Query("1Y", regex="^(3M|6M|YTD|1Y)$"),
+    window: int = Query(60, ge=10, le=250, description="Rolling window in bars"),
+    top_pairs: int = Query(10, ge=1, le=100),
+    threshold: float = Query(0.8, ge=0.0, le=1.0, description="Correlation that triggers a diversification warning"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get rolling return correlations for a symbol universe.
+
+    Returns:
+    - Correlation matrix (symbols in matrix order)
+    - Most and least correlated pairs
+    - Diversification warnings for highly correlated pairs
+    """
+    try:
+        universe_symbols = _resolve_universe(symbols, universe, db, current_user)
+        if symbols:
+            universe = "custom"
+
+        if len(universe_symbols) < 2:
+            raise HTTPException(status_code=400, detail="At least two symbols are required")
+
+        result = await asyncio.to_thread(
+            correlation_service.get_correlations,
+            universe_symbols,
+            timeframe=timeframe,
+            window=window,
+            top_pairs=top_pairs,
+            threshold=threshold
+        )
+        if not result:
+            raise HTTPException(status_code=422, detail="Not enough overlapping history to calculate correlations")
+
+        result.update({
+            "universe": universe,
+            "timeframe": timeframe,
+            "timestamp": get_timestamp()
+        })
+        return _to_builtin(result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error calculating correlations: {e}")
+        raise HTTPException(status_code=500, detail=f"Error calculating correlations: {str(e)}")
+
+
 # ============================================================================
 # Sentiment Analysis Endpoints
 # ============================================================================
@@ -164,10 +612,131 @@ async def get_sentiment_analysis(
         }
 
 
+@router.get("/sentiment/{symbol}/history")
+async def get_sentiment_history(
+    symbol: str,
+    days: int = Query(90, ge=1, le=365, description="Lookback in days"),
+    window: int = Query(30, ge=5, le=120, description="Rolling correlation window in trading days"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get the stored sentiment history for a symbol.
+
+    Returns:
+    - Sentiment snapshots (score, news count, buzz, correlation at the time)
+    - Daily sentiment paired with next-day returns
+    - Rolling correlation between daily sentiment and next-day returns
+    """
+    try:
+        await asyncio.to_thread(sentiment_correlation.load_bars, [symbol])
+        history = sentiment_history(db, symbol, days=days, window=window)
+        return _to_builtin({
+            "symbol": symbol,
+            "days": days,
+            "window": window,
+            **history,
+            "price_correlation": sentiment_correlation.get_correlation(db, symbol),
+            "timestamp": get_timestamp()
+        })
+
+    except Exception as e:
+        logger.error(f"Error loading sentiment history for {symbol}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error loading sentiment history: {str(e)}")
+
+
+@router.get("/sentiment-batch")
+async def get_sentiment_batch(
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols (overrides universe)"),
+    universe: str = Query("watchlist", regex="^(watchlist|hot_stocks)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Analyze news sentiment for many symbols in one request.
+
+    News is fetched concurrently (with a global concurrency cap); articles
+    returned for several symbols are scored once. Returns per-symbol results
+    in the /sentiment/{symbol} format plus a summary.
+    """
+    try:
+        universe_symbols = _resolve_universe(symbols, universe, db, current_user)
+        if not universe_symbols:
+            raise HTTPException(status_code=400, detail="No symbols to analyze")
+        if len(universe_symbols) > 100:
+            raise HTTPException(status_code=400, detail="At most 100 symbols per request")
+
+        sentiment_service = SentimentAnalysisService(db)
+        results = await sentiment_service.analyze_sentiment_batch(universe_symbols)
+
+        scored = [r for r in results.values() if r.get("breakdown", {}).get("news", {}).get("count")]
+        ranked = sorted(scored, key=lambda r: r["sentiment_score"], reverse=True)
+
+        return _to_builtin({
+            "symbols": results,
+            "summary": {
+                "symbols_analyzed": len(results),
+                "symbols_with_news": len(scored),
+                "average_sentiment": round(sum(r["sentiment_score"] for r in scored) / len(scored), 2) if scored else 0,
+                "most_bullish": [r["symbol"] for r in ranked[:5]],
+                "most_bearish": [r["symbol"] for r in ranked[::-1][:5]],
+            },
+            "timestamp": get_timestamp()
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error analyzing batch sentiment: {e}")
+        raise HTTPException(status_code=500, detail=f"Error analyzing batch sentiment: {str(e)}")
+
+
 # ============================================================================
 # Unusual Activity Endpoints
 # ============================================================================
 
+@router.get("/unusual-activity")
+async def get_active_unusual_activity(
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols (default: all scanned symbols)"),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Active unusual activity detected by the background scanner and on-demand checks.
+
+    Newest detections first; resolved detections are not included.
+    """
+    try:
+        activity_service = UnusualActivityService(db)
+        symbol_list = [s.strip().upper() for s in symbols.split(",") if s.strip()] if symbols else None
+        rows = activity_service.get_active_activities(symbol_list, limit)
+
+        return {
+            "count": len(rows),
+            "activities": [
+                {
+                    "symbol": row.symbol,
+                    "type": row.activity_type,
+                    "timeframe": row.timeframe,
+                    "severity": row.severity,
+                    "confidence": row.confidence,
+                    "details": json.loads(row.details) if row.details else {},
+                    "price_at_detection": row.price_at_detection,
+                    "volume_at_detection": row.volume_at_detection,
+                    "z_score": row.benchmark_deviation,
+                    "hours_since_last_activity": row.hours_since_last_activity,
+                    "timestamp": row.timestamp.isoformat() if row.timestamp else None,
+                }
+                for row in rows
+            ]
+        }
+
+    except Exception as e:
+        logger.error(f"Error loading unusual activity: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to load unusual activity: {str(e)}")
+
+
 @router.get("/unusual-activity/{symbol}", response_model=UnusualActivityResponse)
 async def get_unusual_activity(
     symbol: str,
@@ -187,19 +756,19 @@ async def get_unusual_activity(
     Returns detected activities with severity and interpretation.
     """
     try:
+        symbol = symbol.upper()
+
         # Fetch market data
         hist = fetch_yfinance_data(symbol, timeframe)
 
         if hist is None or hist.empty:
             raise HTTPException(status_code=404, detail=f"Market data not found for {symbol}")
 
-        # Convert to list format for unusual activity service
-        market_data = _hist_to_market_data_list(hist)
         current_price = float(hist['Close'].iloc[-1]) if len(hist) > 0 else None
 
-        # Detect unusual activity
+        # Detect unusual activity against the rolling baselines
         activity_service = UnusualActivityService(db)
-        result = await activity_service.detect_unusual_activity(symbol, market_data, current_price)
+        result = await activity_service.detect_unusual_activity(symbol, hist, current_price, timeframe=timeframe)
         return _to_builtin(result)
 
     except HTTPException:
@@ -226,7 +795,7 @@ async def get_signal_performance(
     symbol: Optional[str] = Query(None, description="Filter by symbol"),
     signal_type: Optional[str] = Query(None, description="Filter by signal type (BUY, SELL, HOLD)"),
     timeframe_days: Optional[int] = Query(None, description="Filter by timeframe (1, 7, 30)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -239,11 +808,13 @@ async def get_signal_performance(
     - Comparison with benchmark (S&P 500)
     """
     try:
-        performance_service = SignalPerformanceService(db)
-        result = performance_service.get_accuracy_metrics(
-            symbol=symbol,
-            signal_type=signal_type,
-            timeframe_days=timeframe_days
+        # The sync service runs on the async connection without blocking the event loop
+        result = await db.run_sync(
+            lambda session: SignalPerformanceService(session).get_accuracy_metrics(
+                symbol=symbol,
+                signal_type=signal_type,
+                timeframe_days=timeframe_days
+            )
         )
         return _to_builtin(result)
 
@@ -271,6 +842,29 @@ async def get_signal_performance(
         }
 
 
+@router.post("/signal-performance/evaluate")
+async def evaluate_signal_performance(
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols (default: all due signals)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Evaluate all recorded signals whose horizon (1, 7 or 30 days) has passed.
+
+    Returns, benchmark (SPY) returns, excess returns and outcomes are filled
+    in with one set-based update.
+    """
+    try:
+        symbol_list = [s.strip().upper() for s in symbols.split(",") if s.strip()] if symbols else None
+        performance_service = SignalPerformanceService(db)
+        evaluated = performance_service.evaluate_pending_signals(symbol_list)
+        return {"evaluated": evaluated, "timestamp": get_timestamp()}
+
+    except Exception as e:
+        logger.error(f"Error evaluating signal performance: {e}")
+        raise HTTPException(status_code=500, detail=f"Error evaluating signal performance: {str(e)}")
+
+
 # ============================================================================
 # Combined Decision Engine Endpoint
 # ============================================================================
@@ -281,6 +875,7 @@ async def get_investment_decision(
     timeframe: str = Query("1Y", regex="^(1D|1W|1M|3M|6M|YTD|1Y)$"),
     include_sentiment: bool = Query(True, description="Include sentiment analysis"),
     include_activity: bool = Query(True, description="Include unusual activity detection"),
+    profile: Optional[str] = Query(None, description="Scoring profile (defaults to the user's profile)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -296,6 +891,8 @@ async def get_investment_decision(
     Use this to get a comprehensive view before making investment decisions.
     """
     try:
+        scoring_profile = _resolve_profile(db, profile, current_user)
+
         # Fetch market data using existing utility
         hist = fetch_yfinance_data(symbol, timeframe)
 
@@ -310,8 +907,8 @@ async def get_investment_decision(
         # Generate signals (using existing function)
         signals = generate_signals(hist, technical_indicators)
 
-        # Calculate risk metrics (using existing function)
-        risk_metrics = calculate_risk_metrics(hist, technical_indicators)
+        # Calculate risk metrics (incremental per symbol/timeframe)
+        risk_metrics = risk_engine.get_risk_metrics(f"{symbol}:{timeframe}", hist, technical_indicators)
 
         # Detect patterns
         patterns = detect_patterns(hist)
@@ -322,7 +919,8 @@ async def get_investment_decision(
             technical_indicators=technical_indicators,
             signals=signals,
             risk_metrics=risk_metrics,
-            patterns=patterns
+            patterns=patterns,
+            profile=scoring_profile
         )
 
         # Sentiment analysis (optional)
@@ -338,15 +936,29 @@ async def get_investment_decision(
         unusual_activity = None
         if include_activity:
             try:
-                market_data = _hist_to_market_data_list(hist)
                 activity_service = UnusualActivityService(db)
-                unusual_activity = await activity_service.detect_unusual_activity(symbol, market_data, current_price)
+                unusual_activity = await activity_service.detect_unusual_activity(
+                    symbol, hist, current_price, timeframe=timeframe
+                )
             except Exception as e:
                 logger.warning(f"Unusual activity detection failed for {symbol}: {e}")
 
-        # Signal performance
-        performance_service = SignalPerformanceService(db)
-        signal_performance = performance_service.get_accuracy_metrics(symbol=symbol)
+        # Signal performance (record the default profile's signal for later evaluation)
+        tracked_score = master_score if scoring_profile is scoring_profiles.default else (
+            score_service.calculate_master_score(technical_indicators, signals, risk_metrics, patterns)
+        )
+        signal_type, signal_strength = signal_from_recommendation(
+            tracked_score.get("recommendation"), tracked_score.get("confidence")
+        )
+        await asyncio.to_thread(_record_signals, [{
+            "symbol": symbol,
+            "signal_type": signal_type,
+            "signal_strength": signal_strength,
+            "master_score": tracked_score.get("master_score"),
+            "sentiment_score": sentiment.get("sentiment_score") if sentiment else None,
+            "entry_price": current_price,
+        }])
+        signal_performance = SignalPerformanceService(db).get_accuracy_metrics(symbol=symbol)
 
         # Calculate overall data quality
         available_indicators = sum(1 for v in technical_indicators.get('current', {}).values() if v is not None)
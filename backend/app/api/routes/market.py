@@ -9,6 +9,7 @@ import yfinance as yf
 from ...models.database import get_db
 from ...services.market_service import MarketService
 from ...services.ai_analysis_service import MarketAIAnalysis
+from ...services.currency_resolver import currency_resolver
 from ...auth import get_current_active_user, User
 
 logger = logging.getLogger(__name__)
@@ -96,32 +97,13 @@ market_ai.set_debug(True)
 async def get_market_data(
         symbol: str,
         timeframe: str = Query("1d", regex="^(1d|5d|1mo|3mo|6mo|1y|2y|5y|max)$"),
+        format: str = Query("records", regex="^(records|columnar)$"),
         db: Session = Depends(get_db),
         current_user: User = Depends(get_current_active_user)
 ):
     try:
-        # Währungsbestimmung basierend auf Symbol-Suffix
-        currency = "USD"
-        currency_symbol = "$"
-
-        if symbol.endswith('.T'):  # Japanische Börse
-            currency = "JPY"
-            currency_symbol = "¥"
-        elif symbol.endswith('.L'):  # London
-            currency = "GBP"
-            currency_symbol = "£"
-        elif symbol.endswith('.HK'):  # Hong Kong
-            currency = "HKD"
-            currency_symbol = "HK$"
-        elif symbol.endswith('.KS'):  # Korea
-            currency = "KRW"
-            currency_symbol = "₩"
-        elif symbol.endswith('.SS') or symbol.endswith('.SZ'):  # Shanghai/Shenzhen
-            currency = "CNY"
-            currency_symbol = "¥"
-
         market_service = MarketService(db)
-        data = await market_service.fetch_market_data(symbol, timeframe)
+        data = await market_service.fetch_market_data(symbol, timeframe, orient=format)
         if not data:
             raise HTTPException(status_code=404, detail=f"Market data not found for symbol {symbol}")
 
@@ -129,8 +111,7 @@ async def get_market_data(
             "symbol": symbol,
             "timeframe": timeframe,
             "data": data,
-            "currency": currency,
-            "currencySymbol": currency_symbol,
+            **currency_resolver.resolve(symbol),
             "timestamp": datetime.now().isoformat()
         }
 
@@ -216,10 +197,11 @@ async def validate_symbol(
 @router.get("/search")
 async def search_stocks(
     query: str,
+    limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Suche nach Stocks basierend auf Symbol oder Name"""
     market_service = MarketService(db)
-    results = await market_service.search_stocks(query)
+    results = await market_service.search_stocks(query, limit)
     return results
\ No newline at end of file
@@ -7,7 +7,7 @@ pattern detection, signals, risk metrics, and AI insights.
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import Optional
-import yfinance as yf
+import asyncio
 import pandas as pd
 from datetime import datetime
 import logging
@@ -19,15 +19,16 @@ from ...services.ai_provider_service import ai_provider_service
 from ...services.api_token_service import APITokenService
 
 # Import from new modular services
-from ...services.technical_indicators import calculate_technical_indicators
-from ...services.pattern_detection import detect_patterns
-from ...services.signal_generation import generate_signals
-from ...services.risk_metrics import calculate_risk_metrics
+from ...services.risk_engine import risk_engine, calculate_rolling_risk_series
+from ...services.analysis_cache import analysis_cache
+from ...services.bar_store import bar_store
+from ...services.currency_resolver import currency_resolver
+from ...services.fundamentals_service import fundamentals_service
+from ...services.prefetcher import watchlist_prefetcher
+from ...services.market_data import epoch_seconds
 from ...api.utils.market_utils import (
-    fetch_yfinance_data,
     get_market_data_info,
     _to_builtin,
-    TIMEFRAME_MAP,
     get_timestamp
 )
 
@@ -47,33 +48,25 @@ async def get_market_analysis(
     Get comprehensive market analysis with AI insights using user's AI settings.
     """
     try:
-        # Fetch market data using utility
-        hist = fetch_yfinance_data(symbol, timeframe)
+        # History, indicators, patterns and signals (prefetched for watched symbols)
+        watchlist_prefetcher.note_request(timeframe)
+        cached = analysis_cache.get_analysis(symbol, timeframe)
 
-        if hist is None or hist.empty:
+        if cached is None:
             raise HTTPException(status_code=404, detail=f"Market data not found for symbol {symbol}")
+        hist, analysis = cached
+        technical_indicators = analysis["technical_indicators"]
+        patterns = analysis["patterns"]
+        signals = analysis["signals"]
 
-        # Get ticker info
-        ticker = yf.Ticker(symbol)
+        # Market cap, P/E and 52-week range (cached, refreshed in the background)
+        fundamentals = await asyncio.to_thread(fundamentals_service.get, symbol)
 
         # Prepare market data for AI analysis
-        market_data = get_market_data_info(ticker, hist)
-
-        # Calculate technical indicators using modular service
-        technical_indicators = calculate_technical_indicators(hist)
-
-        # Detect patterns using modular service
-        try:
-            patterns = detect_patterns(hist)
-        except Exception as e:
-            logger.error(f"Error detecting patterns for {symbol}: {str(e)}")
-            patterns = []
-
-        # Generate signals using modular service
-        signals = generate_signals(hist, technical_indicators)
+        market_data = get_market_data_info(symbol, hist, fundamentals)
 
-        # Calculate risk metrics using modular service
-        risk_metrics = calculate_risk_metrics(hist, technical_indicators)
+        # Calculate risk metrics incrementally (only new bars are processed)
+        risk_metrics = risk_engine.get_risk_metrics(f"{symbol}:{timeframe}", hist, technical_indicators)
 
         # Generate AI analysis using user's settings (structured for frontend)
         ai_analysis = None
@@ -114,8 +107,7 @@ async def get_market_analysis(
             "risk_metrics": risk_metrics,
             "ai_analysis": ai_analysis,
             "timeframe": timeframe,
-            "currency": "USD",
-            "currencySymbol": "$"
+            **currency_resolver.resolve(symbol)
         }
         return _to_builtin(response)
 
@@ -135,12 +127,14 @@ async def get_indicators(
 ):
     """Get technical indicators for a symbol."""
     try:
-        hist = fetch_yfinance_data(symbol, timeframe)
-        if hist is None or hist.empty:
+        watchlist_prefetcher.note_request(timeframe)
+        cached = analysis_cache.get_analysis(symbol, timeframe)
+        if cached is None:
             raise HTTPException(status_code=404, detail=f"Market data not found for symbol {symbol}")
 
-        indicators = calculate_technical_indicators(hist)
-        return _to_builtin(indicators)
+        return _to_builtin(cached[1]["technical_indicators"])
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error calculating indicators for {symbol}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error calculating indicators: {str(e)}")
@@ -155,12 +149,14 @@ async def get_patterns(
 ):
     """Get detected patterns for a symbol."""
     try:
-        hist = fetch_yfinance_data(symbol, timeframe)
-        if hist is None or hist.empty:
+        watchlist_prefetcher.note_request(timeframe)
+        cached = analysis_cache.get_analysis(symbol, timeframe)
+        if cached is None:
             raise HTTPException(status_code=404, detail=f"Market data not found for symbol {symbol}")
 
-        patterns = detect_patterns(hist)
-        return _to_builtin(patterns)
+        return _to_builtin(cached[1]["patterns"])
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error detecting patterns for {symbol}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error detecting patterns: {str(e)}")
@@ -175,13 +171,14 @@ async def get_signals(
 ):
     """Get trading signals for a symbol."""
     try:
-        hist = fetch_yfinance_data(symbol, timeframe)
-        if hist is None or hist.empty:
+        watchlist_prefetcher.note_request(timeframe)
+        cached = analysis_cache.get_analysis(symbol, timeframe)
+        if cached is None:
             raise HTTPException(status_code=404, detail=f"Market data not found for symbol {symbol}")
 
-        indicators = calculate_technical_indicators(hist)
-        signals = generate_signals(hist, indicators)
-        return _to_builtin(signals)
+        return _to_builtin(cached[1]["signals"])
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating signals for {symbol}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating signals: {str(e)}")
@@ -196,13 +193,41 @@ async def get_risk_metrics_endpoint(
 ):
     """Get risk metrics for a symbol."""
     try:
-        hist = fetch_yfinance_data(symbol, timeframe)
-        if hist is None or hist.empty:
+        watchlist_prefetcher.note_request(timeframe)
+        cached = analysis_cache.get_analysis(symbol, timeframe)
+        if cached is None:
             raise HTTPException(status_code=404, detail=f"Market data not found for symbol {symbol}")
 
-        indicators = calculate_technical_indicators(hist)
-        risk_metrics = calculate_risk_metrics(hist, indicators)
+        hist, analysis = cached
+        risk_metrics = risk_engine.get_risk_metrics(f"{symbol}:{timeframe}", hist, analysis["technical_indicators"])
         return _to_builtin(risk_metrics)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error calculating risk metrics for {symbol}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error calculating risk metrics: {str(e)}")
+
+
+
+# Rolling risk metrics for every bar (risk charts)
+@router.get("/risk-metrics/{symbol}/series")
+async def get_risk_metrics_series(
+    symbol: str,
+    timeframe: str = Query("1Y", regex="^(1D|1W|1M|3M|6M|YTD|1Y)$"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get rolling risk metrics for every bar of a symbol's history."""
+    try:
+        hist = bar_store.get_history(symbol, timeframe)
+        if hist is None or hist.empty:
+            raise HTTPException(status_code=404, detail=f"Market data not found for symbol {symbol}")
+
+        series = calculate_rolling_risk_series(hist)
+        response = {"timestamps": epoch_seconds(series.index).tolist()}
+        response.update({column: series[column].round(4).tolist() for column in series.columns})
+        return _to_builtin(response)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error calculating risk metrics series for {symbol}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error calculating risk metrics series: {str(e)}")
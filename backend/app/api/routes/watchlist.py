@@ -1,13 +1,15 @@
 # api/routes/watchlist.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from ...models.database import get_db
+from ...models.database import get_async_db
 from ...models.user import User
 from ...models.watchlist import Watchlist
 from ...schemas.watchlist import WatchlistCreate, WatchlistUpdate, WatchlistResponse, WatchlistWithData
 from ...auth import get_current_active_user
-from ...services.market_service import MarketService
+from ...services.quote_service import quote_service
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,49 +18,36 @@ router = APIRouter()
 @router.get("/", response_model=List[WatchlistResponse])
 async def get_watchlist(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's watchlist"""
-    watchlist = db.query(Watchlist).filter(
-        Watchlist.user_id == current_user.id,
-        Watchlist.is_active == True
-    ).all()
+    watchlist = (await db.execute(
+        select(Watchlist).where(
+            Watchlist.user_id == current_user.id,
+            Watchlist.is_active == True
+        )
+    )).scalars().all()
     return watchlist
 
 @router.get("/with-data", response_model=List[WatchlistWithData])
 async def get_watchlist_with_data(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's watchlist with current market data"""
-    watchlist = db.query(Watchlist).filter(
-        Watchlist.user_id == current_user.id,
-        Watchlist.is_active == True
-    ).all()
+    watchlist = (await db.execute(
+        select(Watchlist).where(
+            Watchlist.user_id == current_user.id,
+            Watchlist.is_active == True
+        )
+    )).scalars().all()
     
+    # One bulk quote lookup for the whole watchlist, off the event loop
+    quotes = await asyncio.to_thread(quote_service.get_quotes, [item.symbol for item in watchlist])
+
     result = []
     for item in watchlist:
-        try:
-            # Get current market data
-            market_data = MarketService.get_market_data(item.symbol, "1D")
-            if market_data and market_data.get("price"):
-                current_price = market_data["price"]
-                # Calculate price change (simplified - you might want to store previous close)
-                price_change = 0  # This would need to be calculated properly
-                price_change_percent = 0
-                volume = market_data.get("volume", 0)
-            else:
-                current_price = None
-                price_change = None
-                price_change_percent = None
-                volume = None
-        except Exception as e:
-            logger.warning(f"Failed to get market data for {item.symbol}: {e}")
-            current_price = None
-            price_change = None
-            price_change_percent = None
-            volume = None
-        
+        quote = quotes.get(item.symbol.upper(), {})
         watchlist_item = WatchlistWithData(
             id=item.id,
             user_id=item.user_id,
@@ -67,10 +56,11 @@ async def get_watchlist_with_data(
             is_active=item.is_active,
             created_at=item.created_at,
             updated_at=item.updated_at,
-            current_price=current_price,
-            price_change=price_change,
-            price_change_percent=price_change_percent,
-            volume=volume
+            current_price=quote.get("price"),
+            price_change=quote.get("change"),
+            price_change_percent=quote.get("change_percent"),
+            volume=quote.get("volume"),
+            quote_stale=quote.get("stale")
         )
         result.append(watchlist_item)
     
@@ -80,15 +70,17 @@ async def get_watchlist_with_data(
 async def add_to_watchlist(
     watchlist_item: WatchlistCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Add symbol to watchlist"""
     # Check if symbol already exists in user's watchlist
-    existing = db.query(Watchlist).filter(
-        Watchlist.user_id == current_user.id,
-        Watchlist.symbol == watchlist_item.symbol.upper(),
-        Watchlist.is_active == True
-    ).first()
+    existing = (await db.execute(
+        select(Watchlist).where(
+            Watchlist.user_id == current_user.id,
+            Watchlist.symbol == watchlist_item.symbol.upper(),
+            Watchlist.is_active == True
+        )
+    )).scalars().first()
     
     if existing:
         raise HTTPException(
@@ -104,8 +96,8 @@ async def add_to_watchlist(
     )
     
     db.add(db_watchlist)
-    db.commit()
-    db.refresh(db_watchlist)
+    await db.commit()
+    await db.refresh(db_watchlist)
     
     logger.info(f"Added {watchlist_item.symbol} to watchlist for user {current_user.username}")
     return db_watchlist
@@ -115,13 +107,15 @@ async def update_watchlist_item(
     watchlist_id: int,
     watchlist_update: WatchlistUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update watchlist item"""
-    watchlist_item = db.query(Watchlist).filter(
-        Watchlist.id == watchlist_id,
-        Watchlist.user_id == current_user.id
-    ).first()
+    watchlist_item = (await db.execute(
+        select(Watchlist).where(
+            Watchlist.id == watchlist_id,
+            Watchlist.user_id == current_user.id
+        )
+    )).scalars().first()
     
     if not watchlist_item:
         raise HTTPException(
@@ -136,8 +130,8 @@ async def update_watchlist_item(
             value = value.upper()
         setattr(watchlist_item, field, value)
     
-    db.commit()
-    db.refresh(watchlist_item)
+    await db.commit()
+    await db.refresh(watchlist_item)
     
     logger.info(f"Updated watchlist item {watchlist_id} for user {current_user.username}")
     return watchlist_item
@@ -146,13 +140,15 @@ async def update_watchlist_item(
 async def remove_from_watchlist(
     watchlist_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Remove symbol from watchlist (soft delete)"""
-    watchlist_item = db.query(Watchlist).filter(
-        Watchlist.id == watchlist_id,
-        Watchlist.user_id == current_user.id
-    ).first()
+    watchlist_item = (await db.execute(
+        select(Watchlist).where(
+            Watchlist.id == watchlist_id,
+            Watchlist.user_id == current_user.id
+        )
+    )).scalars().first()
     
     if not watchlist_item:
         raise HTTPException(
@@ -162,7 +158,7 @@ async def remove_from_watchlist(
     
     # Soft delete
     watchlist_item.is_active = False
-    db.commit()
+    await db.commit()
     
     logger.info(f"Removed {watchlist_item.symbol} from watchlist for user {current_user.username}")
     return {"message": "Symbol removed from watchlist"}
@@ -171,14 +167,16 @@ async def remove_from_watchlist(
 async def remove_symbol_from_watchlist(
     symbol: str,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Remove symbol from watchlist by symbol name"""
-    watchlist_item = db.query(Watchlist).filter(
-        Watchlist.user_id == current_user.id,
-        Watchlist.symbol == symbol.upper(),
-        Watchlist.is_active == True
-    ).first()
+    watchlist_item = (await db.execute(
+        select(Watchlist).where(
+            Watchlist.user_id == current_user.id,
+            Watchlist.symbol == symbol.upper(),
+            Watchlist.is_active == True
+        )
+    )).scalars().first()
     
     if not watchlist_item:
         raise HTTPException(
@@ -188,7 +186,7 @@ async def remove_symbol_from_watchlist(
     
     # Soft delete
     watchlist_item.is_active = False
-    db.commit()
+    await db.commit()
     
     logger.info(f"Removed {symbol} from watchlist for user {current_user.username}")
     return {"message": f"Symbol {symbol} removed from watchlist"}
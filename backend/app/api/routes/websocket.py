@@ -1,10 +1,11 @@
 # app/api/routes/websocket.py
-from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
+from sqlalchemy import select
 from datetime import datetime
 import logging
 
-from ...models.database import get_db
+from ...models.database import AsyncSessionLocal
+from ...models.watchlist import Watchlist
 from ...services.websocket_manager import WebSocketManager
 from ...auth import get_token_from_ws_query, verify_ws_token
 
@@ -19,6 +20,7 @@ async def websocket_general_info():
     
     **WebSocket Endpoints:**
     - Market data: `ws://localhost:8000/api/v1/ws/market/{symbol}?token=YOUR_JWT_TOKEN`
+    - Unusual activity alerts: `ws://localhost:8000/api/v1/ws/alerts?token=YOUR_JWT_TOKEN`
     
     **Authentication:** JWT token required as query parameter for all WebSocket connections.
     
@@ -26,7 +28,8 @@ async def websocket_general_info():
     """
     return {
         "websocket_endpoints": {
-            "market_data": "ws://localhost:8000/api/v1/ws/market/{symbol}?token=YOUR_JWT_TOKEN"
+            "market_data": "ws://localhost:8000/api/v1/ws/market/{symbol}?token=YOUR_JWT_TOKEN",
+            "unusual_activity_alerts": "ws://localhost:8000/api/v1/ws/alerts?token=YOUR_JWT_TOKEN"
         },
         "authentication": "JWT token required as query parameter",
         "message_types": ["subscribe", "timeframe_change", "ping"],
@@ -64,8 +67,7 @@ async def websocket_info(symbol: str):
 @router.websocket("/market/{symbol}")
 async def websocket_endpoint(
         websocket: WebSocket,
-        symbol: str,
-        db: Session = Depends(get_db)
+        symbol: str
 ):
     # Auth for WebSocket
     token = await get_token_from_ws_query(websocket)
@@ -73,7 +75,9 @@ async def websocket_endpoint(
         await websocket.close(code=4001, reason="Authentication required")
         return
 
-    user = await verify_ws_token(token)
+    # The session is only needed for the handshake, not for the lifetime of the socket
+    async with AsyncSessionLocal() as db:
+        user = await verify_ws_token(token, db)
     if not user:
         await websocket.close(code=4001, reason="Invalid authentication token")
         return
@@ -108,4 +112,71 @@ async def websocket_endpoint(
                 except:
                     break
     finally:
-        await ws_manager.disconnect(websocket, symbol)
\ No newline at end of file
+        await ws_manager.disconnect(websocket, symbol)
+
+
+@router.websocket("/alerts")
+async def alerts_endpoint(
+        websocket: WebSocket
+):
+    """
+    Push unusual activity detected by the background scanner.
+
+    Users receive alerts for their watchlist symbols by default. Send
+    `{"type": "subscribe", "symbols": ["AAPL", ...]}` to change the symbols
+    of this connection, or `{"type": "subscribe", "symbols": "*"}` for the whole scanned universe.
+    """
+    token = await get_token_from_ws_query(websocket)
+    if not token:
+        await websocket.close(code=4001, reason="Authentication required")
+        return
+
+    async with AsyncSessionLocal() as db:
+        user = await verify_ws_token(token, db)
+        if not user:
+            await websocket.close(code=4001, reason="Invalid authentication token")
+            return
+
+        watchlist_symbols = set((await db.execute(
+            select(Watchlist.symbol).where(
+                Watchlist.user_id == user.id,
+                Watchlist.is_active == True
+            )
+        )).scalars())
+
+    await websocket.accept()
+    await ws_manager.connect_alerts(websocket, user.id, watchlist_symbols)
+    try:
+        while True:
+            try:
+                data = await websocket.receive_json()
+                message_type = data.get('type')
+
+                if message_type == 'subscribe':
+                    symbols = data.get('symbols') or []
+                    if symbols != '*' and not (
+                        isinstance(symbols, list) and all(isinstance(s, str) and s for s in symbols)
+                    ):
+                        await websocket.send_json({
+                            "type": "error",
+                            "message": 'symbols must be a list of symbols or "*"'
+                        })
+                        continue
+                    ws_manager.set_alert_symbols(websocket, None if symbols == '*' else set(symbols))
+                    await websocket.send_json({"type": "subscribed", "symbols": symbols})
+                elif message_type == 'ping':
+                    await websocket.send_json({"type": "pong"})
+
+            except WebSocketDisconnect:
+                break
+            except Exception as e:
+                logging.error(f"Alert WebSocket error: {str(e)}")
+                try:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": "Internal server error"
+                    })
+                except:
+                    break
+    finally:
+        await ws_manager.disconnect_alerts(websocket, user.id)
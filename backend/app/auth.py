@@ -4,13 +4,19 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from passlib.context import CryptContext
 from pydantic import BaseModel
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
-from sqlalchemy.orm import Session
-from .models.database import get_db
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import event, inspect as sa_inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from .models.database import get_async_db
 from .models.user import User
 from .config import get_settings
+import hashlib
 import logging
+import threading
+import time
 import jwt  # Changed from jose
 from jwt.exceptions import DecodeError  # Changed from JWTDecodeError
 
@@ -79,9 +85,121 @@ async def _get_token_optional(
     return _get_token_from_cookie(request)
 
 
+class PrincipalCache:
+    """
+    Short-lived cache of users resolved from JWTs.
+
+    Entries are keyed by the SHA-256 of the token and hold a snapshot of the
+    user's columns; they expire after ttl_seconds or with the token, whichever
+    comes first, and the cache is bounded with least-recently-used eviction.
+    A hit is rebuilt as a detached User without a query.
+    """
+
+    def __init__(self, ttl_seconds: int = 60, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[User]:
+        """Cached user for a token (detached), or None"""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, values = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def put(self, token: str, user: User, token_expires_at: Optional[float] = None) -> None:
+        """Cache the user resolved from a token"""
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        values = {attr.key: getattr(user, attr.key) for attr in sa_inspect(User).column_attrs}
+        with self._lock:
+            self._entries[self._key(token)] = (expires_at, user.id, values)
+            self._entries.move_to_end(self._key(token))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_token(self, token: str) -> None:
+        """Drop the entry of one token (logout)"""
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every entry of a user (profile, password or permission changes)"""
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry[1] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(settings.AUTH_CACHE_TTL, settings.AUTH_CACHE_SIZE)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User) -> None:
+    principal_cache.invalidate_user(target.id)
+
+
+async def _resolve_user(token, db: AsyncSession) -> Optional[User]:
+    """
+    Resolve the user of a JWT, using the principal cache.
+
+    The user is returned detached from any session; routes that change it
+    add it to their own session first (db.add(current_user)).
+    Returns None for invalid tokens and unknown users.
+    """
+    # PyJWT 2.x handles strings correctly
+    # Ensure token is a string (not bytes)
+    token_str = token if isinstance(token, str) else token.decode('utf-8') if isinstance(token, bytes) else str(token)
+
+    user = principal_cache.get(token_str)
+    if user is not None:
+        logger.debug(f"Auth cache hit for user {user.username}")
+        return user
+
+    try:
+        payload = jwt.decode(token_str, settings.auth_secret_key, algorithms=[settings.ALGORITHM])
+    except DecodeError as e:  # Changed from JWTDecodeError
+        logger.error(f"JWT Error during validation: {str(e)}")
+        return None
+
+    username: str = payload.get("sub")
+    if username is None:
+        logger.error("No username in token payload")
+        return None
+
+    user = (await db.execute(select(User).where(User.username == username))).scalar_one_or_none()
+    if user is None:
+        logger.error(f"No user found in database for username: {username}")
+        return None
+    db.expunge(user)
+
+    principal_cache.put(token_str, user, payload.get("exp"))
+    return user
+
+
 async def get_current_user(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     header_token: Optional[str] = Depends(oauth2_scheme)
 ):
     """
@@ -97,39 +215,16 @@ async def get_current_user(
     token = header_token
     if not token:
         token = request.cookies.get(AUTH_COOKIE_NAME)
-    
-    # Debug logging
-    header_auth = request.headers.get("Authorization", "")
-    cookie_token = request.cookies.get(AUTH_COOKIE_NAME, "")
-    logger.info(f"[AUTH DEBUG] Authorization header: {header_auth[:50] if header_auth else 'None'}...")
-    logger.info(f"[AUTH DEBUG] Cookie token: {cookie_token[:50] if cookie_token else 'None'}...")
-    logger.info(f"[AUTH DEBUG] Final token used: {str(token)[:50] if token else 'None'}...")
-    
+
     if not token:
         logger.debug("No auth token found in header or cookie")
         raise credentials_exception
+    logger.debug(f"Auth token from {'header' if header_token else 'cookie'}")
 
-    try:
-        # PyJWT 2.x handles strings correctly
-        # Ensure token is a string (not bytes)
-        token_str = token if isinstance(token, str) else token.decode('utf-8') if isinstance(token, bytes) else str(token)
-        payload = jwt.decode(token_str, settings.auth_secret_key, algorithms=[settings.ALGORITHM])
-
-        username: str = payload.get("sub")
-        if username is None:
-            logger.error("No username in token payload")
-            raise credentials_exception
-
-        user = db.query(User).filter(User.username == username).first()
-        if user is None:
-            logger.error(f"No user found in database for username: {username}")
-            raise credentials_exception
-
-        return user
-
-    except DecodeError as e:  # Changed from JWTDecodeError
-        logger.error(f"JWT Error during validation: {str(e)}")
+    user = await _resolve_user(token, db)
+    if user is None:
         raise credentials_exception
+    return user
 
 
 async def get_current_active_user(
@@ -205,18 +300,8 @@ async def get_token_from_ws_query(websocket: WebSocket) -> Optional[str]:
     return websocket.query_params.get("token")
 
 
-async def verify_ws_token(token: str, db: Session = Depends(get_db)) -> Optional[User]:
-    try:
-        token_str = token if isinstance(token, str) else token.decode('utf-8') if isinstance(token, bytes) else str(token)
-        payload = jwt.decode(token_str, settings.auth_secret_key, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        if not username:
-            return None
-
-        user = db.query(User).filter(User.username == username).first()
-        return user
-    except DecodeError:  # Changed from JWTDecodeError
-        return None
+async def verify_ws_token(token: str, db: AsyncSession = Depends(get_async_db)) -> Optional[User]:
+    return await _resolve_user(token, db)
 
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
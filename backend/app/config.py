@@ -21,6 +21,13 @@ class Settings(BaseSettings):
     # Railway PostgreSQL Configuration
     RAILWAY_DATABASE_URL: Optional[str] = None
 
+    # Connection pool (file-based SQLite and PostgreSQL)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 300  # Seconds before a connection is replaced
+    SQLITE_BUSY_TIMEOUT: int = 5000  # Milliseconds a writer waits for the database lock
+
     # API Keys
     OPENAI_API_KEY: str = "sk-dummy-key"  # Standardwert hinzugefügt (deprecated)
     ALPHA_VANTAGE_KEY: Optional[str] = None  # Optional
@@ -35,6 +42,8 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: Optional[str] = Field(default=None, description="Optional separate JWT secret")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_CACHE_TTL: int = 60  # Seconds a resolved user is reused for the same token
+    AUTH_CACHE_SIZE: int = 1024
 
     # API Configuration
     API_PREFIX: str = "/api/v1"
@@ -46,11 +55,29 @@ class Settings(BaseSettings):
 
     # Cache Settings
     CACHE_DURATION: int = 300
+    QUOTE_CACHE_DURATION: int = 60  # Seconds a quote is served without a refresh
+    QUOTE_MAX_STALE: int = 86400  # Seconds a quote may be served if refreshes fail
 
     # Market Data Settings
     DEFAULT_TIMEFRAME: str = "1d"
     DEFAULT_INTERVAL: str = "1m"
 
+    # Unusual Activity Scanner
+    ACTIVITY_SCANNER_ENABLED: bool = True
+    ACTIVITY_SCAN_INTERVAL: int = 60  # Seconds between scans
+    ACTIVITY_SCAN_TIMEFRAME: str = "1D"  # 5-minute bars
+
+    # Watchlist Prefetcher
+    PREFETCH_ENABLED: bool = True
+    PREFETCH_INTERVAL: int = 240  # Seconds between cycles, keep below CACHE_DURATION
+    PREFETCH_TIMEFRAMES: str = "1D,1M"  # Always prefetched, requested timeframes are added
+    PREFETCH_MAX_SYMBOLS: int = 200
+
+    # Fundamentals metadata (ticker.info)
+    FUNDAMENTALS_TTL: int = 86400  # Seconds before metadata is refetched
+    FUNDAMENTALS_REFRESH_ENABLED: bool = True
+    FUNDAMENTALS_REFRESH_INTERVAL: int = 3600  # Seconds between background refresh cycles
+
     @property
     def cors_origins(self) -> List[str]:
         return [origin.strip() for origin in self.BACKEND_CORS_ORIGINS.split(",")]
@@ -12,7 +12,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from .config import get_settings
-from .models.database import init_db
+from .models.database import async_engine, init_db
 from .auth import SecurityHeadersMiddleware
 from .middleware.rate_limit import limiter
 
@@ -121,6 +121,34 @@ async def startup_event():
     init_db()
     logger.info("✓ Database initialized")
 
+    # Start the unusual activity scanner
+    if settings.ACTIVITY_SCANNER_ENABLED:
+        from .api.routes.hot_stocks import POPULAR_SYMBOLS
+        from .api.routes.websocket import ws_manager
+        from .services.activity_scanner import activity_scanner
+
+        activity_scanner.interval = settings.ACTIVITY_SCAN_INTERVAL
+        activity_scanner.timeframe = settings.ACTIVITY_SCAN_TIMEFRAME
+        activity_scanner.start(POPULAR_SYMBOLS, on_alert=ws_manager.broadcast_alert)
+        logger.info("✓ Unusual activity scanner: enabled")
+
+    # Keep histories and analyses of watched symbols warm
+    if settings.PREFETCH_ENABLED:
+        from .services.prefetcher import watchlist_prefetcher
+
+        watchlist_prefetcher.interval = settings.PREFETCH_INTERVAL
+        watchlist_prefetcher.timeframes = [tf.strip() for tf in settings.PREFETCH_TIMEFRAMES.split(",") if tf.strip()]
+        watchlist_prefetcher.max_symbols = settings.PREFETCH_MAX_SYMBOLS
+        watchlist_prefetcher.start()
+        logger.info("✓ Watchlist prefetcher: enabled")
+
+    # Refresh fundamentals of watched and recently used symbols before they expire
+    if settings.FUNDAMENTALS_REFRESH_ENABLED:
+        from .services.fundamentals_service import fundamentals_service
+
+        fundamentals_service.start()
+        logger.info("✓ Fundamentals refresh: enabled")
+
     # Log security configuration
     logger.info(f"✓ CORS origins: {settings.cors_origins}")
     logger.info(f"✓ Rate limiting: enabled")
@@ -134,6 +162,19 @@ async def startup_event():
     logger.info("=" * 60)
 
 
+# Shutdown Event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks and close pooled async connections."""
+    from .services.activity_scanner import activity_scanner
+    from .services.prefetcher import watchlist_prefetcher
+    from .services.fundamentals_service import fundamentals_service
+    await activity_scanner.stop()
+    await watchlist_prefetcher.stop()
+    await fundamentals_service.stop()
+    await async_engine.dispose()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
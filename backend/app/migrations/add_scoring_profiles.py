@@ -0,0 +1,42 @@
+"""
+Migration script to add scoring profiles.
+
+Creates the scoring_profiles table and adds the scoring_profile column to users.
+
+Run this script to update existing databases:
+    python -m app.migrations.add_scoring_profiles
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text, inspect
+from app.models.database import engine
+from app.models.investment_engine import ScoringProfile
+
+
+def migrate():
+    """Create scoring_profiles table and add users.scoring_profile."""
+    print("Starting migration: Add scoring profiles...")
+
+    ScoringProfile.__table__.create(bind=engine, checkfirst=True)
+    print("✓ scoring_profiles table ready")
+
+    existing_columns = {column['name'] for column in inspect(engine).get_columns('users')}
+
+    with engine.connect() as conn:
+        if 'scoring_profile' not in existing_columns:
+            print("Adding scoring_profile column...")
+            conn.execute(text("ALTER TABLE users ADD COLUMN scoring_profile VARCHAR"))
+            conn.commit()
+            print("✓ scoring_profile column added")
+        else:
+            print("✓ scoring_profile column already exists")
+
+    print("\nMigration completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate()
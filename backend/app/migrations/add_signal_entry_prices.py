@@ -0,0 +1,52 @@
+"""
+Migration script to add entry prices and due dates to signal_performance.
+
+Adds entry_price, benchmark_entry_price and evaluate_after, and the index
+used to find due signals.
+
+Run this script to update existing databases:
+    python -m app.migrations.add_signal_entry_prices
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text, inspect
+from app.models.database import engine
+
+COLUMNS = {
+    'entry_price': 'FLOAT',
+    'benchmark_entry_price': 'FLOAT',
+    'evaluate_after': 'TIMESTAMP WITH TIME ZONE',
+}
+
+
+def migrate():
+    """Add signal_performance entry price columns and the due index."""
+    print("Starting migration: Add signal entry prices...")
+
+    existing_columns = {column['name'] for column in inspect(engine).get_columns('signal_performance')}
+
+    with engine.connect() as conn:
+        for name, column_type in COLUMNS.items():
+            if name not in existing_columns:
+                print(f"Adding {name} column...")
+                conn.execute(text(f"ALTER TABLE signal_performance ADD COLUMN {name} {column_type}"))
+                print(f"✓ {name} column added")
+            else:
+                print(f"✓ {name} column already exists")
+
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_signal_performance_due "
+            "ON signal_performance (is_pending, evaluate_after)"
+        ))
+        conn.commit()
+        print("✓ ix_signal_performance_due index ready")
+
+    print("\nMigration completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate()
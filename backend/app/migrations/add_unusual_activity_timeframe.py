@@ -0,0 +1,47 @@
+"""
+Migration script to add the timeframe to unusual_activity.
+
+Active detections are scoped by symbol, timeframe and type. Active rows
+stored before this migration have no timeframe and would never be resolved,
+so they are resolved here; the scanner re-detects live activity on its next
+cycle.
+
+Run this script to update existing databases:
+    python -m app.migrations.add_unusual_activity_timeframe
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text, inspect
+from app.models.database import engine
+
+
+def migrate():
+    """Add the unusual_activity timeframe column and resolve legacy active rows."""
+    print("Starting migration: Add unusual activity timeframe...")
+
+    existing_columns = {column['name'] for column in inspect(engine).get_columns('unusual_activity')}
+
+    with engine.connect() as conn:
+        if 'timeframe' not in existing_columns:
+            print("Adding timeframe column...")
+            conn.execute(text("ALTER TABLE unusual_activity ADD COLUMN timeframe VARCHAR"))
+            print("✓ timeframe column added")
+        else:
+            print("✓ timeframe column already exists")
+
+        resolved = conn.execute(text(
+            "UPDATE unusual_activity SET is_active = false, resolved_at = CURRENT_TIMESTAMP "
+            "WHERE is_active = true AND timeframe IS NULL"
+        )).rowcount
+        conn.commit()
+        print(f"✓ {resolved} active rows without a timeframe resolved")
+
+    print("\nMigration completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,33 @@
+"""
+Migration script to drop the unused signal accuracy metrics index.
+
+Accuracy metrics are read from signal_performance_rollups, so the covering
+index on signal_performance only slows down inserts and evaluations.
+
+Run this script to update existing databases:
+    python -m app.migrations.drop_signal_metrics_index
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.models.database import engine
+
+
+def migrate():
+    """Drop ix_signal_performance_metrics."""
+    print("Starting migration: Drop signal metrics index...")
+
+    with engine.connect() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_signal_performance_metrics"))
+        conn.commit()
+        print("✓ ix_signal_performance_metrics index dropped")
+
+    print("\nMigration completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,36 @@
+"""
+Rebuild signal performance rollups.
+
+Creates the signal_performance_rollups table if needed and recomputes it from
+signal_performance. Run after upgrading (to backfill already evaluated
+signals) or to repair the rollups:
+    python -m app.migrations.rebuild_signal_rollups [SYMBOL ...]
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.database import engine, session_scope
+from app.models.investment_engine import SignalPerformanceRollup
+from app.services.signal_performance_service import SignalPerformanceService
+
+
+def migrate(symbols=None):
+    """Create signal_performance_rollups and rebuild it."""
+    print("Starting migration: Rebuild signal performance rollups...")
+
+    SignalPerformanceRollup.__table__.create(bind=engine, checkfirst=True)
+    print("✓ signal_performance_rollups table ready")
+
+    with session_scope() as db:
+        rows = SignalPerformanceService(db).rebuild_rollups(symbols or None)
+    scope = ", ".join(symbols) if symbols else "all symbols"
+    print(f"✓ {rows} rollup rows rebuilt for {scope}")
+
+    print("\nMigration completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate([symbol.upper() for symbol in sys.argv[1:]])
@@ -0,0 +1,38 @@
+"""
+Seed the symbol master.
+
+Creates the symbol_master table if needed and fills it from Yahoo's search
+API for every watchlist symbol plus the given queries (symbols or names):
+    python -m app.migrations.seed_symbol_master [QUERY ...]
+Searches for anything else are added on their first miss.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.database import engine, session_scope
+from app.models.market import SymbolMaster
+from app.models.watchlist import Watchlist
+from app.services.symbol_search import symbol_search
+
+
+def migrate(queries=None):
+    """Create symbol_master and seed it."""
+    print("Starting migration: Seed symbol master...")
+
+    SymbolMaster.__table__.create(bind=engine, checkfirst=True)
+    print("✓ symbol_master table ready")
+
+    with session_scope() as db:
+        watched = [row.symbol.upper() for row in db.query(Watchlist.symbol).distinct()]
+        queries = list(dict.fromkeys(watched + list(queries or [])))
+        stored = symbol_search.refresh(db, queries)
+    print(f"✓ {stored} symbols stored for {len(queries)} queries")
+
+    print("\nMigration completed successfully!")
+
+
+if __name__ == "__main__":
+    migrate(sys.argv[1:])
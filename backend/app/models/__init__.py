@@ -1,9 +1,10 @@
 # Models package - ensures all models are imported in correct order
-from .database import Base, get_db, init_db
+from .database import Base, get_db, get_async_db, init_db
 from .user import User
 from .watchlist import Watchlist
-from .market import MarketData
-from .investment_engine import SentimentAnalysis, UnusualActivity, SignalPerformance
+from .market import MarketData, SymbolMaster, SymbolFundamentals
+from .investment_engine import SentimentAnalysis, UnusualActivity, SignalPerformance, ScoringProfile, NewsArticle
 
-__all__ = ['Base', 'get_db', 'init_db', 'User', 'Watchlist', 'MarketData',
-           'SentimentAnalysis', 'UnusualActivity', 'SignalPerformance']
+__all__ = ['Base', 'get_db', 'get_async_db', 'init_db', 'User', 'Watchlist', 'MarketData', 'SymbolMaster', 'SymbolFundamentals',
+           'SentimentAnalysis', 'UnusualActivity', 'SignalPerformance', 'ScoringProfile',
+           'NewsArticle']
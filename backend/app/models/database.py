@@ -77,9 +77,14 @@
 
 
 # models/database.py
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from typing import AsyncIterator, Iterator
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from ..config import get_settings
 
 settings = get_settings()
@@ -88,25 +93,92 @@ settings = get_settings()
 def create_database_engine():
     """Create database engine with appropriate configuration for SQLite or PostgreSQL"""
     database_url = settings.database_url
-    
-    if database_url.startswith("postgresql://"):
+    url = make_url(database_url)
+
+    if url.get_backend_name() == "postgresql":
         # PostgreSQL configuration
         return create_engine(
             database_url,
             pool_pre_ping=True,  # Verify connections before use
-            pool_recycle=300,    # Recycle connections every 5 minutes
+            **_pool_options(),
         )
-    else:
-        # SQLite configuration
-        return create_engine(
-            database_url,
-            connect_args={"check_same_thread": False}
+
+    # SQLite configuration
+    in_memory = _is_in_memory(url)
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False},
+        **({} if in_memory else _pool_options()),  # In-memory databases use a single connection
+    )
+    if not in_memory:
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def create_async_database_engine():
+    """
+    Create the asyncio engine for the same database.
+
+    PostgreSQL is accessed through asyncpg, SQLite through aiosqlite. An
+    in-memory SQLite database is a separate database per engine, so in that
+    case the async engine shares nothing with the sync one.
+    """
+    url = make_url(settings.database_url)
+
+    if url.get_backend_name() == "postgresql":
+        return create_async_engine(
+            url.set(drivername="postgresql+asyncpg"),
+            pool_pre_ping=True,
+            **_pool_options(),
         )
 
+    in_memory = _is_in_memory(url)
+    engine = create_async_engine(
+        url.set(drivername="sqlite+aiosqlite"),
+        # aiosqlite defaults to NullPool (a new connection per checkout) for files
+        **({} if in_memory else {"poolclass": AsyncAdaptedQueuePool, **_pool_options()}),
+    )
+    if not in_memory:
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def _is_in_memory(url) -> bool:
+    return url.database in (None, "", ":memory:")
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    WAL lets readers run alongside a writer; writers wait for the lock
+    instead of failing with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")  # Durable with WAL, fsync only at checkpoints
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
 engine = create_database_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+async_engine = create_async_database_engine()
+# Objects stay readable after commit; lazy loading is not available on async sessions
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 def get_db():
     db = SessionLocal()
@@ -116,6 +188,34 @@ def get_db():
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Async counterpart of get_db: queries are awaited instead of blocking the event loop"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Session for work outside a request (background tasks, WebSockets, scripts).
+
+    Commits when the block succeeds, rolls back on errors and always returns
+    the connection to the pool:
+
+        with session_scope() as db:
+            ...
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 # def init_db():
 #     """Initialisiert die Datenbank und erstellt alle Tabellen"""
 #     from .user import User
@@ -158,25 +258,22 @@ def init_db():
         Base.metadata.create_all(bind=engine)
         print("Database tables created successfully")
 
-        db = SessionLocal()
-
-        # Admin User erstellen
-        admin_user = db.query(User).filter(User.username == "admin").first()
-        if not admin_user:
-            admin_user = User(
-                username="admin",
-                email="admin@example.com",
-                full_name="Administrator",
-                is_active=True,
-                is_admin=True,
-                hashed_password=User.get_password_hash("admin123")
-            )
-            db.add(admin_user)
-            db.commit()
-            print("Admin user created successfully")
+        with session_scope() as db:
+            # Admin User erstellen
+            admin_user = db.query(User).filter(User.username == "admin").first()
+            if not admin_user:
+                admin_user = User(
+                    username="admin",
+                    email="admin@example.com",
+                    full_name="Administrator",
+                    is_active=True,
+                    is_admin=True,
+                    hashed_password=User.get_password_hash("admin123")
+                )
+                db.add(admin_user)
+                db.commit()
+                print("Admin user created successfully")
 
     except Exception as e:
         print(f"Error initializing database: {e}")
         raise
-    finally:
-        db.close()
\ No newline at end of file
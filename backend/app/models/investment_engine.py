@@ -3,7 +3,7 @@ Investment Decision Engine Models
 
 Stores sentiment analysis, unusual activity, and signal performance data.
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -47,6 +47,35 @@ class SentimentAnalysis(Base):
     )
 
 
+class NewsArticle(Base):
+    """News article seen for a symbol, with its keyword sentiment score"""
+    __tablename__ = "news_articles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    article_id = Column(String, nullable=False)  # Normalized URL, provider id or title
+    symbol = Column(String, index=True, nullable=False)
+
+    title = Column(String, nullable=False)
+    summary = Column(Text)
+    link = Column(String)
+    source = Column(String)
+    published_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Per-article sentiment (-100 to +100)
+    sentiment_score = Column(Float, nullable=False)
+    bullish_hits = Column(Integer, default=0)
+    bearish_hits = Column(Integer, default=0)
+
+    # First and most recent fetch that returned the article
+    first_seen_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_seen_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    __table_args__ = (
+        UniqueConstraint('article_id', 'symbol', name='uq_news_article_symbol'),
+        Index('ix_news_articles_symbol_last_seen', 'symbol', 'last_seen_at'),
+    )
+
+
 class UnusualActivity(Base):
     """Detected unusual market activity indicating institutional moves"""
     __tablename__ = "unusual_activity"
@@ -57,6 +86,7 @@ class UnusualActivity(Base):
 
     # Activity type
     activity_type = Column(String, nullable=False)  # "VOLUME_SPIKE", "OPTIONS_FLOW", "DARK_POOL", "PRICE_ANOMALY"
+    timeframe = Column(String)  # Bars the detection was made on ("1D" for the scanner)
 
     # Severity and confidence
     severity = Column(String)  # "LOW", "MEDIUM", "HIGH", "EXTREME"
@@ -99,6 +129,11 @@ class SignalPerformance(Base):
     # Timestamps
     generated_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     evaluated_at = Column(DateTime(timezone=True), nullable=True)
+    evaluate_after = Column(DateTime(timezone=True), nullable=True)  # generated_at + timeframe_days
+
+    # Prices at generation
+    entry_price = Column(Float)
+    benchmark_entry_price = Column(Float)  # SPY
 
     # Performance metrics
     timeframe_days = Column(Integer)  # 1, 7, 30, etc.
@@ -122,4 +157,52 @@ class SignalPerformance(Base):
     __table_args__ = (
         Index('ix_signal_performance_symbol_timeframe', 'symbol', 'timeframe_days', 'evaluated_at'),
         Index('ix_signal_performance_pending', 'symbol', 'is_pending'),
+        Index('ix_signal_performance_due', 'is_pending', 'evaluate_after'),
     )
+
+
+class SignalPerformanceRollup(Base):
+    """Running totals of evaluated signals per symbol, type, timeframe and strength"""
+    __tablename__ = "signal_performance_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String, nullable=False)
+    signal_type = Column(String, nullable=False)
+    timeframe_days = Column(Integer, nullable=False)
+    signal_strength = Column(String, nullable=False, default="")  # "" if the signal had no strength
+
+    # Counts and sums (averages are sums / signal_count)
+    signal_count = Column(Integer, nullable=False, default=0)
+    profitable_count = Column(Integer, nullable=False, default=0)
+    outperformed_count = Column(Integer, nullable=False, default=0)
+    underperformed_count = Column(Integer, nullable=False, default=0)
+    return_sum = Column(Float, nullable=False, default=0.0)
+    benchmark_return_sum = Column(Float, nullable=False, default=0.0)
+    excess_return_sum = Column(Float, nullable=False, default=0.0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            'symbol', 'signal_type', 'timeframe_days', 'signal_strength',
+            name='uq_signal_performance_rollup'
+        ),
+    )
+
+
+class ScoringProfile(Base):
+    """Named master score weighting profile (custom profiles; built-ins live in code)"""
+    __tablename__ = "scoring_profiles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)
+    description = Column(String, nullable=True)
+
+    # JSON: {"short_term": 0.3, "medium_term": 0.3, "long_term": 0.2, "risk": 0.2}
+    weights = Column(Text, nullable=False)
+    # JSON: lower score bound per recommendation, e.g. {"SELL": 20, "HOLD": 40, "BUY": 60, "STRONG_BUY": 80}
+    thresholds = Column(Text, nullable=True)
+
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
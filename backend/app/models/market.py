@@ -44,8 +44,9 @@
 
 
 # models/market.py
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Column, Integer, String, Float, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from datetime import datetime
 from .database import Base
 
@@ -96,4 +97,35 @@ class PatternDetection(Base):
     pattern_type = Column(String)
     confidence = Column(Float)
     timestamp = Column(DateTime, default=datetime.utcnow)
-    description = Column(String)
\ No newline at end of file
+    description = Column(String)
+
+
+class SymbolMaster(Base):
+    """Known tradable symbols for the local symbol search"""
+    __tablename__ = "symbol_master"
+
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String, unique=True, index=True, nullable=False)
+    name = Column(String)
+    exchange = Column(String)
+    quote_type = Column(String)  # EQUITY, ETF, INDEX, CRYPTOCURRENCY, ...
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class SymbolFundamentals(Base):
+    """Slow-changing ticker metadata (names, market cap, valuation, 52-week range)"""
+    __tablename__ = "symbol_fundamentals"
+
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String, unique=True, index=True, nullable=False)
+    name = Column(String)
+    exchange = Column(String)
+    quote_type = Column(String)
+    currency = Column(String)
+    sector = Column(String)
+    industry = Column(String)
+    market_cap = Column(BigInteger)
+    pe_ratio = Column(Float)
+    high_52w = Column(Float)
+    low_52w = Column(Float)
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
@@ -26,6 +26,9 @@ class User(Base):
     ai_temperature = Column(String, default="0.7")  # Temperature setting
     ai_max_tokens = Column(Integer, default=1000)  # Max tokens
 
+    # Investment engine
+    scoring_profile = Column(String, nullable=True)  # Default master score profile name
+
     # Security
     must_change_password = Column(Boolean, default=False)  # Force password change on next login
     
@@ -37,9 +37,31 @@ class MasterScoreResponse(BaseModel):
     confidence: str = Field(..., description="HIGH, MEDIUM, or LOW")
     breakdown: Dict[str, ScoreBreakdown] = Field(..., description="Component breakdown")
     top_factors: List[TopFactor] = Field(default_factory=list, description="Top 3 contributing factors")
+    profile: Optional[str] = Field(None, description="Scoring profile used")
     timestamp: str = Field(..., description="ISO timestamp")
 
 
+class ScoringProfileBase(BaseModel):
+    """Scoring profile weights and thresholds"""
+    description: Optional[str] = Field(None, description="Profile description")
+    weights: Dict[str, float] = Field(..., description="Weights for short_term, medium_term, long_term and risk")
+    thresholds: Optional[Dict[str, float]] = Field(
+        None, description="Lower score bound for SELL, HOLD, BUY and STRONG_BUY"
+    )
+
+
+class ScoringProfileCreate(ScoringProfileBase):
+    """Request to create a scoring profile"""
+    name: str = Field(..., min_length=1, max_length=50, pattern="^[a-z0-9_-]+$", description="Profile name")
+
+
+class ScoringProfileResponse(ScoringProfileBase):
+    """Scoring profile"""
+    name: str = Field(..., description="Profile name")
+    thresholds: Dict[str, float] = Field(..., description="Lower score bound per recommendation")
+    builtin: bool = Field(..., description="Built-in profiles cannot be changed")
+
+
 # ============================================================================
 # Sentiment Analysis Schemas
 # ============================================================================
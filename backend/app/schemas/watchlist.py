@@ -31,3 +31,4 @@ class WatchlistWithData(WatchlistResponse):
     price_change: Optional[float] = None
     price_change_percent: Optional[float] = None
     volume: Optional[int] = None
+    quote_stale: Optional[bool] = None  # Last known quote, refresh failed
@@ -0,0 +1,139 @@
+"""
+Streaming Activity Detector
+
+Keeps rolling volume and price baselines per symbol so each new bar is
+evaluated against the preceding window in O(1). Histories are read as numpy
+arrays; only bars newer than the last committed one are fed into the state.
+"""
+import numpy as np
+import pandas as pd
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .streaming_stats import RollingStats
+
+logger = logging.getLogger(__name__)
+
+
+class SymbolActivityState:
+    """Rolling volume/close baselines for one symbol/timeframe"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.volumes = RollingStats(window)
+        self.closes = RollingStats(window)
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self.last_close: Optional[float] = None
+
+    def update(self, timestamp, close: float, volume: float) -> None:
+        """Commit one bar (O(1)); zero/missing values do not enter the baselines"""
+        if volume > 0:
+            self.volumes.push(volume)
+        if close > 0:
+            self.closes.push(close)
+            self.last_close = close
+        self.last_timestamp = timestamp
+
+    def evaluate(self, timestamp, close: float, volume: float) -> Dict[str, Any]:
+        """Compare a bar with the current baselines without committing it"""
+        return {
+            "timestamp": timestamp,
+            "current_volume": volume,
+            "average_volume": self.volumes.mean,
+            "volume_count": self.volumes.count,
+            "volume_z_score": self.volumes.zscore(volume) if volume > 0 else 0.0,
+            "current_price": close,
+            "previous_close": self.last_close,
+            "average_price": self.closes.mean,
+            "price_count": self.closes.count,
+            "price_z_score": abs(self.closes.zscore(close)) if close > 0 else 0.0,
+        }
+
+
+class ActivityDetector:
+    """
+    Per-symbol registry of SymbolActivityState objects.
+
+    evaluate_history() commits every bar but the last and evaluates the last
+    one against the baseline of the bars before it; on_bar() evaluates and
+    commits a single live bar.
+    """
+
+    def __init__(self, window: int = 60, max_symbols: int = 5000):
+        self.window = window
+        self.max_symbols = max_symbols
+        self._states: "OrderedDict[str, SymbolActivityState]" = OrderedDict()
+        self.logger = logger
+
+    def evaluate_history(self, key: str, hist: pd.DataFrame, current_price: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Evaluate the latest bar of a history against the rolling baseline.
+
+        Args:
+            key: State key, e.g. "AAPL:3M"
+            hist: Historical OHLCV data
+            current_price: Optional live price replacing the last close
+
+        Returns:
+            Evaluation dict (z-scores, baselines, current values)
+        """
+        index = hist.index
+        closes = hist['Close'].to_numpy(dtype=float)
+        volumes = (
+            np.nan_to_num(hist['Volume'].to_numpy(dtype=float)) if 'Volume' in hist.columns
+            else np.zeros(len(hist))
+        )
+        closes = np.nan_to_num(closes)
+
+        state = self._states.get(key)
+        if state is not None and state.last_timestamp is not None:
+            position = index.searchsorted(state.last_timestamp, side='right')
+            # History was restated or does not overlap the committed bars: rebuild
+            if position == 0 or index[position - 1] != state.last_timestamp:
+                state = None
+        if state is None:
+            state = SymbolActivityState(self.window)
+            position = max(len(hist) - 1 - self.window, 0)
+
+        last = len(hist) - 1
+        for i in range(position, last):
+            state.update(index[i], closes[i], volumes[i])
+        self._store(key, state)
+
+        price = current_price if current_price else closes[last]
+        return state.evaluate(index[last], float(price), float(volumes[last]))
+
+    def on_bar(self, key: str, timestamp, close: float, volume: float) -> Optional[Dict[str, Any]]:
+        """
+        Evaluate a new live bar against the baseline and commit it.
+
+        Returns None for bars not newer than the last committed one.
+        """
+        state = self._states.get(key)
+        if state is None:
+            state = SymbolActivityState(self.window)
+        elif state.last_timestamp is not None and timestamp <= state.last_timestamp:
+            return None
+
+        evaluation = state.evaluate(timestamp, float(close), float(volume))
+        state.update(timestamp, float(close), float(volume))
+        self._store(key, state)
+        return evaluation
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """Drop the state for key, or all states"""
+        if key:
+            self._states.pop(key, None)
+        else:
+            self._states.clear()
+
+    def _store(self, key: str, state: SymbolActivityState) -> None:
+        self._states[key] = state
+        self._states.move_to_end(key)
+        while len(self._states) > self.max_symbols:
+            self._states.popitem(last=False)
+
+
+# Global detector instance
+activity_detector = ActivityDetector()
@@ -0,0 +1,287 @@
+"""
+Unusual Activity Scanner
+
+Background task that evaluates volume spikes and price anomalies for the hot
+stocks universe plus all watchlist symbols whenever their last bar changes.
+Bars are refreshed with one bulk download per scan; the latest bar of every
+symbol is scored against its own rolling window in one vectorized pass, and
+against the rest of the universe with cross-sectional z-scores so that a
+market-wide move is not reported as unusual for every single ticker.
+New detections are stored in unusual_activity and pushed to subscribers.
+"""
+import asyncio
+import logging
+import numpy as np
+import pandas as pd
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..models.database import session_scope
+from ..models.watchlist import Watchlist
+from .activity_detector import activity_detector
+from .bar_store import bar_store
+from .unusual_activity_service import UnusualActivityService
+from .volume_profile import VolumeProfile, volume_profiles
+
+logger = logging.getLogger(__name__)
+
+# Minimum universe size for cross-sectional filtering
+MIN_CROSS_SECTION = 10
+
+AlertCallback = Callable[[str, List[Dict[str, Any]]], Awaitable[None]]
+
+
+class ActivityScanner:
+    """
+    Periodic universe-wide unusual activity scan.
+
+    A symbol is evaluated whenever its last bar changed: the timestamp and
+    values of its last scanned bar are remembered and unchanged symbols are
+    skipped. A forming bar is therefore re-evaluated as its volume grows
+    until it closes.
+    """
+
+    # Peer z-score a hit needs to stand out from the universe
+    CROSS_SECTION_THRESHOLD = 1.0
+
+    def __init__(self, interval: int = 60, timeframe: str = "1D", window: Optional[int] = None):
+        self.interval = interval
+        self.timeframe = timeframe
+        self.window = window or activity_detector.window
+        self.base_symbols: List[str] = []
+        self._last_bar: Dict[str, Tuple] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._on_alert: Optional[AlertCallback] = None
+        self.logger = logger
+
+    def start(self, base_symbols: Iterable[str], on_alert: Optional[AlertCallback] = None) -> None:
+        """Start the background scan loop"""
+        self.base_symbols = [s.upper() for s in base_symbols]
+        self._on_alert = on_alert
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            self.logger.info(f"Unusual activity scanner started (every {self.interval}s, {self.timeframe} bars)")
+
+    async def stop(self) -> None:
+        """Cancel the background scan loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.scan_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Unusual activity scan failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def scan_once(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Run one scan over the universe.
+
+        Returns:
+            Dict of symbol -> newly stored activities
+        """
+        # Connections are only held for the queries, not for the downloads
+        with session_scope() as db:
+            symbols = self.universe(db)
+        histories = await asyncio.to_thread(bar_store.refresh, symbols, self.timeframe)
+
+        fresh = {
+            symbol: hist for symbol, hist in histories.items()
+            if len(hist) > 1 and self._last_bar.get(symbol) != _bar_signature(hist)
+        }
+        if not fresh:
+            return {}
+
+        profiles = None
+        if volume_profiles.supports(self.timeframe):
+            session = max(hist.index[-1] for hist in fresh.values()).date()
+            profiles = await asyncio.to_thread(volume_profiles.get_profiles, list(fresh), self.timeframe, session)
+
+        evaluations = self.evaluate(fresh, profiles)
+        alerts = await asyncio.to_thread(self.persist, evaluations)
+
+        for symbol, hist in fresh.items():
+            self._last_bar[symbol] = _bar_signature(hist)
+
+        if alerts:
+            self.logger.info(f"Unusual activity detected for {len(alerts)} of {len(fresh)} symbols")
+            if self._on_alert is not None:
+                for symbol, activities in alerts.items():
+                    await self._on_alert(symbol, activities)
+        return alerts
+
+    def persist(self, evaluations: Dict[str, Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Store the activities that stand out and resolve the ones that ended
+        (blocking), committed together.
+
+        Returns:
+            Dict of symbol -> newly stored activities; symbols whose writes
+            failed are left out, so only stored rows are broadcast
+        """
+        alerts = {}
+        with session_scope() as db:
+            service = UnusualActivityService(db)
+            for symbol, evaluation in evaluations.items():
+                result = service.process_evaluation(symbol, evaluation, persist=False)
+                activities = [a for a in result["activities"] if self._stands_out(a, evaluation)]
+                stored = service.persist_activities(symbol, activities, evaluation, self.timeframe, commit=False)
+                if stored:
+                    alerts[symbol] = stored
+        return alerts
+
+    def universe(self, db) -> List[str]:
+        """Hot stocks plus every symbol on an active watchlist"""
+        watched = [
+            row.symbol.upper() for row in db.query(Watchlist.symbol).filter(
+                Watchlist.is_active == True
+            ).distinct()
+        ]
+        return list(dict.fromkeys(self.base_symbols + watched))
+
+    def evaluate(
+        self,
+        histories: Dict[str, pd.DataFrame],
+        profiles: Optional[Dict[str, VolumeProfile]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Score the latest bar of every history in one vectorized pass.
+
+        Each symbol's last window + 1 bars are right-aligned into a
+        (bars x symbols) matrix; the last row is compared with the rows
+        before it (time-series z) and with the other symbols (cross z).
+        Where a volume profile has a usable bucket for the last bar, its
+        time-of-day mean/std replace the rolling volume baseline.
+
+        Args:
+            histories: Dict of symbol -> OHLCV history
+            profiles: Optional dict of symbol -> intraday VolumeProfile
+
+        Returns:
+            Dict of symbol -> evaluation in the ActivityDetector format plus
+            volume_cross_z / return_cross_z
+        """
+        symbols = list(histories)
+        rows = self.window + 1
+        closes = np.full((rows, len(symbols)), np.nan)
+        volumes = np.full((rows, len(symbols)), np.nan)
+        for j, symbol in enumerate(symbols):
+            hist = histories[symbol].iloc[-rows:]
+            closes[-len(hist):, j] = hist['Close'].to_numpy(dtype=float)
+            if 'Volume' in hist.columns:
+                volumes[-len(hist):, j] = hist['Volume'].to_numpy(dtype=float)
+
+        # Zero/missing values do not enter the baselines
+        closes[~(closes > 0)] = np.nan
+        volumes[~(volumes > 0)] = np.nan
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            price_counts = np.sum(~np.isnan(closes[:-1]), axis=0)
+            volume_counts = np.sum(~np.isnan(volumes[:-1]), axis=0)
+            price_mean = _nanmean(closes[:-1], price_counts)
+            volume_mean = _nanmean(volumes[:-1], volume_counts)
+            price_std = _nanstd(closes[:-1], price_mean, price_counts)
+            volume_std = _nanstd(volumes[:-1], volume_mean, volume_counts)
+
+            time_of_day = np.zeros(len(symbols), dtype=bool)
+            for j, symbol in enumerate(symbols):
+                entry = profiles[symbol].lookup(histories[symbol].index[-1]) if profiles and symbol in profiles else None
+                if entry is not None:
+                    volume_mean[j], volume_std[j], volume_counts[j] = entry
+                    time_of_day[j] = True
+
+            last_close = closes[-1]
+            last_volume = volumes[-1]
+            price_z = np.abs(_safe_z(last_close, price_mean, price_std))
+            volume_z = _safe_z(last_volume, volume_mean, volume_std)
+
+            previous_close = _last_valid(closes[:-1])
+            returns = np.abs(last_close / previous_close - 1)
+            volume_ratio = np.log(last_volume / volume_mean)
+            return_cross_z = _cross_z(returns)
+            volume_cross_z = _cross_z(volume_ratio)
+
+        evaluations = {}
+        for j, symbol in enumerate(symbols):
+            evaluations[symbol] = {
+                "timestamp": histories[symbol].index[-1],
+                "current_volume": _value(last_volume[j], 0.0),
+                "average_volume": _value(volume_mean[j], 0.0),
+                "volume_count": int(volume_counts[j]),
+                "volume_z_score": _value(volume_z[j], 0.0),
+                "volume_baseline": "time_of_day" if time_of_day[j] else "rolling",
+                "current_price": _value(last_close[j], 0.0),
+                "previous_close": _value(previous_close[j], None),
+                "average_price": _value(price_mean[j], 0.0),
+                "price_count": int(price_counts[j]),
+                "price_z_score": _value(price_z[j], 0.0),
+                "volume_cross_z": _value(volume_cross_z[j], None),
+                "return_cross_z": _value(return_cross_z[j], None),
+            }
+        return evaluations
+
+    def _stands_out(self, activity: Dict[str, Any], evaluation: Dict[str, Any]) -> bool:
+        """Whether a hit is unusual relative to the rest of the universe"""
+        cross_z = evaluation["volume_cross_z"] if activity["type"] == "VOLUME_SPIKE" else evaluation["return_cross_z"]
+        if cross_z is None:
+            return True
+        activity["details"]["cross_sectional_z"] = round(cross_z, 2)
+        return cross_z >= self.CROSS_SECTION_THRESHOLD
+
+
+def _bar_signature(hist: pd.DataFrame) -> Tuple:
+    """Timestamp, close and volume of the last bar (changes while the bar is forming)"""
+    last = hist.iloc[-1]
+    volume = _value(last['Volume'], None) if 'Volume' in hist.columns else None
+    return hist.index[-1], _value(last['Close'], None), volume
+
+
+def _nanmean(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    return np.where(counts > 0, np.nansum(values, axis=0) / np.maximum(counts, 1), np.nan)
+
+
+def _nanstd(values: np.ndarray, mean: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    squared = np.nansum((values - mean) ** 2, axis=0)
+    return np.where(counts > 0, np.sqrt(squared / np.maximum(counts, 1)), np.nan)
+
+
+def _safe_z(value: np.ndarray, mean: np.ndarray, std: np.ndarray) -> np.ndarray:
+    """Z-scores with 0 where std is 0 or undefined"""
+    z = (value - mean) / std
+    return np.where((std > 0) & np.isfinite(z), z, 0.0)
+
+
+def _last_valid(values: np.ndarray) -> np.ndarray:
+    """Last non-NaN value of every column"""
+    valid = ~np.isnan(values)
+    last = values.shape[0] - 1 - np.argmax(valid[::-1], axis=0)
+    result = values[last, np.arange(values.shape[1])]
+    return np.where(valid.any(axis=0), result, np.nan)
+
+
+def _cross_z(values: np.ndarray) -> np.ndarray:
+    """Cross-sectional z-scores (NaN if the universe is too small)"""
+    finite = np.isfinite(values)
+    if finite.sum() < MIN_CROSS_SECTION:
+        return np.full(values.shape, np.nan)
+    mean = values[finite].mean()
+    std = values[finite].std()
+    if not std:
+        return np.where(finite, 0.0, np.nan)
+    return np.where(finite, (values - mean) / std, np.nan)
+
+
+def _value(value: float, default: Any) -> Any:
+    return float(value) if np.isfinite(value) else default
+
+
+# Global scanner instance
+activity_scanner = ActivityScanner()
@@ -0,0 +1,100 @@
+"""
+Analysis Cache
+
+Technical indicators, patterns and signals per symbol and timeframe. An
+entry is reused as long as the history it was computed from has not changed
+(same number of bars, same last bar and last close), so a cached analysis
+is invalidated by a new bar or an update of the running bar.
+"""
+import logging
+import threading
+import pandas as pd
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .bar_store import bar_store
+from .technical_indicators import calculate_technical_indicators
+from .pattern_detection import detect_patterns
+from .signal_generation import generate_signals
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    """
+    Bounded cache of analyses with least-recently-used eviction.
+    """
+
+    def __init__(self, max_entries: int = 2000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Tuple, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.logger = logger
+
+    def get_analysis(self, symbol: str, timeframe: str) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """
+        History (from the bar store) and analysis for a symbol.
+
+        Args:
+            symbol: Stock symbol
+            timeframe: Timeframe selection (1D, 1W, 1M, 3M, 6M, YTD, 1Y)
+
+        Returns:
+            (history, analysis) or None if no history is available
+        """
+        hist = bar_store.get_history(symbol, timeframe)
+        if hist is None or hist.empty:
+            return None
+        return hist, self.analyze(symbol, timeframe, hist)
+
+    def analyze(self, symbol: str, timeframe: str, hist: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Analysis of a history, computed only if the history changed.
+
+        Returns:
+            Dict with technical_indicators, patterns and signals
+        """
+        key = (symbol.upper(), timeframe)
+        version = _history_version(hist)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        analysis = _compute_analysis(symbol, hist)
+        with self._lock:
+            self._entries[key] = (version, analysis)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return analysis
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _history_version(hist: pd.DataFrame) -> Tuple:
+    return len(hist), hist.index[-1], float(hist['Close'].iloc[-1])
+
+
+def _compute_analysis(symbol: str, hist: pd.DataFrame) -> Dict[str, Any]:
+    technical_indicators = calculate_technical_indicators(hist)
+
+    try:
+        patterns = detect_patterns(hist)
+    except Exception as e:
+        logger.error(f"Error detecting patterns for {symbol}: {str(e)}")
+        patterns = []
+
+    signals = generate_signals(hist, technical_indicators)
+    return {
+        "technical_indicators": technical_indicators,
+        "patterns": patterns,
+        "signals": signals,
+    }
+
+
+# Global analysis cache instance
+analysis_cache = AnalysisCache()
@@ -80,6 +80,7 @@ class APITokenService:
         encrypted_key = encrypt_api_key(api_key)
 
         # Store encrypted key and token
+        db.add(user)  # Resolved users are detached
         user.api_key_token = token
         user.ai_api_key = encrypted_key
         db.commit()
@@ -135,6 +136,7 @@ class APITokenService:
         new_token = APITokenService.generate_token()
 
         # Update token (keep encrypted key the same)
+        db.add(user)  # Resolved users are detached
         user.api_key_token = new_token
         db.commit()
 
@@ -149,6 +151,7 @@ class APITokenService:
             db: Database session
             user: User object
         """
+        db.add(user)  # Resolved users are detached
         user.api_key_token = None
         user.ai_api_key = None
         db.commit()
@@ -190,6 +193,7 @@ class APITokenService:
             decrypt_api_key(user.ai_api_key)
             # Successfully decrypted, just need a token
             token = APITokenService.generate_token()
+            db.add(user)  # Resolved users are detached
             user.api_key_token = token
             db.commit()
             return token
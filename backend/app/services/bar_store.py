@@ -0,0 +1,225 @@
+"""
+Bar Store
+
+In-memory cache of OHLCV histories keyed by symbol and timeframe.
+Cache misses for many symbols are fetched from yfinance in one bulk download.
+"""
+import time
+import logging
+import threading
+import pandas as pd
+import yfinance as yf
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..config import get_settings
+from .market_data import TIMEFRAME_MAP, fetch_yfinance_data, resolve_timeframe
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Entries beyond the prefetched watchlist histories (unwatched symbols,
+# profile and quote histories, the activity scanner)
+MAX_ENTRIES_HEADROOM = 1000
+
+
+def default_max_entries() -> int:
+    """Room for every prefetched symbol in every timeframe, plus headroom"""
+    return settings.PREFETCH_MAX_SYMBOLS * len(TIMEFRAME_MAP) + MAX_ENTRIES_HEADROOM
+
+
+class BarStore:
+    """
+    Cache of yfinance histories.
+
+    Entries expire after ttl_seconds (CACHE_DURATION by default); the store is
+    bounded to max_entries (sized from the prefetch settings by default) with
+    least-recently-used eviction.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.CACHE_DURATION
+        self.max_entries = max_entries if max_entries is not None else default_max_entries()
+        self._bars: "OrderedDict[Tuple[str, str], Tuple[float, pd.DataFrame]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.logger = logger
+
+    def get_cached(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """Return the cached history if present and not expired"""
+        key = (symbol.upper(), timeframe)
+        with self._lock:
+            entry = self._bars.get(key)
+            if entry is None:
+                return None
+            stored_at, hist = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self._bars[key]
+                return None
+            self._bars.move_to_end(key)
+            return hist
+
+    def put(self, symbol: str, timeframe: str, hist: pd.DataFrame) -> None:
+        """Store a history for symbol/timeframe"""
+        key = (symbol.upper(), timeframe)
+        with self._lock:
+            self._bars[key] = (time.time(), hist)
+            self._bars.move_to_end(key)
+            while len(self._bars) > self.max_entries:
+                self._bars.popitem(last=False)
+
+    def get_history(self, symbol: str, timeframe: str = "1M") -> Optional[pd.DataFrame]:
+        """
+        Get the OHLCV history for one symbol, fetching it on a cache miss.
+
+        Args:
+            symbol: Stock symbol
+            timeframe: Timeframe selection (1D, 1W, 1M, 3M, 6M, YTD, 1Y)
+
+        Returns:
+            DataFrame with OHLCV data or None if unavailable
+        """
+        hist = self.get_cached(symbol, timeframe)
+        if hist is not None:
+            return hist
+
+        hist = fetch_yfinance_data(symbol, timeframe)
+        if hist is not None and not hist.empty:
+            self.put(symbol, timeframe, hist)
+        return hist
+
+    def get_histories(self, symbols: Iterable[str], timeframe: str = "1M") -> Dict[str, pd.DataFrame]:
+        """
+        Get OHLCV histories for many symbols with a single upstream call for all misses.
+
+        Args:
+            symbols: Stock symbols
+            timeframe: Timeframe selection (1D, 1W, 1M, 3M, 6M, YTD, 1Y)
+
+        Returns:
+            Dict of symbol -> DataFrame (symbols without data are omitted)
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols if s))
+        result: Dict[str, pd.DataFrame] = {}
+        missing: List[str] = []
+
+        for symbol in symbols:
+            hist = self.get_cached(symbol, timeframe)
+            if hist is not None:
+                result[symbol] = hist
+            else:
+                missing.append(symbol)
+
+        if missing:
+            for symbol, hist in self._download(missing, timeframe).items():
+                self.put(symbol, timeframe, hist)
+                result[symbol] = hist
+
+        return result
+
+    def refresh(self, symbols: Iterable[str], timeframe: str = "1D") -> Dict[str, pd.DataFrame]:
+        """
+        Re-download histories for many symbols in one call, ignoring the cache.
+
+        Args:
+            symbols: Stock symbols
+            timeframe: Timeframe selection (1D, 1W, 1M, 3M, 6M, YTD, 1Y)
+
+        Returns:
+            Dict of symbol -> DataFrame (symbols without data are omitted)
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols if s))
+        histories = self._download(symbols, timeframe) if symbols else {}
+        for symbol, hist in histories.items():
+            self.put(symbol, timeframe, hist)
+        return histories
+
+    def get_close_matrix(self, symbols: Iterable[str], timeframe: str = "1Y") -> pd.DataFrame:
+        """
+        Get aligned closing prices for many symbols.
+
+        Args:
+            symbols: Stock symbols
+            timeframe: Timeframe selection (1D, 1W, 1M, 3M, 6M, YTD, 1Y)
+
+        Returns:
+            DataFrame with one column per symbol on a shared, sorted index.
+            Missing bars are NaN.
+        """
+        histories = self.get_histories(symbols, timeframe)
+        if not histories:
+            return pd.DataFrame()
+
+        intraday = resolve_timeframe(timeframe)[1] not in ("1d", "1wk", "1mo")
+        closes = {
+            symbol: pd.Series(hist['Close'].to_numpy(dtype=float), index=_align_index(hist.index, intraday))
+            for symbol, hist in histories.items()
+        }
+        # Duplicate labels can appear after normalizing daily bars; keep the last one
+        closes = {symbol: series[~series.index.duplicated(keep='last')] for symbol, series in closes.items()}
+        return pd.DataFrame(closes).sort_index()
+
+    def clear(self) -> None:
+        """Clear all cached histories"""
+        with self._lock:
+            self._bars.clear()
+
+    def _download(self, symbols: List[str], timeframe: str) -> Dict[str, pd.DataFrame]:
+        """Fetch histories for several symbols in one yfinance call"""
+        if len(symbols) == 1:
+            hist = fetch_yfinance_data(symbols[0], timeframe)
+            return {symbols[0]: hist} if hist is not None and not hist.empty else {}
+
+        period, interval = resolve_timeframe(timeframe)
+        try:
+            data = yf.download(
+                tickers=symbols,
+                period=period,
+                interval=interval,
+                group_by='ticker',
+                auto_adjust=True,
+                threads=True,
+                progress=False,
+            )
+        except Exception as e:
+            self.logger.error(f"Bulk download failed for {len(symbols)} symbols: {e}")
+            return {}
+
+        histories = {}
+        if data is None or data.empty:
+            return histories
+
+        for symbol in symbols:
+            try:
+                if isinstance(data.columns, pd.MultiIndex):
+                    if symbol not in data.columns.get_level_values(0):
+                        continue
+                    hist = data[symbol]
+                else:
+                    hist = data
+                hist = hist[[c for c in OHLCV_COLUMNS if c in hist.columns]].dropna(subset=['Close'])
+                if not hist.empty:
+                    histories[symbol] = hist
+            except Exception as e:
+                self.logger.warning(f"Could not extract bars for {symbol}: {e}")
+
+        return histories
+
+
+def _align_index(index: pd.DatetimeIndex, intraday: bool) -> pd.DatetimeIndex:
+    """
+    Make indexes from different exchanges comparable.
+
+    Daily bars are reduced to their local trading date; intraday bars are
+    converted to UTC.
+    """
+    if index.tz is None:
+        return index if intraday else index.normalize()
+    if intraday:
+        return index.tz_convert('UTC')
+    return index.tz_localize(None).normalize()
+
+
+# Global bar store instance
+bar_store = BarStore()
@@ -0,0 +1,252 @@
+"""
+Correlation Service
+
+Rolling return correlations for a symbol universe. The full N x N matrix is
+derived from running window sums (sum of returns and sum of return outer
+products), so new bars update a cached universe in O(N²) numpy work per bar
+instead of recomputing from the full history. The newest return is usually
+still forming; it is only applied to a copy of the cached sums, and
+committed once a newer bar exists.
+"""
+import numpy as np
+import pandas as pd
+import logging
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .bar_store import bar_store
+
+logger = logging.getLogger(__name__)
+
+# Pairs above this correlation count as redundant exposure
+HIGH_CORRELATION_THRESHOLD = 0.8
+
+
+class CorrelationState:
+    """Window sums for one universe/timeframe/window"""
+
+    def __init__(self, symbols: List[str], window: int):
+        n = len(symbols)
+        self.symbols = symbols
+        self.window = window
+        self.rows: List[np.ndarray] = []
+        self.timestamps: List[pd.Timestamp] = []
+        self.sum = np.zeros(n)
+        self.sum_outer = np.zeros((n, n))
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        return self.timestamps[-1] if self.timestamps else None
+
+    def push(self, matrix: np.ndarray, timestamps: Iterable[pd.Timestamp]) -> None:
+        """Add return rows (T x N) and evict rows that left the window"""
+        if len(matrix) == 0:
+            return
+        self.sum += matrix.sum(axis=0)
+        self.sum_outer += matrix.T @ matrix
+        self.rows.extend(matrix)
+        self.timestamps.extend(timestamps)
+
+        overflow = len(self.rows) - self.window
+        if overflow > 0:
+            leaving = np.asarray(self.rows[:overflow])
+            self.sum -= leaving.sum(axis=0)
+            self.sum_outer -= leaving.T @ leaving
+            del self.rows[:overflow]
+            del self.timestamps[:overflow]
+
+    def copy(self) -> "CorrelationState":
+        """Independent copy (O(window + N²))"""
+        clone = CorrelationState.__new__(CorrelationState)
+        clone.symbols, clone.window = self.symbols, self.window
+        clone.rows, clone.timestamps = list(self.rows), list(self.timestamps)
+        clone.sum, clone.sum_outer = self.sum.copy(), self.sum_outer.copy()
+        return clone
+
+    def correlation(self) -> np.ndarray:
+        """Correlation matrix of the rows currently in the window"""
+        count = len(self.rows)
+        mean = self.sum / count
+        cov = (self.sum_outer - count * np.outer(mean, mean)) / (count - 1)
+        std = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = cov / np.outer(std, std)
+        corr = np.clip(corr, -1.0, 1.0)
+        np.fill_diagonal(corr, 1.0)
+        return corr
+
+
+class CorrelationService:
+    """
+    Service for cross-sectional return correlations.
+
+    States are cached per (universe, timeframe, window); a request for a
+    cached universe only feeds bars newer than the last one seen.
+    """
+
+    def __init__(self, max_universes: int = 100):
+        self.max_universes = max_universes
+        self._states: "OrderedDict[Tuple[frozenset, str, int], CorrelationState]" = OrderedDict()
+        self.logger = logger
+
+    def get_correlations(
+        self,
+        symbols: Iterable[str],
+        timeframe: str = "1Y",
+        window: int = 60,
+        top_pairs: int = 10,
+        threshold: float = HIGH_CORRELATION_THRESHOLD
+    ) -> Dict[str, any]:
+        """
+        Calculate rolling return correlations for a universe.
+
+        Args:
+            symbols: Universe of stock symbols
+            timeframe: Timeframe of the underlying bars
+            window: Number of returns in the rolling window
+            top_pairs: Number of most/least correlated pairs to return
+            threshold: Correlation above which a pair triggers a diversification warning
+
+        Returns:
+            Dictionary with the correlation matrix, ranked pairs and warnings
+        """
+        universe = sorted({s.upper() for s in symbols if s})
+        if len(universe) < 2:
+            return {}
+
+        closes = bar_store.get_close_matrix(universe, timeframe)
+        returns = self._returns(closes)
+        if returns.shape[1] < 2 or len(returns) < 2:
+            return {}
+
+        state = self._sync((frozenset(universe), timeframe, window), returns, window)
+        if len(state.rows) < 2:
+            return {}
+
+        corr = state.correlation()
+        result = analyze_correlation_matrix(state.symbols, corr, top_pairs, threshold)
+        result.update({
+            'symbols': state.symbols,
+            'matrix': corr.tolist(),
+            'excluded_symbols': sorted(set(universe) - set(state.symbols)),
+            'window': window,
+            'observations': len(state.rows),
+            'as_of': state.last_timestamp.isoformat() if state.last_timestamp is not None else None,
+        })
+        return result
+
+    def clear(self) -> None:
+        """Drop all cached universes"""
+        self._states.clear()
+
+    def _sync(self, key: Tuple[frozenset, str, int], returns: pd.DataFrame, window: int) -> CorrelationState:
+        """
+        Bring the cached state for key up to date with the completed returns
+        and return a view that includes the latest (possibly still forming) one.
+        """
+        symbols = list(returns.columns)
+        state = self._states.get(key)
+        index = returns.index
+        position = 0
+
+        if state is not None:
+            last = state.last_timestamp
+            position = index.searchsorted(last, side='right') if last is not None else 0
+            # Universe membership changed or history was restated: rebuild
+            if state.symbols != symbols or position == 0 or index[position - 1] != last:
+                state = None
+                position = 0
+
+        if state is None:
+            state = CorrelationState(symbols, window)
+            position = max(len(returns) - window, 0)
+
+        stop = len(returns) - 1
+        new_rows = returns.iloc[position:stop]
+        if len(new_rows):
+            state.push(new_rows.to_numpy(dtype=float), new_rows.index)
+
+        self._states[key] = state
+        self._states.move_to_end(key)
+        while len(self._states) > self.max_universes:
+            self._states.popitem(last=False)
+
+        view = state.copy()
+        live = returns.iloc[max(position, stop):]
+        view.push(live.to_numpy(dtype=float), live.index)
+        return view
+
+    @staticmethod
+    def _returns(closes: pd.DataFrame) -> pd.DataFrame:
+        """Aligned returns; drops symbols with poor coverage and rows with gaps"""
+        if closes.empty:
+            return closes
+        returns = closes.ffill(limit=2).pct_change().iloc[1:]
+        coverage = returns.notna().mean()
+        returns = returns.loc[:, coverage >= 0.9]
+        return returns.dropna()
+
+
+def analyze_correlation_matrix(
+    symbols: List[str],
+    corr: np.ndarray,
+    top_pairs: int = 10,
+    threshold: float = HIGH_CORRELATION_THRESHOLD
+) -> Dict[str, any]:
+    """
+    Rank pairs and derive diversification warnings from a correlation matrix.
+
+    Args:
+        symbols: Symbols in matrix order
+        corr: N x N correlation matrix
+        top_pairs: Number of most/least correlated pairs to return
+        threshold: Correlation above which a pair triggers a warning
+
+    Returns:
+        Dictionary with average correlation, ranked pairs and warnings
+    """
+    n = len(symbols)
+    rows, cols = np.triu_indices(n, k=1)
+    values = corr[rows, cols]
+    valid = np.isfinite(values)
+    rows, cols, values = rows[valid], cols[valid], values[valid]
+
+    order = np.argsort(values)
+
+    def _pairs(positions: np.ndarray) -> List[Dict[str, any]]:
+        return [
+            {'symbol_a': symbols[rows[p]], 'symbol_b': symbols[cols[p]], 'correlation': float(values[p])}
+            for p in positions
+        ]
+
+    off_diagonal = np.where(np.eye(n, dtype=bool), np.nan, corr)
+    with np.errstate(invalid='ignore'):
+        symbol_average = np.nanmean(off_diagonal, axis=1)
+
+    high = np.flatnonzero(values >= threshold)
+    high = high[np.argsort(values[high])[::-1]]
+
+    warnings = []
+    if len(high):
+        warnings.append(
+            f"{len(high)} pair(s) correlated above {threshold:.2f} - holdings may not diversify each other"
+        )
+    average = float(values.mean()) if len(values) else None
+    if average is not None and average >= 0.6:
+        warnings.append(f"Average pairwise correlation is {average:.2f} - universe moves largely as one")
+
+    return {
+        'average_correlation': average,
+        'symbol_average_correlation': {
+            symbol: float(symbol_average[i]) if np.isfinite(symbol_average[i]) else None
+            for i, symbol in enumerate(symbols)
+        },
+        'most_correlated': _pairs(order[::-1][:top_pairs]),
+        'least_correlated': _pairs(order[:top_pairs]),
+        'high_correlation_pairs': _pairs(high),
+        'diversification_warnings': warnings,
+    }
+
+
+# Global service instance
+correlation_service = CorrelationService()
@@ -0,0 +1,141 @@
+"""
+Currency Resolver
+
+Exchange and currency for a symbol, shared by the REST endpoints and the
+WebSocket payloads. The exchange is always derived from the Yahoo suffix
+with a single dict lookup, so a symbol reports the same exchange before and
+after its metadata is fetched; the currency reported by the fundamentals
+metadata (symbol_fundamentals) wins over the suffix default. Resolving never
+calls upstream.
+"""
+import logging
+from typing import Dict, Optional, Tuple
+
+from .fundamentals_service import fundamentals_service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXCHANGE = "US"
+DEFAULT_CURRENCY = "USD"
+
+# Yahoo symbol suffix -> (Yahoo exchange code, currency)
+SUFFIX_MARKETS: Dict[str, Tuple[str, str]] = {
+    "T": ("JPX", "JPY"),
+    "L": ("LSE", "GBp"),  # London quotes in pence
+    "HK": ("HKG", "HKD"),
+    "KS": ("KSC", "KRW"),
+    "KQ": ("KOE", "KRW"),
+    "SS": ("SHH", "CNY"),
+    "SZ": ("SHZ", "CNY"),
+    "DE": ("GER", "EUR"),
+    "F": ("FRA", "EUR"),
+    "PA": ("PAR", "EUR"),
+    "AS": ("AMS", "EUR"),
+    "MI": ("MIL", "EUR"),
+    "MC": ("MCE", "EUR"),
+    "BR": ("BRU", "EUR"),
+    "SW": ("EBS", "CHF"),
+    "TO": ("TOR", "CAD"),
+    "V": ("VAN", "CAD"),
+    "AX": ("ASX", "AUD"),
+    "NS": ("NSI", "INR"),
+    "BO": ("BSE", "INR"),
+    "SA": ("SAO", "BRL"),
+    "ST": ("STO", "SEK"),
+    "OL": ("OSL", "NOK"),
+    "CO": ("CPH", "DKK"),
+    "TW": ("TAI", "TWD"),
+    "SI": ("SES", "SGD"),
+}
+
+CURRENCY_SYMBOLS: Dict[str, str] = {
+    "USD": "$",
+    "EUR": "€",
+    "GBP": "£",
+    "JPY": "¥",
+    "CNY": "¥",
+    "HKD": "HK$",
+    "KRW": "₩",
+    "CHF": "CHF",
+    "CAD": "CA$",
+    "AUD": "A$",
+    "INR": "₹",
+    "BRL": "R$",
+    "SEK": "kr",
+    "NOK": "kr",
+    "DKK": "kr",
+    "TWD": "NT$",
+    "SGD": "S$",
+}
+
+# Currencies quoted in a minor unit -> (currency, minor units per unit)
+MINOR_UNITS: Dict[str, Tuple[str, int]] = {
+    "GBp": ("GBP", 100),  # London quotes in pence
+}
+
+
+class CurrencyResolver:
+    """
+    Symbol -> exchange -> currency lookups.
+    """
+
+    def resolve(self, symbol: str) -> Dict[str, str]:
+        """
+        Exchange and currency of a symbol.
+
+        Args:
+            symbol: Stock symbol (with Yahoo suffix for non-US listings)
+
+        Returns:
+            Dict with exchange, currency, currencySymbol and priceDivisor
+            (prices divided by it are amounts in currencySymbol, e.g. 100
+            for GBp: pence quotes, pound symbol)
+        """
+        exchange, currency = self._from_suffix(symbol)
+
+        metadata = self._metadata(symbol)
+        if metadata:
+            currency = metadata.get("currency") or currency
+
+        return {
+            "exchange": exchange,
+            "currency": currency,
+            "currencySymbol": currency_symbol(currency),
+            "priceDivisor": MINOR_UNITS.get(currency, (currency, 1))[1],
+        }
+
+    @staticmethod
+    def _from_suffix(symbol: str) -> Tuple[str, str]:
+        symbol = symbol.upper()
+        if symbol.endswith("=X") and len(symbol) >= 8:
+            # Currency pair, e.g. EURUSD=X is quoted in USD
+            return "CCY", symbol[3:6]
+        _, dot, suffix = symbol.rpartition(".")
+        if dot and suffix in SUFFIX_MARKETS:
+            return SUFFIX_MARKETS[suffix]
+        _, dash, quote = symbol.rpartition("-")
+        if dash and quote in CURRENCY_SYMBOLS:
+            # Crypto pair, e.g. BTC-EUR
+            return "CCC", quote
+        return DEFAULT_EXCHANGE, DEFAULT_CURRENCY
+
+    @staticmethod
+    def _metadata(symbol: str) -> Optional[Dict]:
+        try:
+            return fundamentals_service.get_cached(symbol)
+        except Exception as e:
+            logger.warning(f"Could not read stored metadata for {symbol}: {e}")
+            return None
+
+
+def currency_symbol(currency: str) -> str:
+    """
+    Display symbol for an ISO currency code (the code itself if unknown);
+    minor-unit codes get the symbol of their currency ("GBp" -> "£")
+    """
+    currency = MINOR_UNITS.get(currency, (currency, 1))[0]
+    return CURRENCY_SYMBOLS.get(currency, currency)
+
+
+# Global currency resolver instance
+currency_resolver = CurrencyResolver()
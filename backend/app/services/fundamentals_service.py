@@ -0,0 +1,319 @@
+"""
+Fundamentals Service
+
+Slow-changing ticker metadata (names, exchange, currency, market cap, P/E,
+52-week high/low) from yfinance's ticker.info, which is the slowest upstream
+call the app makes. Values are kept in memory and in the symbol_fundamentals
+table and refetched after FUNDAMENTALS_TTL seconds:
+- concurrent lookups of the same symbol share one upstream call
+- expired values are served while a refresh runs in the background
+- a background loop refreshes watched and recently used symbols before
+  they expire, so request paths normally never wait for ticker.info
+"""
+import time
+import asyncio
+import logging
+import threading
+import yfinance as yf
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ..config import get_settings
+from ..models.database import session_scope
+from ..models.market import SymbolFundamentals
+from ..models.watchlist import Watchlist
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# ticker.info key -> stored field
+INFO_FIELDS = {
+    "exchange": "exchange",
+    "quoteType": "quote_type",
+    "currency": "currency",
+    "sector": "sector",
+    "industry": "industry",
+    "marketCap": "market_cap",
+    "trailingPE": "pe_ratio",
+    "fiftyTwoWeekHigh": "high_52w",
+    "fiftyTwoWeekLow": "low_52w",
+}
+
+# Failed lookups are not retried for this many seconds
+FAILURE_BACKOFF = 15 * 60
+
+# Symbols looked up within this window are kept fresh by the background loop
+RECENT_WINDOW = 7 * 24 * 60 * 60
+
+
+class FundamentalsService:
+    """
+    Fundamentals lookups with deduplicated fetches and stale-while-refresh.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        refresh_interval: Optional[int] = None,
+        max_workers: int = 4
+    ):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.FUNDAMENTALS_TTL
+        self.refresh_interval = (
+            refresh_interval if refresh_interval is not None else settings.FUNDAMENTALS_REFRESH_INTERVAL
+        )
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._used: Dict[str, float] = {}
+        self._failed: Dict[str, float] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._not_stored: Set[str] = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fundamentals")
+        self._task: Optional[asyncio.Task] = None
+        self.logger = logger
+
+    def get(self, symbol: str) -> Dict[str, Any]:
+        """Fundamentals for one symbol (fields are None where unknown)"""
+        symbol = symbol.upper()
+        return self.get_many([symbol]).get(symbol) or _empty(symbol)
+
+    def get_many(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fundamentals for many symbols (blocking).
+
+        Fresh and expired values are returned immediately, expired ones are
+        refreshed in the background. Only symbols without any stored value
+        wait for upstream, in parallel.
+
+        Args:
+            symbols: Stock symbols
+
+        Returns:
+            Dict of symbol -> fundamentals (symbol, name, exchange,
+            quote_type, currency, sector, industry, market_cap, pe_ratio,
+            high_52w, low_52w, fetched_at). Symbols upstream knows nothing
+            about are omitted.
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols if s))
+        now = time.time()
+        with self._lock:
+            for symbol in symbols:
+                self._used[symbol] = now
+            unknown = [s for s in symbols if s not in self._entries]
+        if unknown:
+            self._load(unknown)
+
+        result: Dict[str, Dict[str, Any]] = {}
+        waiting: Dict[str, Future] = {}
+        for symbol in symbols:
+            entry = self._entries.get(symbol)
+            if entry is not None:
+                result[symbol] = entry[1]
+                if now - entry[0] > self.ttl_seconds:
+                    self._submit(symbol)
+            else:
+                future = self._submit(symbol)
+                if future is not None:
+                    waiting[symbol] = future
+
+        for symbol, future in waiting.items():
+            try:
+                fundamentals = future.result()
+            except Exception:
+                fundamentals = None
+            if fundamentals is not None:
+                result[symbol] = fundamentals
+        return result
+
+    def get_cached(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Known fundamentals for a symbol (possibly expired) without any
+        upstream call; stored rows are read once per symbol.
+        """
+        symbol = symbol.upper()
+        entry = self._entries.get(symbol)
+        if entry is None and symbol not in self._not_stored:
+            self._load([symbol])
+            entry = self._entries.get(symbol)
+            if entry is None:
+                with self._lock:
+                    self._not_stored.add(symbol)
+        return entry[1] if entry is not None else None
+
+    def refresh(self, symbols: Iterable[str]) -> int:
+        """Refetch symbols from upstream (blocking); returns the number refreshed"""
+        futures = [f for f in (self._submit(s.upper(), force=True) for s in symbols) if f is not None]
+        return sum(1 for future in futures if future.result() is not None)
+
+    def start(self) -> None:
+        """Start the background refresh loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            self.logger.info(f"Fundamentals refresh started (every {self.refresh_interval}s)")
+
+    async def stop(self) -> None:
+        """Cancel the background refresh loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh_due)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Fundamentals refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def refresh_due(self) -> int:
+        """
+        Refresh watched and recently used symbols whose values expire before
+        the next cycle.
+
+        Returns:
+            Number of refreshed symbols
+        """
+        now = time.time()
+        with session_scope() as db:
+            watched = [s for (s,) in db.query(Watchlist.symbol).filter(Watchlist.is_active == True).distinct()]
+        with self._lock:
+            self._used = {s: t for s, t in self._used.items() if now - t <= RECENT_WINDOW}
+            candidates = list(dict.fromkeys([s.upper() for s in watched] + list(self._used)))
+        self._load([s for s in candidates if s not in self._entries])
+
+        due_before = now - self.ttl_seconds + self.refresh_interval
+        due = [s for s in candidates if s not in self._entries or self._entries[s][0] <= due_before]
+        if not due:
+            return 0
+
+        started = time.perf_counter()
+        refreshed = self.refresh(due)
+        self.logger.info(
+            f"Refreshed fundamentals for {refreshed} of {len(due)} symbols in {time.perf_counter() - started:.1f}s"
+        )
+        return refreshed
+
+    def clear(self) -> None:
+        """Clear the in-memory cache (stored rows are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._failed.clear()
+            self._not_stored.clear()
+
+    def _submit(self, symbol: str, force: bool = False) -> Optional[Future]:
+        """Schedule an upstream fetch unless one is running or the symbol recently failed"""
+        with self._lock:
+            future = self._inflight.get(symbol)
+            if future is not None:
+                return future
+            failed_at = self._failed.get(symbol)
+            if not force and failed_at is not None and time.time() - failed_at < FAILURE_BACKOFF:
+                return None
+            future = self._executor.submit(self._fetch_and_store, symbol)
+            self._inflight[symbol] = future
+            return future
+
+    def _fetch_and_store(self, symbol: str) -> Optional[Dict[str, Any]]:
+        try:
+            fundamentals = self._fetch(symbol)
+            with self._lock:
+                if fundamentals is None:
+                    self._failed[symbol] = time.time()
+                else:
+                    self._failed.pop(symbol, None)
+                    self._entries[symbol] = (time.time(), fundamentals)
+            if fundamentals is not None:
+                self._persist(fundamentals)
+            return fundamentals
+        finally:
+            with self._lock:
+                self._inflight.pop(symbol, None)
+
+    def _fetch(self, symbol: str) -> Optional[Dict[str, Any]]:
+        try:
+            info = yf.Ticker(symbol).info or {}
+        except Exception as e:
+            self.logger.warning(f"Could not fetch fundamentals for {symbol}: {e}")
+            return None
+
+        name = info.get("longName") or info.get("shortName")
+        if not name and not info.get("quoteType"):
+            self.logger.warning(f"No fundamentals available for {symbol}")
+            return None
+
+        fundamentals = _empty(symbol)
+        fundamentals["name"] = name or symbol
+        for key, field in INFO_FIELDS.items():
+            value = info.get(key)
+            if value is None or value == "" or value == "Infinity":
+                continue
+            if field == "market_cap":
+                value = int(value)
+            elif field in ("pe_ratio", "high_52w", "low_52w"):
+                value = float(value)
+            fundamentals[field] = value
+        fundamentals["fetched_at"] = datetime.now(timezone.utc)
+        return fundamentals
+
+    def _load(self, symbols: List[str]) -> None:
+        """Fill the in-memory cache from stored rows"""
+        try:
+            with session_scope() as db:
+                rows = db.query(SymbolFundamentals).filter(SymbolFundamentals.symbol.in_(symbols)).all()
+                loaded = {row.symbol: _from_row(row) for row in rows}
+        except Exception as e:
+            self.logger.error(f"Could not load stored fundamentals: {e}")
+            return
+
+        with self._lock:
+            for symbol, fundamentals in loaded.items():
+                fetched_at = fundamentals["fetched_at"]
+                if fetched_at.tzinfo is None:
+                    fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+                self._entries.setdefault(symbol, (fetched_at.timestamp(), fundamentals))
+
+    def _persist(self, fundamentals: Dict[str, Any]) -> None:
+        try:
+            with session_scope() as db:
+                dialect_insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+                statement = dialect_insert(SymbolFundamentals).values(**fundamentals)
+                statement = statement.on_conflict_do_update(
+                    index_elements=[SymbolFundamentals.symbol],
+                    set_={
+                        field: statement.excluded[field]
+                        for field in fundamentals if field != "symbol"
+                    },
+                )
+                db.execute(statement)
+                db.commit()
+        except Exception as e:
+            self.logger.error(f"Could not store fundamentals for {fundamentals['symbol']}: {e}")
+
+
+def _empty(symbol: str) -> Dict[str, Any]:
+    fundamentals: Dict[str, Any] = {"symbol": symbol, "name": None}
+    fundamentals.update({field: None for field in INFO_FIELDS.values()})
+    fundamentals["fetched_at"] = None
+    return fundamentals
+
+
+def _from_row(row: SymbolFundamentals) -> Dict[str, Any]:
+    fundamentals = _empty(row.symbol)
+    fundamentals["name"] = row.name
+    for field in INFO_FIELDS.values():
+        fundamentals[field] = getattr(row, field)
+    fundamentals["fetched_at"] = row.fetched_at
+    return fundamentals
+
+
+# Global fundamentals service instance
+fundamentals_service = FundamentalsService()
@@ -0,0 +1,200 @@
+"""
+Market Data
+
+Timeframe resolution, yfinance history fetching and OHLCV DataFrame
+conversions shared by the services and the API routes.
+"""
+import numpy as np
+import pandas as pd
+import yfinance as yf
+import logging
+from typing import Dict, List, Tuple, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+
+# Timeframe mapping for yfinance data fetching
+# Maps UI timeframe selection to yfinance period and interval
+TIMEFRAME_MAP: Dict[str, Tuple[str, str]] = {
+    "1D": ("1d", "5m"),
+    "1W": ("7d", "1h"),
+    "1M": ("1mo", "1d"),
+    "3M": ("3mo", "1d"),
+    "6M": ("6mo", "1d"),
+    "1Y": ("1y", "1d"),
+    "YTD": ("ytd", "1d")
+}
+
+# Multi-day intraday histories for intraday timeframes, used to build
+# time-of-day volume profiles (internal, not exposed as UI timeframes)
+PROFILE_TIMEFRAME_MAP: Dict[str, Tuple[str, str]] = {
+    "1D:profile": ("1mo", "5m"),
+    "1W:profile": ("3mo", "1h"),
+}
+
+
+# Last few daily bars for quotes: the last bar is today's (live) session
+QUOTE_TIMEFRAME = "quote"
+QUOTE_TIMEFRAME_MAP: Dict[str, Tuple[str, str]] = {
+    QUOTE_TIMEFRAME: ("5d", "1d"),
+}
+
+
+def resolve_timeframe(timeframe: str) -> Tuple[str, str]:
+    """yfinance (period, interval) for a UI, profile or quote timeframe"""
+    return (
+        TIMEFRAME_MAP.get(timeframe)
+        or PROFILE_TIMEFRAME_MAP.get(timeframe)
+        or QUOTE_TIMEFRAME_MAP.get(timeframe, ("1mo", "1d"))
+    )
+
+
+def fetch_yfinance_data(symbol: str, timeframe: str = "1M") -> Optional[pd.DataFrame]:
+    """
+    Fetch market data from yfinance for a given symbol and timeframe.
+
+    Args:
+        symbol: Stock symbol (e.g., "AAPL")
+        timeframe: Timeframe selection (1D, 1W, 1M, 3M, 6M, YTD, 1Y)
+
+    Returns:
+        DataFrame with OHLCV data or None if fetch fails
+
+    Raises:
+        ValueError: If symbol is empty or timeframe is invalid
+    """
+    if not symbol:
+        raise ValueError("Symbol cannot be empty")
+
+    period, interval = resolve_timeframe(timeframe)
+
+    try:
+        ticker = yf.Ticker(symbol)
+        hist = ticker.history(period=period, interval=interval)
+
+        if hist.empty:
+            logger.warning(f"No data found for symbol {symbol} with timeframe {timeframe}")
+            return None
+
+        return hist
+
+    except Exception as e:
+        logger.error(f"Error fetching data for {symbol}: {e}")
+        return None
+
+
+def validate_timeframe(timeframe: str) -> bool:
+    """
+    Validate that a timeframe string is supported.
+
+    Args:
+        timeframe: Timeframe string to validate
+
+    Returns:
+        True if valid, False otherwise
+    """
+    return timeframe in TIMEFRAME_MAP
+
+
+# === DATAFRAME CONVERSION ===
+
+# OHLCV columns and their keys in API payloads
+MARKET_DATA_COLUMNS: Dict[str, str] = {
+    'Open': 'open',
+    'High': 'high',
+    'Low': 'low',
+    'Close': 'close',
+    'Volume': 'volume',
+}
+
+
+def epoch_seconds(index: pd.DatetimeIndex) -> np.ndarray:
+    """Unix timestamps (seconds) of a DatetimeIndex; naive timestamps are taken as UTC"""
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.to_numpy().astype('datetime64[s]').astype(np.int64)
+
+
+def isoformat_index(index: pd.DatetimeIndex) -> List[str]:
+    """
+    ISO 8601 strings of a DatetimeIndex, equal to Timestamp.isoformat().
+
+    Formats the local wall-clock times with numpy and appends the UTC offset,
+    which is computed once per distinct offset instead of once per timestamp.
+    """
+    if len(index) == 0:
+        return []
+    local = index.tz_localize(None) if index.tz is not None else index
+    values = local.to_numpy()
+    unit = 's' if (local.microsecond == 0).all() and (local.nanosecond == 0).all() else 'us'
+    strings = np.datetime_as_string(values, unit=unit)
+    if index.tz is None:
+        return strings.tolist()
+
+    utc = index.tz_convert('UTC').tz_localize(None).to_numpy()
+    offsets = ((values - utc) // np.timedelta64(1, 'm')).astype(np.int64)
+    distinct, positions = np.unique(offsets, return_inverse=True)
+    suffixes = np.array([_format_offset(offset) for offset in distinct.tolist()])
+    return np.char.add(strings, suffixes[positions]).tolist()
+
+
+def _format_offset(minutes: int) -> str:
+    sign = '+' if minutes >= 0 else '-'
+    hours, minutes = divmod(abs(minutes), 60)
+    return f"{sign}{hours:02d}:{minutes:02d}"
+
+
+def hist_to_columns(hist: pd.DataFrame, timestamps: str = "iso") -> Dict[str, list]:
+    """
+    Convert an OHLCV DataFrame to columnar lists.
+
+    Args:
+        hist: OHLCV data
+        timestamps: "iso" for ISO 8601 strings, "epoch" for Unix seconds
+
+    Returns:
+        Dict with a timestamp list and one list per OHLCV column
+        (volume as int, missing volume as 0)
+    """
+    columns: Dict[str, list] = {
+        'timestamp': epoch_seconds(hist.index).tolist() if timestamps == "epoch" else isoformat_index(hist.index)
+    }
+    for column, key in MARKET_DATA_COLUMNS.items():
+        if column not in hist.columns:
+            continue
+        values = hist[column].to_numpy(dtype=float)
+        if column == 'Volume':
+            columns[key] = np.nan_to_num(values).astype(np.int64).tolist()
+        else:
+            columns[key] = values.tolist()
+    return columns
+
+
+def hist_to_records(hist: pd.DataFrame, timestamps: str = "iso") -> List[Dict[str, Any]]:
+    """
+    Convert an OHLCV DataFrame to a list of bar dicts
+    (timestamp, open, high, low, close, volume).
+
+    Args:
+        hist: OHLCV data
+        timestamps: "iso" for ISO 8601 strings, "epoch" for Unix seconds
+
+    Returns:
+        List of dicts, one per bar
+    """
+    columns = hist_to_columns(hist, timestamps)
+    if len(columns) == len(MARKET_DATA_COLUMNS) + 1:
+        # Literal dicts are about twice as fast as dict(zip(...)) per row
+        return [
+            {'timestamp': ts, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
+            for ts, o, h, l, c, v in zip(*columns.values())
+        ]
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+
+def series_to_timestamp_map(series: pd.Series) -> Dict[int, float]:
+    """Unix timestamp -> value for the finite values of a series (chart overlays)"""
+    values = series.to_numpy(dtype=float)
+    finite = np.isfinite(values)
+    return dict(zip(epoch_seconds(series.index[finite]).tolist(), values[finite].tolist()))
@@ -2,9 +2,11 @@ from sqlalchemy.orm import Session
 import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Union
 import logging
-import requests
+
+from .market_data import hist_to_columns, hist_to_records
+from .symbol_search import symbol_search
 
 # Logger Konfiguration
 logger = logging.getLogger(__name__)
@@ -34,10 +36,16 @@ class MarketService:
         }
         return timeframe_map.get(timeframe, ('1mo', '1d'))
 
-    async def fetch_market_data(self, symbol: str, period: str = "3mo", interval: str = "1d") -> List[Dict]:
-        """Daten von Yahoo Finance abrufen, wenn sie nicht im Cache vorhanden sind"""
-        cache_key = f"{symbol}_{period}_{interval}"
-        if cache_key in self.cache:
+    async def fetch_market_data(
+        self, symbol: str, period: str = "3mo", interval: str = "1d", orient: str = "records"
+    ) -> Union[List[Dict], Dict[str, list]]:
+        """
+        Daten von Yahoo Finance abrufen, wenn sie nicht im Cache vorhanden sind.
+
+        orient="records" liefert eine Liste von Bars, orient="columnar" ein Dict mit einer Liste pro Spalte.
+        """
+        cache_key = f"{symbol}_{period}_{interval}_{orient}"
+        if cache_key in self.cache['market_data']:
             cached = self.cache['market_data'][cache_key]
             if datetime.now() - cached['timestamp'] < self.cache_duration:
                 return cached['data']
@@ -59,17 +67,7 @@ class MarketService:
                     'Volume': 'sum'
                 }).dropna()
 
-            data = [
-                {
-                    'timestamp': idx.isoformat(),
-                    'open': float(row['Open']),
-                    'high': float(row['High']),
-                    'low': float(row['Low']),
-                    'close': float(row['Close']),
-                    'volume': int(row['Volume']),
-                }
-                for idx, row in df.iterrows()
-            ]
+            data = hist_to_columns(df) if orient == "columnar" else hist_to_records(df)
 
             self.cache['market_data'][cache_key] = {'data': data, 'timestamp': datetime.now()}
             return data
@@ -361,32 +359,6 @@ class MarketService:
             logger.error(f"Signal generation error: {e}")
             return []
 
-    async def search_stocks(self, query: str) -> List[Dict]:
-        """Suche nach Stocks mit Cache"""
-        try:
-            response = requests.get(
-                "https://query2.finance.yahoo.com/v1/finance/search",
-                params={
-                    'q': query,
-                    'quotesCount': 5,
-                    'newsCount': 0
-                },
-                headers={
-                    'User-Agent': 'Mozilla/5.0'  # Manchmal hilft ein User-Agent
-                }
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                return [{
-                    'symbol': quote.get('symbol'),
-                    'name': quote.get('shortname', ''),
-                    'exchange': quote.get('exchange', '')
-                } for quote in data.get('quotes', [])
-                    if quote.get('symbol')]
-
-            return []
-
-        except Exception as e:
-            logger.error(f"Search error: {str(e)}")
-            return []
\ No newline at end of file
+    async def search_stocks(self, query: str, limit: int = 10) -> List[Dict]:
+        """Suche nach Stocks im lokalen Symbol-Index (Yahoo nur bei Fehltreffern)"""
+        return await symbol_search.search(self.db, query, limit)
@@ -5,9 +5,18 @@ Combines all technical indicators, risk metrics, patterns, and signals
 into a single comprehensive score (0-100) with buy/sell/hold recommendation.
 """
 import logging
+import numpy as np
+import pandas as pd
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from .technical_indicators import calculate_indicator_series
+from .signal_generation import generate_signal_points_series
+from .risk_metrics import calculate_risk_score_series
+from .scoring_profiles import (
+    BUILTIN_PROFILES, COMPONENTS, DEFAULT_PROFILE_NAME, CompiledScoringProfile, scoring_profiles
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,15 +29,13 @@ class MasterScoreService:
     - Medium-term signals (30%): MACD, ADX, SMA crossovers
     - Long-term signals (20%): Trends, Support/Resistance, SMA200
     - Risk metrics (20%): Volatility, Drawdown, Liquidity
+
+    Other weightings and thresholds are selected with a compiled scoring
+    profile (see scoring_profiles); the above is the "balanced" default.
     """
 
-    # Score weights configuration
-    WEIGHTS = {
-        "short_term": 0.30,
-        "medium_term": 0.30,
-        "long_term": 0.20,
-        "risk": 0.20,
-    }
+    # Score weights configuration (default profile)
+    WEIGHTS = BUILTIN_PROFILES[DEFAULT_PROFILE_NAME]["weights"]
 
     # Score ranges for classification
     SCORE_RANGES = {
@@ -39,6 +46,9 @@ class MasterScoreService:
         "STRONG_BUY": (80, 100),
     }
 
+    # Points a BUY (+) or SELL (-) signal adds to its timeframe's score
+    STRENGTH_POINTS = {'WEAK': 5, 'MEDIUM': 10, 'STRONG': 15, 'VERY_STRONG': 20}
+
     def __init__(self):
         self.logger = logger
 
@@ -48,6 +58,7 @@ class MasterScoreService:
         signals: List[Dict],
         risk_metrics: Optional[Dict] = None,
         patterns: Optional[List[Dict]] = None,
+        profile: Optional[CompiledScoringProfile] = None,
     ) -> Dict[str, Any]:
         """
         Calculate the master investment score.
@@ -57,72 +68,257 @@ class MasterScoreService:
             signals: List of trading signals
             risk_metrics: Optional risk metrics dict
             patterns: Optional detected patterns
+            profile: Optional compiled scoring profile (defaults to "balanced")
 
         Returns:
             Dict with master_score, recommendation, confidence, and breakdown
         """
         try:
             current = technical_indicators.get('current', {})
-
-            # Calculate component scores
-            short_term_score = self._calculate_short_term_score(current, signals)
-            medium_term_score = self._calculate_medium_term_score(current, signals)
-            long_term_score = self._calculate_long_term_score(current, signals, patterns)
-            risk_score = self._calculate_risk_score(risk_metrics, current)
-
-            # Weighted final score
-            final_score = (
-                short_term_score * self.WEIGHTS["short_term"] +
-                medium_term_score * self.WEIGHTS["medium_term"] +
-                long_term_score * self.WEIGHTS["long_term"] +
-                risk_score * self.WEIGHTS["risk"]
-            )
-
-            # Clamp to 0-100
-            final_score = max(0, min(100, final_score))
-
-            # Determine recommendation and confidence
-            recommendation, confidence_level = self._get_recommendation(final_score, current)
-
-            # Get top contributing factors
-            top_factors = self._get_top_contributing_factors(
-                short_term_score, medium_term_score, long_term_score, risk_score
-            )
-
-            return {
-                "master_score": round(final_score, 2),
-                "recommendation": recommendation,
-                "confidence": confidence_level,
-                "breakdown": {
-                    "short_term": {
-                        "score": round(short_term_score, 2),
-                        "weight": self.WEIGHTS["short_term"],
-                        "label": "Short-term (RSI, Stochastic, Williams %R)"
-                    },
-                    "medium_term": {
-                        "score": round(medium_term_score, 2),
-                        "weight": self.WEIGHTS["medium_term"],
-                        "label": "Medium-term (MACD, ADX, SMA Crossovers)"
-                    },
-                    "long_term": {
-                        "score": round(long_term_score, 2),
-                        "weight": self.WEIGHTS["long_term"],
-                        "label": "Long-term (Trends, Support/Resistance)"
-                    },
-                    "risk": {
-                        "score": round(risk_score, 2),
-                        "weight": self.WEIGHTS["risk"],
-                        "label": "Risk Metrics (Volatility, Drawdown)"
-                    }
-                },
-                "top_factors": top_factors,
-                "timestamp": datetime.now().isoformat()
-            }
+            components = self.calculate_components(technical_indicators, signals, risk_metrics, patterns)
+            return self.score_components(components, current, profile)
 
         except Exception as e:
             self.logger.error(f"Error calculating master score: {e}")
             return self._get_error_response()
 
+    def calculate_components(
+        self,
+        technical_indicators: Dict,
+        signals: List[Dict],
+        risk_metrics: Optional[Dict] = None,
+        patterns: Optional[List[Dict]] = None,
+    ) -> Dict[str, float]:
+        """
+        Calculate the profile-independent component scores (0-100).
+
+        Returns:
+            Dict with short_term, medium_term, long_term and risk scores
+        """
+        current = technical_indicators.get('current', {})
+        return {
+            "short_term": self._calculate_short_term_score(current, signals),
+            "medium_term": self._calculate_medium_term_score(current, signals),
+            "long_term": self._calculate_long_term_score(current, signals, patterns),
+            "risk": self._calculate_risk_score(risk_metrics, current),
+        }
+
+    def score_components(
+        self,
+        components: Dict[str, float],
+        current: Dict,
+        profile: Optional[CompiledScoringProfile] = None,
+    ) -> Dict[str, Any]:
+        """
+        Weight component scores with a scoring profile.
+
+        Args:
+            components: Output of calculate_components
+            current: Current technical indicators (for confidence)
+            profile: Optional compiled scoring profile (defaults to "balanced")
+
+        Returns:
+            Dict with master_score, recommendation, confidence, and breakdown
+        """
+        profile = profile or scoring_profiles.default
+        weights = profile.weights
+
+        short_term_score = components["short_term"]
+        medium_term_score = components["medium_term"]
+        long_term_score = components["long_term"]
+        risk_score = components["risk"]
+
+        # Weighted final score, clamped to 0-100
+        final_score = float(profile.score(np.array([components[c] for c in COMPONENTS])))
+
+        # Determine recommendation and confidence
+        recommendation, confidence_level = self._get_recommendation(final_score, current, profile)
+
+        # Get top contributing factors
+        top_factors = self._get_top_contributing_factors(
+            short_term_score, medium_term_score, long_term_score, risk_score, weights
+        )
+
+        return {
+            "master_score": round(final_score, 2),
+            "recommendation": recommendation,
+            "confidence": confidence_level,
+            "breakdown": {
+                "short_term": {
+                    "score": round(short_term_score, 2),
+                    "weight": weights["short_term"],
+                    "label": "Short-term (RSI, Stochastic, Williams %R)"
+                },
+                "medium_term": {
+                    "score": round(medium_term_score, 2),
+                    "weight": weights["medium_term"],
+                    "label": "Medium-term (MACD, ADX, SMA Crossovers)"
+                },
+                "long_term": {
+                    "score": round(long_term_score, 2),
+                    "weight": weights["long_term"],
+                    "label": "Long-term (Trends, Support/Resistance)"
+                },
+                "risk": {
+                    "score": round(risk_score, 2),
+                    "weight": weights["risk"],
+                    "label": "Risk Metrics (Volatility, Drawdown)"
+                }
+            },
+            "top_factors": top_factors,
+            "profile": profile.name,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def calculate_master_score_series(
+        self,
+        hist: pd.DataFrame,
+        indicator_series: Optional[pd.DataFrame] = None,
+        risk_scores: Optional[pd.Series] = None,
+        profile: Optional[CompiledScoringProfile] = None,
+    ) -> pd.DataFrame:
+        """
+        Calculate the master score for every bar of a history at once.
+
+        Array-based counterpart of calculate_master_score using the same weights,
+        thresholds and signal rules. Candlestick/chart patterns are not scored
+        per bar, so the long-term component only reflects trend signals.
+
+        Args:
+            hist: Historical OHLCV data
+            indicator_series: Optional precomputed calculate_indicator_series output
+            risk_scores: Optional precomputed composite risk score series
+            profile: Optional compiled scoring profile (defaults to "balanced")
+
+        Returns:
+            DataFrame indexed like hist with component scores, master_score,
+            recommendation and confidence columns
+        """
+        if indicator_series is None:
+            indicator_series = calculate_indicator_series(hist)
+        if risk_scores is None:
+            risk_scores = calculate_risk_score_series(hist, indicator_series)
+
+        signal_points = generate_signal_points_series(hist, indicator_series, self.STRENGTH_POINTS)
+        components = self._calculate_component_series(
+            indicator_series,
+            signal_points,
+            pd.DataFrame({'overall_risk_score': risk_scores}, index=hist.index),
+        )
+
+        profile = profile or scoring_profiles.default
+        final_score = profile.score(components[list(COMPONENTS)].to_numpy())
+
+        data_quality = indicator_series.notna().mean(axis=1).to_numpy() if indicator_series.shape[1] else np.zeros(len(hist))
+
+        result = components.copy()
+        result['master_score'] = final_score
+        result['recommendation'] = profile.classify(final_score)
+        result['confidence'] = np.select(
+            [data_quality >= 0.8, data_quality >= 0.5], ["HIGH", "MEDIUM"], default="LOW"
+        )
+        return result
+
+    def _calculate_component_series(
+        self,
+        indicators: pd.DataFrame,
+        signal_points: pd.DataFrame,
+        risk_metrics: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """Vectorized short/medium/long/risk component scores (0-100) per bar"""
+        n = len(indicators)
+        nan = np.full(n, np.nan)
+
+        def col(frame: Optional[pd.DataFrame], name: str) -> np.ndarray:
+            if frame is None or name not in frame.columns:
+                return nan
+            return frame[name].to_numpy(dtype=float)
+
+        # === SHORT-TERM ===
+        rsi = col(indicators, 'rsi')
+        stoch_k, stoch_d = col(indicators, 'stoch_k'), col(indicators, 'stoch_d')
+        williams_r = col(indicators, 'williams_r')
+        cci = col(indicators, 'cci')
+        stoch_ok = ~np.isnan(stoch_k) & ~np.isnan(stoch_d)
+
+        short = np.full(n, 50.0)
+        short += np.select(
+            [rsi < 30, rsi > 70],
+            [np.minimum(25, 30 - rsi), -np.minimum(25, rsi - 70)], default=0
+        )
+        short += np.select(
+            [stoch_ok & (stoch_k < 20) & (stoch_d < 20),
+             stoch_ok & (stoch_k > 80) & (stoch_d > 80),
+             stoch_ok & (stoch_k > stoch_d) & (stoch_k < 80),
+             stoch_ok & (stoch_k < stoch_d) & (stoch_k > 20)],
+            [20, -20, 10, -10], default=0
+        )
+        short += np.select([williams_r < -80, williams_r > -20], [15, -15], default=0)
+        short += np.select([cci < -100, cci > 100], [10, -10], default=0)
+        short += col(signal_points, 'short')
+
+        indicators_count = (
+            (~np.isnan(rsi)).astype(int) + stoch_ok.astype(int) +
+            (~np.isnan(williams_r)).astype(int) + (~np.isnan(cci)).astype(int)
+        )
+        short = np.where(indicators_count > 0, short / ((indicators_count * 0.2) + 0.8), short)
+
+        # === MEDIUM-TERM ===
+        macd, macd_signal = col(indicators, 'macd'), col(indicators, 'macd_signal')
+        macd_histogram = col(indicators, 'macd_histogram')
+        adx, plus_di, minus_di = col(indicators, 'adx'), col(indicators, 'plus_di'), col(indicators, 'minus_di')
+        sma_20, sma_50 = col(indicators, 'sma_20'), col(indicators, 'sma_50')
+        macd_ok = ~np.isnan(macd) & ~np.isnan(macd_signal)
+        di_ok = ~np.isnan(plus_di) & ~np.isnan(minus_di) & (plus_di != 0) & (minus_di != 0)
+        sma_ok = ~np.isnan(sma_20) & ~np.isnan(sma_50)
+
+        medium = np.full(n, 50.0)
+        medium += np.select(
+            [macd_ok & (macd > macd_signal) & (macd_histogram > 0),
+             macd_ok & (macd > macd_signal),
+             macd_ok & (macd_histogram < 0),
+             macd_ok],
+            [25, 15, -25, -15], default=0
+        )
+        medium += np.select(
+            [(adx > 25) & di_ok & (plus_di > minus_di), (adx > 25) & di_ok, adx < 20],
+            [15, -15, -5], default=0
+        )
+        medium += np.select([sma_ok & (sma_20 > sma_50), sma_ok], [15, -15], default=0)
+        medium += col(signal_points, 'medium')
+
+        # === LONG-TERM ===
+        sma_200, close = col(indicators, 'sma_200'), col(indicators, 'close')
+        sma_200_ok = ~np.isnan(sma_200) & ~np.isnan(close)
+
+        long = np.full(n, 50.0)
+        long += np.select([sma_200_ok & (close > sma_200), sma_200_ok], [20, -20], default=0)
+        long += col(signal_points, 'long')
+
+        # === RISK ===
+        risk = np.full(n, 50.0)
+        for name, weight, transform in (
+            ('volatility_score', 0.3, lambda v: 100 - v),
+            ('drawdown', 0.3, lambda v: 100 - np.abs(v)),
+            ('liquidity_risk', 0.2, lambda v: 100 - v),
+            ('overall_risk_score', 0.2, lambda v: 100 - v),
+        ):
+            values = col(risk_metrics, name)
+            risk += np.where(np.isnan(values), 0, transform(values) * weight)
+
+        atr = col(indicators, 'atr')
+        atr_ok = ~np.isnan(atr) & ~np.isnan(close) & (close > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            atr_percent = atr / close * 100
+        risk += np.select([atr_ok & (atr_percent < 1), atr_ok & (atr_percent > 3)], [10, -10], default=0)
+
+        return pd.DataFrame({
+            'short_term': np.clip(short, 0, 100),
+            'medium_term': np.clip(medium, 0, 100),
+            'long_term': np.clip(long, 0, 100),
+            'risk': np.clip(risk, 0, 100),
+        }, index=indicators.index)
+
     def _calculate_short_term_score(self, current: Dict, signals: List[Dict]) -> float:
         """Calculate short-term score (0-100) based on momentum indicators"""
         score = 50.0  # Start neutral
@@ -175,9 +371,9 @@ class MasterScoreService:
         short_signals = [s for s in signals if s.get('timeframe') == 'short']
         for signal in short_signals:
             if signal.get('type') == 'BUY':
-                score += {'WEAK': 5, 'MEDIUM': 10, 'STRONG': 15, 'VERY_STRONG': 20}.get(signal.get('strength'), 0)
+                score += self.STRENGTH_POINTS.get(signal.get('strength'), 0)
             elif signal.get('type') == 'SELL':
-                score -= {'WEAK': 5, 'MEDIUM': 10, 'STRONG': 15, 'VERY_STRONG': 20}.get(signal.get('strength'), 0)
+                score -= self.STRENGTH_POINTS.get(signal.get('strength'), 0)
 
         # Normalize if we have multiple indicators
         if indicators_count > 0:
@@ -233,9 +429,9 @@ class MasterScoreService:
         medium_signals = [s for s in signals if s.get('timeframe') == 'medium']
         for signal in medium_signals:
             if signal.get('type') == 'BUY':
-                score += {'WEAK': 5, 'MEDIUM': 10, 'STRONG': 15, 'VERY_STRONG': 20}.get(signal.get('strength'), 0)
+                score += self.STRENGTH_POINTS.get(signal.get('strength'), 0)
             elif signal.get('type') == 'SELL':
-                score -= {'WEAK': 5, 'MEDIUM': 10, 'STRONG': 15, 'VERY_STRONG': 20}.get(signal.get('strength'), 0)
+                score -= self.STRENGTH_POINTS.get(signal.get('strength'), 0)
 
         return max(0, min(100, score))
 
@@ -257,9 +453,9 @@ class MasterScoreService:
         long_signals = [s for s in signals if s.get('timeframe') == 'long']
         for signal in long_signals:
             if signal.get('type') == 'BUY':
-                score += {'WEAK': 5, 'MEDIUM': 10, 'STRONG': 15, 'VERY_STRONG': 20}.get(signal.get('strength'), 0)
+                score += self.STRENGTH_POINTS.get(signal.get('strength'), 0)
             elif signal.get('type') == 'SELL':
-                score -= {'WEAK': 5, 'MEDIUM': 10, 'STRONG': 15, 'VERY_STRONG': 20}.get(signal.get('strength'), 0)
+                score -= self.STRENGTH_POINTS.get(signal.get('strength'), 0)
 
         # Pattern analysis (if available)
         if patterns:
@@ -324,55 +520,51 @@ class MasterScoreService:
 
         return max(0, min(100, score))
 
-    def _get_recommendation(self, score: float, current: Dict) -> tuple[str, str]:
+    def _get_recommendation(
+        self,
+        score: float,
+        current: Dict,
+        profile: Optional[CompiledScoringProfile] = None
+    ) -> tuple[str, str]:
         """
         Get recommendation and confidence level based on score.
 
         Returns:
             Tuple of (recommendation, confidence_level)
         """
-        # Determine recommendation
-        if score >= 80:
-            recommendation = "STRONG_BUY"
-        elif score >= 60:
-            recommendation = "BUY"
-        elif score >= 40:
-            recommendation = "HOLD"
-        elif score >= 20:
-            recommendation = "SELL"
-        else:
-            recommendation = "STRONG_SELL"
-
-        # Determine confidence based on data availability
+        # Determine recommendation from the profile thresholds
+        recommendation = (profile or scoring_profiles.default).recommendation(score)
+
+        return recommendation, self.get_confidence(current)
+
+    def get_confidence(self, current: Dict) -> str:
+        """Confidence level (HIGH/MEDIUM/LOW) based on data availability"""
         available_indicators = sum(1 for v in current.values() if v is not None)
         total_indicators = len(current)
 
         if total_indicators > 0:
             data_quality = available_indicators / total_indicators
             if data_quality >= 0.8:
-                confidence_level = "HIGH"
+                return "HIGH"
             elif data_quality >= 0.5:
-                confidence_level = "MEDIUM"
-            else:
-                confidence_level = "LOW"
-        else:
-            confidence_level = "LOW"
-
-        return recommendation, confidence_level
+                return "MEDIUM"
+        return "LOW"
 
     def _get_top_contributing_factors(
         self,
         short_term: float,
         medium_term: float,
         long_term: float,
-        risk: float
+        risk: float,
+        weights: Optional[Dict[str, float]] = None
     ) -> List[Dict[str, Any]]:
         """Get top 3 factors contributing to the score"""
+        weights = weights or self.WEIGHTS
         factors = [
-            {"name": "Short-term Momentum", "score": short_term, "weight": self.WEIGHTS["short_term"]},
-            {"name": "Medium-term Trend", "score": medium_term, "weight": self.WEIGHTS["medium_term"]},
-            {"name": "Long-term Trend", "score": long_term, "weight": self.WEIGHTS["long_term"]},
-            {"name": "Risk Metrics", "score": risk, "weight": self.WEIGHTS["risk"]},
+            {"name": "Short-term Momentum", "score": short_term, "weight": weights["short_term"]},
+            {"name": "Medium-term Trend", "score": medium_term, "weight": weights["medium_term"]},
+            {"name": "Long-term Trend", "score": long_term, "weight": weights["long_term"]},
+            {"name": "Risk Metrics", "score": risk, "weight": weights["risk"]},
         ]
 
         # Sort by absolute deviation from 50 (neutral)
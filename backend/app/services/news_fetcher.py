@@ -0,0 +1,194 @@
+"""
+News Fetcher
+
+Queries all news sources for a symbol concurrently, each with its own timeout,
+and merges the results with duplicates removed. Latency is bounded by the
+slowest single source instead of the sum of all sources.
+"""
+import asyncio
+import logging
+import feedparser
+import httpx
+import yfinance as yf
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+RSS_URL = "https://query1.finance.yahoo.com/rss?s={symbol}"
+
+
+class NewsFetcher:
+    """
+    Concurrent news fetcher for yfinance news and the Yahoo Finance RSS feed.
+
+    Policies:
+    - "merge": wait for all sources (up to the timeout) and merge their articles
+    - "first": return the first source that yields articles
+
+    fetch_many() shares one semaphore across all callers, so concurrent batch
+    requests never run more than max_concurrency symbol fetches at once.
+    """
+
+    def __init__(self, timeout: float = 5.0, max_items: int = 10, max_concurrency: int = 8):
+        self.timeout = timeout
+        self.max_items = max_items
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.logger = logger
+
+    async def fetch_many(self, symbols: List[str], policy: str = "merge") -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch news for many symbols concurrently under the global concurrency cap.
+
+        Args:
+            symbols: Stock symbols
+            policy: "merge" or "first"
+
+        Returns:
+            Dict of symbol -> articles (failed symbols map to an empty list)
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch_one(symbol: str) -> List[Dict[str, Any]]:
+            async with self._semaphore:
+                return await self.fetch(symbol, policy)
+
+        results = await asyncio.gather(*(fetch_one(symbol) for symbol in symbols), return_exceptions=True)
+        news = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, BaseException):
+                self.logger.warning(f"News fetch failed for {symbol}: {result!r}")
+                result = []
+            news[symbol] = result
+        return news
+
+    async def fetch(self, symbol: str, policy: str = "merge") -> List[Dict[str, Any]]:
+        """
+        Fetch news for a symbol from all sources.
+
+        Args:
+            symbol: Stock symbol
+            policy: "merge" or "first"
+
+        Returns:
+            List of deduplicated articles (id, title, summary, link, published, source)
+        """
+        sources = {
+            "Yahoo Finance": self._fetch_yfinance(symbol),
+            "Yahoo Finance RSS": self._fetch_rss(symbol),
+        }
+        tasks = {
+            asyncio.ensure_future(asyncio.wait_for(coro, self.timeout)): name
+            for name, coro in sources.items()
+        }
+
+        if policy == "first":
+            try:
+                for next_done in asyncio.as_completed(list(tasks)):
+                    try:
+                        items = await next_done
+                    except Exception as e:
+                        self.logger.warning(f"News source failed for {symbol}: {e!r}")
+                        continue
+                    if items:
+                        return dedupe_articles(items)[:self.max_items]
+                return []
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        merged = []
+        for (task, name), result in zip(tasks.items(), results):
+            if isinstance(result, BaseException):
+                self.logger.warning(f"{name} news fetch failed for {symbol}: {result!r}")
+                continue
+            self.logger.info(f"Fetched {len(result)} news items from {name} for {symbol}")
+            merged.extend(result)
+
+        return dedupe_articles(merged)
+
+    async def _fetch_yfinance(self, symbol: str) -> List[Dict[str, Any]]:
+        """yfinance news (blocking client, run in a worker thread)"""
+        yf_news = await asyncio.to_thread(lambda: yf.Ticker(symbol).news)
+        news_items = []
+
+        # yfinance returns news as a list of dicts with NEW structure:
+        # [{'id': ..., 'content': {'title': ..., 'summary': ..., 'canonicalUrl': ..., 'pubDate': ...}}]
+        for item in (yf_news or [])[:self.max_items]:
+            content = item.get('content', {})
+            if not content or not content.get('title'):
+                continue
+
+            # Extract link from canonicalUrl or clickThroughUrl
+            canonical_url = content.get('canonicalUrl', {})
+            click_url = content.get('clickThroughUrl', {})
+            link_url = canonical_url.get('url', '') if isinstance(canonical_url, dict) else ''
+            if not link_url:
+                link_url = click_url.get('url', '') if isinstance(click_url, dict) else ''
+
+            news_items.append({
+                "id": item.get('id') or content.get('id') or link_url,
+                "title": content.get('title', ''),
+                "summary": (content.get('summary') or '')[:500],  # Limit summary length
+                "link": link_url,
+                "published": content.get('pubDate', ''),
+                "source": "Yahoo Finance"
+            })
+
+        return news_items
+
+    async def _fetch_rss(self, symbol: str) -> List[Dict[str, Any]]:
+        """Yahoo Finance RSS feed"""
+        async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
+            response = await client.get(RSS_URL.format(symbol=symbol))
+            response.raise_for_status()
+
+        feed = feedparser.parse(response.content)
+        return [
+            {
+                "id": entry.get('id') or entry.get('link', ''),
+                "title": entry.get('title', ''),
+                "summary": entry.get('summary', entry.get('description', '')),
+                "link": entry.get('link', ''),
+                "published": entry.get('published', ''),
+                "source": "Yahoo Finance RSS"
+            }
+            for entry in feed.entries[:self.max_items]
+            if entry.get('title')
+        ]
+
+
+def article_key(article: Dict[str, Any]) -> str:
+    """Stable identity of an article: normalized URL, else id, else title"""
+    link = article.get('link') or ''
+    if link:
+        parts = urlsplit(link)
+        return f"{parts.netloc.lower().removeprefix('www.')}{parts.path.rstrip('/')}"
+    return str(article.get('id') or article.get('title', '')).strip().lower()
+
+
+def dedupe_articles(articles: List[Dict[str, Any]], seen: Optional[set] = None) -> List[Dict[str, Any]]:
+    """
+    Remove duplicate articles, keeping the first occurrence.
+
+    Articles are duplicates if they share a normalized URL, an id or a title.
+    """
+    seen = set() if seen is None else seen
+    unique = []
+    for article in articles:
+        keys = {article_key(article), str(article.get('title', '')).strip().lower()}
+        if article.get('id'):
+            keys.add(str(article['id']))
+        keys.discard('')
+        if keys & seen:
+            continue
+        seen |= keys
+        unique.append(article)
+    return unique
+
+
+# Global fetcher instance
+news_fetcher = NewsFetcher()
@@ -0,0 +1,138 @@
+"""
+News Store
+
+Persists news articles per symbol with their sentiment scores, and the
+sentiment snapshots computed from them, so articles are scored once and
+repeated sentiment requests are served from the database.
+"""
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models.investment_engine import NewsArticle, SentimentAnalysis
+from .news_fetcher import article_key
+
+logger = logging.getLogger(__name__)
+
+# Max bound parameters per IN (...) query
+QUERY_CHUNK_SIZE = 500
+
+
+class NewsStore:
+    """Database access for news articles and sentiment snapshots"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.logger = logger
+
+    def find(self, keys: Iterable[str], symbols: Optional[Iterable[str]] = None) -> List[NewsArticle]:
+        """Stored articles with the given article keys (for any symbol unless symbols is given)"""
+        keys = list(dict.fromkeys(keys))
+        symbols = list(symbols) if symbols is not None else None
+        rows = []
+        for i in range(0, len(keys), QUERY_CHUNK_SIZE):
+            query = self.db.query(NewsArticle).filter(NewsArticle.article_id.in_(keys[i:i + QUERY_CHUNK_SIZE]))
+            if symbols is not None:
+                query = query.filter(NewsArticle.symbol.in_(symbols))
+            rows.extend(query.all())
+        return rows
+
+    def add_articles(self, symbol: str, articles: List[Dict[str, Any]], seen_at: datetime) -> None:
+        """Add scored articles (sentiment_score/bullish_hits/bearish_hits set) for symbol"""
+        for article in articles:
+            self.db.add(NewsArticle(
+                article_id=article_key(article),
+                symbol=symbol,
+                title=str(article.get('title', ''))[:500],
+                summary=article.get('summary', ''),
+                link=article.get('link', ''),
+                source=article.get('source', ''),
+                published_at=parse_published(article.get('published')),
+                sentiment_score=article['sentiment_score'],
+                bullish_hits=article.get('bullish_hits', 0),
+                bearish_hits=article.get('bearish_hits', 0),
+                first_seen_at=seen_at,
+                last_seen_at=seen_at,
+            ))
+
+    def mark_seen(self, rows: Iterable[NewsArticle], seen_at: datetime) -> None:
+        """Update last_seen_at of stored articles returned by a new fetch"""
+        ids = [row.id for row in rows]
+        for i in range(0, len(ids), QUERY_CHUNK_SIZE):
+            self.db.query(NewsArticle).filter(
+                NewsArticle.id.in_(ids[i:i + QUERY_CHUNK_SIZE])
+            ).update({NewsArticle.last_seen_at: seen_at}, synchronize_session=False)
+
+    def recent_articles(self, symbol: str, limit: int = 20) -> List[NewsArticle]:
+        """Most recently seen articles for symbol"""
+        return self.db.query(NewsArticle).filter(
+            NewsArticle.symbol == symbol
+        ).order_by(
+            NewsArticle.last_seen_at.desc(),
+            NewsArticle.published_at.desc()
+        ).limit(limit).all()
+
+    def latest_snapshot(self, symbol: str, max_age: timedelta) -> Optional[SentimentAnalysis]:
+        """Latest sentiment snapshot for symbol if it is younger than max_age"""
+        cutoff = datetime.now(timezone.utc) - max_age
+        return self.db.query(SentimentAnalysis).filter(
+            SentimentAnalysis.symbol == symbol,
+            SentimentAnalysis.timestamp >= cutoff
+        ).order_by(SentimentAnalysis.timestamp.desc()).first()
+
+    def add_snapshot(self, symbol: str, response: Dict[str, Any]) -> SentimentAnalysis:
+        """Add a sentiment analysis response as a snapshot (committed by the caller)"""
+        news = response.get("breakdown", {}).get("news", {})
+        social = response.get("social_buzz", {})
+        snapshot = SentimentAnalysis(
+            symbol=symbol,
+            timestamp=datetime.now(timezone.utc),
+            sentiment_score=response["sentiment_score"],
+            sentiment_label=response["sentiment_label"],
+            confidence=response["confidence"],
+            news_sentiment=news.get("score"),
+            news_count=news.get("count"),
+            social_buzz_score=social.get("score"),
+            social_trend=social.get("trend"),
+            top_headlines=json.dumps(response.get("top_headlines", [])),
+            price_sentiment_correlation=response.get("price_correlation"),
+            data_sources=response.get("data_sources"),
+        )
+        self.db.add(snapshot)
+        return snapshot
+
+
+def article_to_dict(row: NewsArticle) -> Dict[str, Any]:
+    """Stored article in the fetcher's article format (plus its score)"""
+    return {
+        "id": row.article_id,
+        "title": row.title,
+        "summary": row.summary or "",
+        "link": row.link or "",
+        "published": row.published_at.isoformat() if row.published_at else "",
+        "source": row.source or "",
+        "sentiment_score": row.sentiment_score,
+        "bullish_hits": row.bullish_hits or 0,
+        "bearish_hits": row.bearish_hits or 0,
+    }
+
+
+def parse_published(value: Any) -> Optional[datetime]:
+    """Parse ISO 8601 (yfinance) or RFC 822 (RSS) publication dates"""
+    if isinstance(value, datetime):
+        return value
+    if not value:
+        return None
+    value = str(value).strip()
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
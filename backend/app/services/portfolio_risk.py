@@ -0,0 +1,180 @@
+"""
+Portfolio Risk Service
+
+Calculates portfolio-level risk metrics (covariance, volatility, VaR/CVaR,
+drawdown, beta) over aligned return matrices. Follows the conventions of
+risk_metrics.calculate_risk_metrics: percentages, plain floats and the same
+classification thresholds.
+"""
+import numpy as np
+import pandas as pd
+import logging
+from typing import Dict, List, Optional
+
+from .risk_metrics import calculate_composite_risk_score, get_risk_level
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS = 252
+MIN_OBSERVATIONS = 20
+
+
+def calculate_portfolio_risk(
+    closes: pd.DataFrame,
+    weights: Optional[Dict[str, float]] = None,
+    benchmark: Optional[pd.Series] = None,
+    confidence: float = 0.95,
+    periods_per_year: int = TRADING_DAYS,
+    include_covariance: bool = False,
+) -> Dict[str, any]:
+    """
+    Calculate portfolio risk metrics.
+
+    Args:
+        closes: Aligned closing prices, one column per holding
+        weights: Optional holding weights (defaults to equal weights); normalized to sum to 1
+        benchmark: Optional benchmark closing prices on the same index
+        confidence: Confidence level for VaR/CVaR
+        periods_per_year: Bars per year used for annualization
+        include_covariance: Include the annualized covariance matrix in the result
+
+    Returns:
+        Dictionary with portfolio risk metrics and per-holding contributions
+    """
+    if closes.empty:
+        return {}
+
+    # Align holdings: tolerate short gaps, drop holdings with too little history
+    prices = closes.ffill(limit=2)
+    returns = prices.pct_change().iloc[1:]
+    coverage = returns.notna().mean()
+    excluded = sorted(coverage[coverage < 0.9].index.tolist())
+    returns = returns.drop(columns=excluded).dropna()
+
+    if returns.shape[1] == 0 or len(returns) < MIN_OBSERVATIONS:
+        return {}
+
+    symbols = list(returns.columns)
+    matrix = returns.to_numpy(dtype=float)  # T x N
+
+    if weights:
+        w = np.array([float(weights.get(symbol, 0.0)) for symbol in symbols])
+    else:
+        w = np.ones(len(symbols))
+    w = w / w.sum() if w.sum() else np.full(len(symbols), 1.0 / len(symbols))
+
+    risk_metrics = {}
+
+    # === COVARIANCE & VOLATILITY ===
+
+    cov = np.atleast_2d(np.cov(matrix, rowvar=False))
+    portfolio_variance = float(w @ cov @ w)
+    portfolio_vol = np.sqrt(portfolio_variance)
+    asset_vol = np.sqrt(np.diag(cov))
+
+    risk_metrics['portfolio_volatility'] = float(portfolio_vol * np.sqrt(periods_per_year) * 100)
+
+    weighted_avg_vol = float(w @ asset_vol)
+    risk_metrics['diversification_ratio'] = float(weighted_avg_vol / portfolio_vol) if portfolio_vol > 0 else None
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / np.outer(asset_vol, asset_vol)
+    n = len(symbols)
+    if n > 1:
+        off_diagonal = corr[~np.eye(n, dtype=bool)]
+        risk_metrics['average_correlation'] = float(np.nanmean(off_diagonal))
+
+    # === VALUE AT RISK ===
+
+    portfolio_returns = matrix @ w
+    var_threshold = np.quantile(portfolio_returns, 1 - confidence)
+    tail = portfolio_returns[portfolio_returns <= var_threshold]
+    risk_metrics['confidence_level'] = confidence
+    risk_metrics['value_at_risk'] = float(-var_threshold * 100)
+    risk_metrics['conditional_value_at_risk'] = float(-tail.mean() * 100) if len(tail) else float(-var_threshold * 100)
+
+    # === DRAWDOWN ===
+
+    equity = np.cumprod(1 + portfolio_returns)
+    running_max = np.maximum.accumulate(np.concatenate(([1.0], equity)))[1:]
+    drawdown = (equity - running_max) / running_max
+    risk_metrics['max_drawdown'] = float(drawdown.min() * 100)
+    risk_metrics['current_drawdown'] = float(drawdown[-1] * 100)
+    risk_metrics['total_return'] = float((equity[-1] - 1) * 100)
+
+    # === BETA ===
+
+    asset_beta = np.full(n, np.nan)
+    if benchmark is not None:
+        bench_returns = benchmark.reindex(closes.index).ffill(limit=2).pct_change().reindex(returns.index)
+        valid = bench_returns.notna().to_numpy()
+        if valid.sum() >= MIN_OBSERVATIONS:
+            b = bench_returns.to_numpy(dtype=float)[valid]
+            x = matrix[valid]
+            b_centered = b - b.mean()
+            b_var = float(b_centered @ b_centered) / (len(b) - 1)
+            if b_var > 0:
+                asset_beta = ((x - x.mean(axis=0)).T @ b_centered) / (len(b) - 1) / b_var
+                p = x @ w
+                risk_metrics['beta'] = float(((p - p.mean()) @ b_centered) / (len(b) - 1) / b_var)
+                risk_metrics['benchmark_volatility'] = float(np.sqrt(b_var * periods_per_year) * 100)
+
+    # === RISK CONTRIBUTIONS ===
+
+    marginal = cov @ w
+    contribution = w * marginal / portfolio_variance * 100 if portfolio_variance > 0 else np.zeros(n)
+
+    holdings: List[Dict[str, any]] = [
+        {
+            'symbol': symbol,
+            'weight': float(w[i] * 100),
+            'volatility': float(asset_vol[i] * np.sqrt(periods_per_year) * 100),
+            'beta': float(asset_beta[i]) if np.isfinite(asset_beta[i]) else None,
+            'risk_contribution': float(contribution[i]),
+        }
+        for i, symbol in enumerate(symbols)
+    ]
+    holdings.sort(key=lambda h: h['risk_contribution'], reverse=True)
+
+    risk_metrics['holdings'] = holdings
+    risk_metrics['holdings_count'] = n
+    risk_metrics['excluded_symbols'] = excluded
+    risk_metrics['observations'] = int(len(returns))
+
+    if include_covariance:
+        risk_metrics['covariance_matrix'] = {
+            'symbols': symbols,
+            'values': (cov * periods_per_year).tolist(),
+        }
+
+    # === COMPOSITE RISK SCORE ===
+
+    composite_inputs = {
+        'historical_volatility_20d': risk_metrics['portfolio_volatility'],
+        'current_drawdown': risk_metrics['current_drawdown'],
+    }
+    risk_score = calculate_composite_risk_score(composite_inputs, {}, 0.0)
+    risk_metrics['overall_risk_score'] = risk_score
+    risk_metrics['risk_level'] = get_risk_level(risk_score)
+
+    hv = risk_metrics['portfolio_volatility']
+    if hv > 50:
+        risk_metrics['volatility_regime'] = "EXTREME"
+    elif hv > 35:
+        risk_metrics['volatility_regime'] = "HIGH"
+    elif hv > 20:
+        risk_metrics['volatility_regime'] = "MODERATE"
+    else:
+        risk_metrics['volatility_regime'] = "LOW"
+
+    dd = risk_metrics['current_drawdown']
+    if dd < -20:
+        risk_metrics['drawdown_status'] = "SEVERE"
+    elif dd < -10:
+        risk_metrics['drawdown_status'] = "HIGH"
+    elif dd < -5:
+        risk_metrics['drawdown_status'] = "MODERATE"
+    else:
+        risk_metrics['drawdown_status'] = "NORMAL"
+
+    return risk_metrics
@@ -0,0 +1,134 @@
+"""
+Watchlist Prefetcher
+
+Background task that keeps the bar store and the analysis cache warm for
+every symbol on an active watchlist, so opening a watched symbol's analysis
+is served from memory. Symbols are processed in order of subscriber count
+(most watched first), in bulk-download batches, for the configured default
+timeframes plus every timeframe requested recently.
+"""
+import asyncio
+import time
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+
+from ..models.database import session_scope
+from ..models.watchlist import Watchlist
+from .analysis_cache import analysis_cache
+from .bar_store import bar_store
+
+logger = logging.getLogger(__name__)
+
+# Requested timeframes stay in the prefetch set for this many seconds
+USED_TIMEFRAME_WINDOW = 24 * 60 * 60
+
+
+class WatchlistPrefetcher:
+    """
+    Periodic warm-up of histories and analyses for watched symbols.
+
+    The interval should be shorter than the bar store TTL, so refreshed
+    entries are replaced before they expire.
+    """
+
+    def __init__(
+        self,
+        interval: int = 240,
+        timeframes: Iterable[str] = ("1D", "1M"),
+        max_symbols: int = 200,
+        batch_size: int = 50
+    ):
+        self.interval = interval
+        self.timeframes = list(timeframes)
+        self.max_symbols = max_symbols
+        self.batch_size = batch_size
+        self._used_timeframes: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.logger = logger
+
+    def start(self) -> None:
+        """Start the background prefetch loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            self.logger.info(f"Watchlist prefetcher started (every {self.interval}s)")
+
+    async def stop(self) -> None:
+        """Cancel the background prefetch loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def note_request(self, timeframe: str) -> None:
+        """Record that a timeframe was requested (it is prefetched from the next cycle on)"""
+        self._used_timeframes[timeframe] = time.time()
+
+    def active_timeframes(self) -> List[str]:
+        """Default timeframes plus the ones requested within USED_TIMEFRAME_WINDOW"""
+        cutoff = time.time() - USED_TIMEFRAME_WINDOW
+        used = [tf for tf, requested_at in self._used_timeframes.items() if requested_at >= cutoff]
+        return list(dict.fromkeys(self.timeframes + used))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.prefetch_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Watchlist prefetch failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def prefetch_once(self) -> Dict[str, Any]:
+        """
+        Run one prefetch cycle.
+
+        Returns:
+            Dict with the number of symbols, the timeframes and the number
+            of warmed symbol/timeframe pairs
+        """
+        with session_scope() as db:
+            symbols = self.watched_symbols(db)
+        timeframes = self.active_timeframes()
+
+        warmed = 0
+        started = time.perf_counter()
+        for start in range(0, len(symbols), self.batch_size):
+            batch = symbols[start:start + self.batch_size]
+            for timeframe in timeframes:
+                histories = await asyncio.to_thread(bar_store.refresh, batch, timeframe)
+                warmed += await asyncio.to_thread(self._analyze, histories, timeframe)
+
+        if symbols:
+            self.logger.info(
+                f"Prefetched {warmed} symbol/timeframe pairs for {len(symbols)} watched symbols "
+                f"({', '.join(timeframes)}) in {time.perf_counter() - started:.1f}s"
+            )
+        return {"symbols": len(symbols), "timeframes": timeframes, "warmed": warmed}
+
+    def watched_symbols(self, db) -> List[str]:
+        """Active watchlist symbols ordered by number of subscribers"""
+        subscribers = func.count(func.distinct(Watchlist.user_id))
+        rows = db.query(func.upper(Watchlist.symbol), subscribers).filter(
+            Watchlist.is_active == True
+        ).group_by(func.upper(Watchlist.symbol)).order_by(subscribers.desc()).limit(self.max_symbols)
+        return [symbol for symbol, _ in rows]
+
+    def _analyze(self, histories: Dict[str, Any], timeframe: str) -> int:
+        warmed = 0
+        for symbol, hist in histories.items():
+            try:
+                analysis_cache.analyze(symbol, timeframe, hist)
+                warmed += 1
+            except Exception as e:
+                self.logger.warning(f"Could not prefetch analysis for {symbol} ({timeframe}): {e}")
+        return warmed
+
+
+# Global prefetcher instance
+watchlist_prefetcher = WatchlistPrefetcher()
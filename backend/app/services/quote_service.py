@@ -0,0 +1,150 @@
+"""
+Quote Service
+
+Current price, change, change % and volume for many symbols. Quotes are
+derived from the last daily bars (the last bar is the running session), so
+a whole watchlist is refreshed with one bulk download through the bar store.
+Quotes are cached for QUOTE_CACHE_DURATION seconds; if a refresh fails or
+returns nothing for a symbol, its last known quote is served and marked
+stale for up to QUOTE_MAX_STALE seconds.
+"""
+import time
+import logging
+import threading
+import pandas as pd
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ..config import get_settings
+from .market_data import QUOTE_TIMEFRAME
+from .bar_store import bar_store
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class QuoteService:
+    """
+    Bulk quote lookups with a TTL cache and stale-value fallback.
+
+    Entries are bounded to max_entries with least-recently-used eviction.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        max_stale_seconds: Optional[int] = None,
+        max_entries: int = 5000
+    ):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.QUOTE_CACHE_DURATION
+        self.max_stale_seconds = max_stale_seconds if max_stale_seconds is not None else settings.QUOTE_MAX_STALE
+        self.max_entries = max_entries
+        self._quotes: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.logger = logger
+
+    def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Quote for one symbol, or None if unavailable"""
+        return self.get_quotes([symbol]).get(symbol.upper())
+
+    def get_quotes(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get quotes for many symbols with a single upstream call for all misses.
+
+        Args:
+            symbols: Stock symbols
+
+        Returns:
+            Dict of symbol -> quote (symbol, price, previous_close, change,
+            change_percent, volume, timestamp, stale). Symbols without a
+            fresh or stale quote are omitted.
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols if s))
+        now = time.time()
+        result: Dict[str, Dict[str, Any]] = {}
+        expired: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        missing = []
+
+        with self._lock:
+            for symbol in symbols:
+                entry = self._quotes.get(symbol)
+                if entry is not None and now - entry[0] <= self.ttl_seconds:
+                    self._quotes.move_to_end(symbol)
+                    result[symbol] = entry[1]
+                else:
+                    if entry is not None:
+                        expired[symbol] = entry
+                    missing.append(symbol)
+
+        if missing:
+            fetched = self._fetch(missing)
+            with self._lock:
+                for symbol, quote in fetched.items():
+                    self._store(symbol, quote)
+            result.update(fetched)
+
+            for symbol in missing:
+                if symbol in fetched or symbol not in expired:
+                    continue
+                fetched_at, quote = expired[symbol]
+                if now - fetched_at <= self.max_stale_seconds:
+                    result[symbol] = {**quote, "stale": True}
+
+            stale = len(missing) - len(fetched)
+            if stale:
+                self.logger.warning(f"No fresh quote for {stale} of {len(missing)} symbols")
+
+        return result
+
+    def clear(self) -> None:
+        """Clear all cached quotes"""
+        with self._lock:
+            self._quotes.clear()
+
+    def _fetch(self, symbols: list) -> Dict[str, Dict[str, Any]]:
+        try:
+            histories = bar_store.refresh(symbols, QUOTE_TIMEFRAME)
+        except Exception as e:
+            self.logger.error(f"Quote refresh failed for {len(symbols)} symbols: {e}")
+            return {}
+
+        quotes = {}
+        for symbol, hist in histories.items():
+            quote = quote_from_history(symbol, hist)
+            if quote is not None:
+                quotes[symbol] = quote
+        return quotes
+
+    def _store(self, symbol: str, quote: Dict[str, Any]) -> None:
+        self._quotes[symbol] = (time.time(), quote)
+        self._quotes.move_to_end(symbol)
+        while len(self._quotes) > self.max_entries:
+            self._quotes.popitem(last=False)
+
+
+def quote_from_history(symbol: str, hist: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """Quote from daily bars: last close against the previous close"""
+    closes = hist['Close'].dropna()
+    if closes.empty:
+        return None
+
+    price = float(closes.iloc[-1])
+    previous_close = float(closes.iloc[-2]) if len(closes) > 1 else None
+    change = price - previous_close if previous_close is not None else None
+    change_percent = change / previous_close * 100 if previous_close else None
+    volume = hist['Volume'].iloc[-1] if 'Volume' in hist.columns else None
+
+    return {
+        "symbol": symbol,
+        "price": round(price, 4),
+        "previous_close": previous_close,
+        "change": round(change, 4) if change is not None else None,
+        "change_percent": round(change_percent, 4) if change_percent is not None else None,
+        "volume": int(volume) if volume is not None and pd.notna(volume) else None,
+        "timestamp": closes.index[-1].isoformat(),
+        "stale": False,
+    }
+
+
+# Global quote service instance
+quote_service = QuoteService()
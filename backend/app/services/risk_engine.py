@@ -0,0 +1,278 @@
+"""
+Rolling Risk Engine
+
+Keeps per-symbol streaming state (running max, Welford variance over returns,
+sliding-window extrema) so risk metrics update in O(1) per new bar instead of
+re-scanning the whole history on every refresh. Drawdowns cover the bars of
+the requested history only: when its first bar moves forward, the drawdown
+part of the state is recomputed from the remaining closes.
+"""
+import math
+import numpy as np
+import pandas as pd
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .streaming_stats import RollingStats, RollingExtrema
+from .risk_metrics import complete_risk_metrics, calculate_risk_score_series
+
+logger = logging.getLogger(__name__)
+
+
+class SymbolRiskState:
+    """
+    Incremental risk state for one symbol/timeframe.
+
+    Bars are committed with update(). The newest bar of a history is usually
+    still forming, so RiskEngine keeps it out of the committed state and only
+    applies it on a copy when metrics are read.
+    """
+
+    def __init__(self, window: int = 20):
+        self.window = window
+        self.bar_count = 0
+        self.first_timestamp: Optional[pd.Timestamp] = None
+        self.last_timestamp: Optional[pd.Timestamp] = None
+
+        # Drawdown (since first_timestamp)
+        self.running_max = float('-inf')
+        self.max_drawdown = 0.0
+        self.current_drawdown = 0.0
+
+        # Volatility and liquidity (rolling window)
+        self.returns = RollingStats(window)
+        self.volume_returns = RollingStats(window)
+        self.volumes = RollingStats(window)
+        self.highs = RollingExtrema(window)
+        self.lows = RollingExtrema(window)
+
+        self.last_open: Optional[float] = None
+        self.last_close: Optional[float] = None
+        self.prev_close: Optional[float] = None
+        self.last_volume: Optional[float] = None
+
+    def update(self, timestamp, open_price: float, high: float, low: float, close: float,
+               volume: Optional[float] = None) -> None:
+        """Commit one bar (O(1))"""
+        if self.last_close:
+            self.returns.push(close / self.last_close - 1)
+
+        if volume is not None and not math.isnan(volume):
+            if self.last_volume:
+                volume_return = volume / self.last_volume - 1
+                if math.isfinite(volume_return):
+                    self.volume_returns.push(volume_return)
+            self.volumes.push(volume)
+            self.last_volume = volume
+
+        self.running_max = max(self.running_max, close)
+        self.current_drawdown = (close - self.running_max) / self.running_max if self.running_max else 0.0
+        self.max_drawdown = min(self.max_drawdown, self.current_drawdown)
+
+        self.highs.push(high)
+        self.lows.push(low)
+
+        self.prev_close, self.last_close = self.last_close, close
+        self.last_open = open_price
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+        self.bar_count += 1
+
+    def rebase_drawdown(self, first_timestamp, closes: np.ndarray) -> None:
+        """Recompute the drawdown state from the committed closes since first_timestamp (O(len(closes)))"""
+        self.first_timestamp = first_timestamp
+        if len(closes) == 0:
+            self.running_max, self.max_drawdown, self.current_drawdown = float('-inf'), 0.0, 0.0
+            return
+        running_max = np.maximum.accumulate(closes)
+        drawdown = np.where(running_max != 0, (closes - running_max) / running_max, 0.0)
+        self.running_max = float(running_max[-1])
+        self.max_drawdown = min(0.0, float(drawdown.min()))
+        self.current_drawdown = float(drawdown[-1])
+
+    def metrics(self) -> Dict[str, float]:
+        """Price-derived risk metrics in calculate_risk_metrics format"""
+        if self.bar_count < self.window:
+            return {}
+
+        risk_metrics = {}
+
+        if self.returns.count > 0:
+            hv_20 = self.returns.std() * np.sqrt(252)
+            risk_metrics['historical_volatility_20d'] = float(hv_20 * 100)
+
+        risk_metrics['max_drawdown'] = float(self.max_drawdown * 100)
+        risk_metrics['current_drawdown'] = float(self.current_drawdown * 100)
+
+        if self.volumes.count > 0:
+            risk_metrics['average_volume_20d'] = int(self.volumes.mean)
+            if self.volume_returns.count > 0:
+                risk_metrics['volume_volatility'] = float(self.volume_returns.std() * 100)
+
+        risk_metrics['price_range_20d'] = float((self.highs.max - self.lows.min) / self.last_close * 100)
+
+        if self.prev_close and self.last_open is not None:
+            risk_metrics['gap_percentage'] = float(abs(self.last_open - self.prev_close) / self.prev_close * 100)
+
+        return risk_metrics
+
+    def copy(self) -> "SymbolRiskState":
+        """Independent copy (bounded by the window size)"""
+        clone = SymbolRiskState.__new__(SymbolRiskState)
+        clone.__dict__.update(self.__dict__)
+        clone.returns = self.returns.copy()
+        clone.volume_returns = self.volume_returns.copy()
+        clone.volumes = self.volumes.copy()
+        clone.highs = self.highs.copy()
+        clone.lows = self.lows.copy()
+        return clone
+
+
+class RiskEngine:
+    """
+    Per-symbol registry of SymbolRiskState objects.
+
+    sync() only feeds bars newer than the last committed one, so repeated
+    refreshes of the same symbol cost O(new bars) instead of O(history).
+    """
+
+    def __init__(self, window: int = 20, max_symbols: int = 2000):
+        self.window = window
+        self.max_symbols = max_symbols
+        self._states: "OrderedDict[str, SymbolRiskState]" = OrderedDict()
+        self.logger = logger
+
+    def sync(self, key: str, hist: pd.DataFrame) -> SymbolRiskState:
+        """
+        Bring the state for key up to date with hist and return a view that
+        includes the latest (possibly still forming) bar.
+
+        Args:
+            key: State key, e.g. "AAPL:1Y"
+            hist: Historical OHLCV data
+
+        Returns:
+            SymbolRiskState including the last bar of hist
+        """
+        state = self._states.get(key)
+        index = hist.index
+
+        if state is not None and state.last_timestamp is not None:
+            position = index.searchsorted(state.last_timestamp, side='right')
+            # History was restated or does not overlap the committed bars: rebuild
+            if position == 0 or index[position - 1] != state.last_timestamp:
+                state = None
+            elif index[0] != state.first_timestamp:
+                # The history's window moved on: drop the bars before its first bar
+                state.rebase_drawdown(index[0], hist['Close'].iloc[:position].to_numpy(dtype=float))
+        if state is None:
+            state = SymbolRiskState(self.window)
+            position = 0
+
+        self._commit(state, hist, position, len(hist) - 1)
+        self._states[key] = state
+        self._states.move_to_end(key)
+        while len(self._states) > self.max_symbols:
+            self._states.popitem(last=False)
+
+        view = state.copy()
+        self._commit(view, hist, len(hist) - 1, len(hist))
+        return view
+
+    def get_risk_metrics(self, key: str, hist: pd.DataFrame, technical_indicators: Dict) -> Dict[str, any]:
+        """
+        Incremental equivalent of risk_metrics.calculate_risk_metrics.
+
+        Args:
+            key: State key, e.g. "AAPL:1Y"
+            hist: Historical OHLCV data
+            technical_indicators: Dictionary of calculated technical indicators
+
+        Returns:
+            Dictionary with all calculated risk metrics
+        """
+        if len(hist) < self.window:
+            return {}
+
+        view = self.sync(key, hist)
+        current = technical_indicators.get('current', {}) if isinstance(technical_indicators, dict) else {}
+        return complete_risk_metrics(view.metrics(), current, view.last_close)
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """Drop the state for key, or all states"""
+        if key:
+            self._states.pop(key, None)
+        else:
+            self._states.clear()
+
+    @staticmethod
+    def _commit(state: SymbolRiskState, hist: pd.DataFrame, start: int, stop: int) -> None:
+        if start >= stop:
+            return
+        frame = hist.iloc[start:stop]
+        has_volume = 'Volume' in frame.columns
+        has_open = 'Open' in frame.columns
+        closes = frame['Close'].to_numpy(dtype=float)
+        rows = zip(
+            frame.index,
+            frame['Open'].to_numpy(dtype=float) if has_open else closes,
+            frame['High'].to_numpy(dtype=float),
+            frame['Low'].to_numpy(dtype=float),
+            closes,
+            frame['Volume'].to_numpy(dtype=float) if has_volume else [None] * len(frame),
+        )
+        for timestamp, open_price, high, low, close, volume in rows:
+            state.update(timestamp, open_price, high, low, close, volume)
+
+
+def calculate_rolling_risk_series(
+    hist: pd.DataFrame,
+    window: int = 20,
+    indicator_series: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Calculate the price-derived risk metrics for every bar at once.
+
+    Args:
+        hist: Historical OHLCV data
+        window: Rolling window in bars
+        indicator_series: Optional calculate_indicator_series output; adds the
+            composite overall_risk_score column when given
+
+    Returns:
+        DataFrame indexed like hist with one column per metric (percentages)
+    """
+    close = hist['Close']
+    returns = close.pct_change()
+    running_max = close.cummax()
+    drawdown = (close - running_max) / running_max * 100
+
+    series = pd.DataFrame(index=hist.index)
+    series['historical_volatility_20d'] = returns.rolling(window=window).std() * np.sqrt(252) * 100
+    series['current_drawdown'] = drawdown
+    series['max_drawdown'] = drawdown.cummin()
+    series['price_range_20d'] = (
+        (hist['High'].rolling(window=window).max() - hist['Low'].rolling(window=window).min()) / close * 100
+    )
+
+    if 'Volume' in hist.columns:
+        volume = hist['Volume']
+        volume_returns = volume.pct_change().replace([np.inf, -np.inf], np.nan)
+        series['average_volume_20d'] = volume.rolling(window=window, min_periods=1).mean()
+        series['volume_volatility'] = volume_returns.rolling(window=window, min_periods=2).std() * 100
+
+    if 'Open' in hist.columns:
+        prev_close = close.shift()
+        series['gap_percentage'] = (hist['Open'] - prev_close).abs() / prev_close * 100
+
+    if indicator_series is not None:
+        series['overall_risk_score'] = calculate_risk_score_series(hist, indicator_series)
+
+    series.iloc[:window - 1] = np.nan
+    return series
+
+
+# Global engine instance
+risk_engine = RiskEngine()
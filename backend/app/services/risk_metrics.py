@@ -41,18 +41,6 @@ def calculate_risk_metrics(hist: pd.DataFrame, technical_indicators: Dict) -> Di
         hv_20 = returns.tail(20).std() * np.sqrt(252)  # Annualized
         risk_metrics['historical_volatility_20d'] = float(hv_20 * 100)  # As percentage
 
-    # ATR-based Volatility
-    atr = current.get('atr')
-    current_price = close.iloc[-1]
-    if atr is not None:
-        atr_percent = (atr / current_price) * 100
-        risk_metrics['atr_percentage'] = float(atr_percent)
-
-    # Bollinger Band Width
-    bb_width = current.get('bb_width')
-    if bb_width is not None:
-        risk_metrics['bb_width_percentage'] = float(bb_width * 100)
-
     # === DRAWDOWN METRICS ===
 
     # Maximum Drawdown
@@ -66,6 +54,62 @@ def calculate_risk_metrics(hist: pd.DataFrame, technical_indicators: Dict) -> Di
         current_drawdown = drawdown.iloc[-1]
         risk_metrics['current_drawdown'] = float(current_drawdown * 100)
 
+    # === LIQUIDITY METRICS ===
+
+    if volume is not None:
+        # Average Volume
+        avg_volume = volume.tail(20).mean()
+        risk_metrics['average_volume_20d'] = int(avg_volume)
+
+        # Volume Volatility
+        volume_returns = volume.pct_change().dropna()
+        if len(volume_returns) > 0:
+            volume_volatility = volume_returns.tail(20).std() * 100
+            risk_metrics['volume_volatility'] = float(volume_volatility)
+
+    # === PRICE ACTION RISK ===
+
+    # Price Range Analysis
+    if len(close) >= 20:
+        recent_range = (high.tail(20).max() - low.tail(20).min()) / close.iloc[-1] * 100
+        risk_metrics['price_range_20d'] = float(recent_range)
+
+    # Gap Risk (difference between open and previous close)
+    if 'Open' in hist.columns and len(hist) >= 2:
+        open_price = hist['Open'].iloc[-1]
+        prev_close = close.iloc[-2]
+        gap = abs(open_price - prev_close) / prev_close * 100
+        risk_metrics['gap_percentage'] = float(gap)
+
+    return complete_risk_metrics(risk_metrics, current, float(close.iloc[-1]))
+
+
+def complete_risk_metrics(risk_metrics: Dict, current: Dict, current_price: float) -> Dict[str, any]:
+    """
+    Add indicator-based risk metrics, the composite score and classifications.
+
+    Shared by calculate_risk_metrics and the incremental risk engine, which
+    only differ in how the price-derived metrics are computed.
+
+    Args:
+        risk_metrics: Price-derived metrics (volatility, drawdown, liquidity, range, gap)
+        current: Current technical indicators
+        current_price: Latest close
+
+    Returns:
+        The same dict, completed in place
+    """
+    # ATR-based Volatility
+    atr = current.get('atr')
+    if atr is not None:
+        atr_percent = (atr / current_price) * 100
+        risk_metrics['atr_percentage'] = float(atr_percent)
+
+    # Bollinger Band Width
+    bb_width = current.get('bb_width')
+    if bb_width is not None:
+        risk_metrics['bb_width_percentage'] = float(bb_width * 100)
+
     # === MOMENTUM RISK METRICS ===
 
     # RSI Risk Assessment
@@ -94,33 +138,6 @@ def calculate_risk_metrics(hist: pd.DataFrame, technical_indicators: Dict) -> Di
         else:
             risk_metrics['trend_strength'] = "WEAK"
 
-    # === LIQUIDITY METRICS ===
-
-    if volume is not None:
-        # Average Volume
-        avg_volume = volume.tail(20).mean()
-        risk_metrics['average_volume_20d'] = int(avg_volume)
-
-        # Volume Volatility
-        volume_returns = volume.pct_change().dropna()
-        if len(volume_returns) > 0:
-            volume_volatility = volume_returns.tail(20).std() * 100
-            risk_metrics['volume_volatility'] = float(volume_volatility)
-
-    # === PRICE ACTION RISK ===
-
-    # Price Range Analysis
-    if len(close) >= 20:
-        recent_range = (high.tail(20).max() - low.tail(20).min()) / close.iloc[-1] * 100
-        risk_metrics['price_range_20d'] = float(recent_range)
-
-    # Gap Risk (difference between open and previous close)
-    if 'Open' in hist.columns and len(hist) >= 2:
-        open_price = hist['Open'].iloc[-1]
-        prev_close = close.iloc[-2]
-        gap = abs(open_price - prev_close) / prev_close * 100
-        risk_metrics['gap_percentage'] = float(gap)
-
     # === COMPOSITE RISK SCORE ===
 
     risk_score = calculate_composite_risk_score(risk_metrics, current, current_price)
@@ -225,3 +242,40 @@ def get_risk_level(risk_score: int) -> str:
         return "LOW"
     else:
         return "VERY_LOW"
+
+
+def calculate_risk_score_series(hist: pd.DataFrame, indicator_series: pd.DataFrame) -> pd.Series:
+    """
+    Calculate the composite risk score (0-100) for every bar of the history.
+
+    Vectorized counterpart of calculate_composite_risk_score: uses the same
+    contributions and caps, evaluated on rolling 20-bar volatility and the
+    running drawdown instead of only the latest values.
+
+    Args:
+        hist: Historical OHLCV data
+        indicator_series: Output of technical_indicators.calculate_indicator_series
+
+    Returns:
+        Series of integer risk scores (NaN for bars with less than 20 bars of history)
+    """
+    close = hist['Close']
+
+    returns = close.pct_change()
+    hv = (returns.rolling(window=20).std() * np.sqrt(252) * 100).fillna(0).to_numpy()
+    running_max = close.cummax()
+    drawdown = ((close - running_max) / running_max * 100).to_numpy()
+
+    rsi = indicator_series['rsi'].fillna(50).to_numpy()
+    adx = indicator_series['adx'].fillna(20).to_numpy()
+    atr_pct = (indicator_series['atr'] / close * 100).fillna(0).to_numpy()
+
+    score = np.minimum(hv / 2, 30)
+    score += np.minimum(np.abs(drawdown) * 2, 25)
+    score += np.select([rsi > 80, rsi > 70, rsi < 20, rsi < 30], [15, 10, 15, 10], default=0)
+    score += np.minimum(atr_pct * 2, 15)
+    score += np.select([adx > 50, adx < 20], [5, 15], default=0)
+
+    score = np.minimum(np.floor(score), 100)
+    score[:19] = np.nan  # calculate_risk_metrics needs at least 20 bars
+    return pd.Series(score, index=hist.index, name='overall_risk_score')
@@ -0,0 +1,201 @@
+"""
+Scoring Profiles
+
+Named weightings of the master score components. Profiles are compiled once
+into a weight vector and threshold array, so scoring many symbols (or one
+symbol under many profiles) is a matrix product plus np.digitize over
+components that were computed only once.
+"""
+import json
+import logging
+import numpy as np
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models.investment_engine import ScoringProfile
+
+logger = logging.getLogger(__name__)
+
+# Component order of weight vectors and component matrices
+COMPONENTS = ("short_term", "medium_term", "long_term", "risk")
+
+# Recommendations from lowest to highest score
+RECOMMENDATIONS = ("STRONG_SELL", "SELL", "HOLD", "BUY", "STRONG_BUY")
+
+DEFAULT_THRESHOLDS = {"SELL": 20, "HOLD": 40, "BUY": 60, "STRONG_BUY": 80}
+
+DEFAULT_PROFILE_NAME = "balanced"
+
+BUILTIN_PROFILES = {
+    "balanced": {
+        "description": "Default weighting of signals and risk",
+        "weights": {"short_term": 0.30, "medium_term": 0.30, "long_term": 0.20, "risk": 0.20},
+        "thresholds": DEFAULT_THRESHOLDS,
+    },
+    "momentum": {
+        "description": "Favors short- and medium-term momentum",
+        "weights": {"short_term": 0.40, "medium_term": 0.35, "long_term": 0.15, "risk": 0.10},
+        "thresholds": DEFAULT_THRESHOLDS,
+    },
+    "risk_averse": {
+        "description": "Favors low risk and long-term trend; stricter buy thresholds",
+        "weights": {"short_term": 0.15, "medium_term": 0.20, "long_term": 0.25, "risk": 0.40},
+        "thresholds": {"SELL": 25, "HOLD": 45, "BUY": 65, "STRONG_BUY": 85},
+    },
+}
+
+
+class CompiledScoringProfile:
+    """
+    Scoring profile in vectorized form.
+
+    weight_vector follows COMPONENTS; bounds holds the lower score bound of
+    SELL, HOLD, BUY and STRONG_BUY.
+    """
+
+    def __init__(self, name: str, weights: Dict[str, float], thresholds: Optional[Dict[str, float]] = None,
+                 description: Optional[str] = None, builtin: bool = False):
+        weights, thresholds = validate_profile(weights, thresholds)
+        self.name = name
+        self.description = description
+        self.builtin = builtin
+        self.weights = weights
+        self.thresholds = thresholds
+        self.weight_vector = np.array([weights[c] for c in COMPONENTS], dtype=float)
+        self.bounds = np.array([thresholds[label] for label in RECOMMENDATIONS[1:]], dtype=float)
+
+    def score(self, components: np.ndarray) -> np.ndarray:
+        """Master scores for a (N x 4) component matrix, clipped to 0-100"""
+        return np.clip(np.asarray(components, dtype=float) @ self.weight_vector, 0, 100)
+
+    def classify(self, scores: np.ndarray) -> np.ndarray:
+        """Recommendation labels for an array of scores"""
+        return np.asarray(RECOMMENDATIONS)[np.digitize(scores, self.bounds)]
+
+    def recommendation(self, score: float) -> str:
+        """Recommendation label for a single score"""
+        return RECOMMENDATIONS[int(np.digitize(score, self.bounds))]
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "weights": self.weights,
+            "thresholds": self.thresholds,
+            "builtin": self.builtin,
+        }
+
+
+def validate_profile(weights: Dict[str, float], thresholds: Optional[Dict[str, float]] = None):
+    """
+    Validate and normalize profile weights and thresholds.
+
+    Weights must cover all components, be non-negative and are normalized to
+    sum to 1. Thresholds must be strictly increasing within 0-100.
+
+    Raises:
+        ValueError: If the profile is invalid
+    """
+    unknown = set(weights) - set(COMPONENTS)
+    missing = set(COMPONENTS) - set(weights)
+    if unknown or missing:
+        raise ValueError(f"Weights must define exactly {', '.join(COMPONENTS)}")
+    if any(float(w) < 0 for w in weights.values()):
+        raise ValueError("Weights must be non-negative")
+    total = sum(float(w) for w in weights.values())
+    if total <= 0:
+        raise ValueError("Weights must not all be zero")
+    weights = {c: float(weights[c]) / total for c in COMPONENTS}
+
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    if set(thresholds) != set(RECOMMENDATIONS[1:]):
+        raise ValueError(f"Thresholds must define {', '.join(RECOMMENDATIONS[1:])}")
+    bounds = [float(thresholds[label]) for label in RECOMMENDATIONS[1:]]
+    if not all(0 < b < 100 for b in bounds) or any(a >= b for a, b in zip(bounds, bounds[1:])):
+        raise ValueError("Thresholds must be strictly increasing between 0 and 100")
+
+    return weights, {label: float(thresholds[label]) for label in RECOMMENDATIONS[1:]}
+
+
+class ScoringProfileRegistry:
+    """
+    Cache of compiled scoring profiles.
+
+    Built-in profiles are compiled at import; custom profiles are loaded from
+    the scoring_profiles table on first use and recompiled only after they
+    are changed through this registry.
+    """
+
+    def __init__(self):
+        self._builtin = {
+            name: CompiledScoringProfile(name, p["weights"], p["thresholds"], p["description"], builtin=True)
+            for name, p in BUILTIN_PROFILES.items()
+        }
+        self._custom: Dict[str, CompiledScoringProfile] = {}
+        self.logger = logger
+
+    @property
+    def default(self) -> CompiledScoringProfile:
+        return self._builtin[DEFAULT_PROFILE_NAME]
+
+    def get(self, db: Session, name: str) -> Optional[CompiledScoringProfile]:
+        """Get a compiled profile by name (None if it does not exist)"""
+        if name in self._builtin:
+            return self._builtin[name]
+        if name in self._custom:
+            return self._custom[name]
+
+        row = db.query(ScoringProfile).filter(ScoringProfile.name == name).first()
+        if row is None:
+            return None
+        compiled = self._compile(row)
+        self._custom[name] = compiled
+        return compiled
+
+    def resolve(self, db: Session, name: Optional[str] = None, user=None) -> Optional[CompiledScoringProfile]:
+        """
+        Resolve the profile for a request.
+
+        An explicit name wins, then the user's saved profile, then the default.
+        Returns None only if an explicitly requested profile does not exist.
+        """
+        if name:
+            return self.get(db, name)
+        saved = getattr(user, "scoring_profile", None)
+        if saved:
+            profile = self.get(db, saved)
+            if profile is not None:
+                return profile
+            self.logger.warning(f"Saved scoring profile '{saved}' not found, using default")
+        return self.default
+
+    def list(self, db: Session) -> List[CompiledScoringProfile]:
+        """All built-in and custom profiles"""
+        profiles = list(self._builtin.values())
+        for row in db.query(ScoringProfile).order_by(ScoringProfile.name).all():
+            compiled = self._custom.get(row.name)
+            if compiled is None:
+                compiled = self._compile(row)
+                self._custom[row.name] = compiled
+            profiles.append(compiled)
+        return profiles
+
+    def is_builtin(self, name: str) -> bool:
+        return name in self._builtin
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop compiled custom profiles so they are reloaded on next use"""
+        if name:
+            self._custom.pop(name, None)
+        else:
+            self._custom.clear()
+
+    @staticmethod
+    def _compile(row: ScoringProfile) -> CompiledScoringProfile:
+        thresholds = json.loads(row.thresholds) if row.thresholds else None
+        return CompiledScoringProfile(row.name, json.loads(row.weights), thresholds, row.description)
+
+
+# Global registry instance
+scoring_profiles = ScoringProfileRegistry()
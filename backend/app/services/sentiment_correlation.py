@@ -0,0 +1,236 @@
+"""
+Sentiment / Price Correlation
+
+Relates the stored sentiment snapshots of a symbol to its forward returns.
+Daily sentiment (mean of the day's snapshots) is paired with the return from
+that day's close to the next close. A per-symbol RollingCorrelation is fed
+only the pairs that became complete since the last update, so repeated
+requests do not recompute the series. The newest daily bar is usually still
+forming, so a day is only paired once its next close is final.
+"""
+import logging
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models.investment_engine import NewsArticle, SentimentAnalysis
+from .bar_store import bar_store
+from .streaming_stats import RollingCorrelation
+
+logger = logging.getLogger(__name__)
+
+# Pairs required before a correlation is reported
+MIN_PAIRS = 5
+
+
+class SymbolCorrelationState:
+    """Rolling sentiment/forward-return correlation for one symbol"""
+
+    def __init__(self, window: int):
+        self.correlation = RollingCorrelation(window)
+        self.last_paired_date: Optional[date] = None
+
+
+class SentimentCorrelationTracker:
+    """Per-symbol registry of sentiment/forward-return correlation states"""
+
+    def __init__(self, window: int = 30, timeframe: str = "1Y", max_symbols: int = 2000):
+        self.window = window
+        self.timeframe = timeframe
+        self.max_symbols = max_symbols
+        self._states: "OrderedDict[str, SymbolCorrelationState]" = OrderedDict()
+        self.logger = logger
+
+    def get_correlation(self, db: Session, symbol: str) -> Optional[float]:
+        """
+        Current rolling correlation between daily sentiment and next-day returns.
+
+        Bars are read from the bar store cache only (see load_bars), so this
+        never downloads; without cached bars the last known value is returned.
+
+        Args:
+            db: Database session
+            symbol: Stock symbol
+
+        Returns:
+            Correlation coefficient or None if there are not enough pairs
+        """
+        state = self._states.get(symbol)
+        if state is None:
+            state = SymbolCorrelationState(self.window)
+
+        since = state.last_paired_date
+        # Only the window matters for a cold state
+        since_dt = (
+            datetime.combine(since + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+            if since else datetime.now(timezone.utc) - timedelta(days=self.window * 3)
+        )
+        sentiment = daily_sentiment(db, symbol, since_dt)
+        if not sentiment.empty:
+            hist = bar_store.get_cached(symbol, self.timeframe)
+            if hist is not None and len(hist) > 1:
+                # The last close may still change: leave its day unpaired
+                pairs = pair_forward_returns(sentiment, hist['Close'].iloc[:-1])
+                for day, (score, forward_return) in zip(pairs.index, pairs.to_numpy()):
+                    state.correlation.push(float(score), float(forward_return))
+                    state.last_paired_date = day
+
+        self._states[symbol] = state
+        self._states.move_to_end(symbol)
+        while len(self._states) > self.max_symbols:
+            self._states.popitem(last=False)
+
+        value = state.correlation.correlation(MIN_PAIRS)
+        return None if np.isnan(value) else round(value, 4)
+
+    def load_bars(self, symbols: Iterable[str]) -> None:
+        """Load the daily bars of symbols into the bar store (blocking, one bulk download)"""
+        try:
+            bar_store.get_histories(symbols, self.timeframe)
+        except Exception as e:
+            self.logger.warning(f"Could not load bars for sentiment correlation: {e}")
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        """Drop the state for symbol, or all states"""
+        if symbol:
+            self._states.pop(symbol, None)
+        else:
+            self._states.clear()
+
+
+def daily_sentiment(db: Session, symbol: str, since: datetime) -> pd.Series:
+    """Mean snapshot sentiment per (UTC) day since the given time"""
+    rows = db.query(SentimentAnalysis.timestamp, SentimentAnalysis.sentiment_score).filter(
+        SentimentAnalysis.symbol == symbol,
+        SentimentAnalysis.timestamp >= since
+    ).order_by(SentimentAnalysis.timestamp).all()
+    if not rows:
+        return pd.Series(dtype=float)
+
+    timestamps = pd.to_datetime([row[0] for row in rows], utc=True)
+    scores = pd.Series([row[1] for row in rows], index=timestamps, dtype=float)
+    daily = scores.groupby(timestamps.tz_convert(None).normalize()).mean()
+    daily.index = daily.index.date
+    return daily
+
+
+def pair_forward_returns(sentiment: pd.Series, close: pd.Series) -> pd.DataFrame:
+    """
+    Pair daily sentiment with the return from that day's close to the next close.
+
+    Only days whose next close is already known are returned.
+
+    Args:
+        sentiment: Daily sentiment indexed by date
+        close: Daily closing prices
+
+    Returns:
+        DataFrame indexed by date with sentiment and forward_return columns
+    """
+    index = close.index.tz_localize(None) if close.index.tz is not None else close.index
+    closes = pd.Series(close.to_numpy(dtype=float), index=index.normalize().date)
+    closes = closes[~closes.index.duplicated(keep='last')]
+    forward = (closes.shift(-1) / closes - 1).dropna()
+
+    days = np.array(sentiment.index)
+    # Sentiment on a non-trading day counts towards the next trading day
+    positions = np.searchsorted(np.array(forward.index), days)
+    valid = positions < len(forward)
+    frame = pd.DataFrame({
+        'sentiment': sentiment.to_numpy(dtype=float)[valid],
+        'trading_day': np.array(forward.index)[positions[valid]],
+    })
+    if frame.empty:
+        return pd.DataFrame(columns=['sentiment', 'forward_return'])
+
+    paired = frame.groupby('trading_day')['sentiment'].mean().to_frame()
+    paired['forward_return'] = forward.reindex(paired.index).to_numpy()
+    return paired.dropna()
+
+
+def sentiment_history(db: Session, symbol: str, days: int = 90, window: int = 30) -> Dict[str, any]:
+    """
+    Sentiment snapshot series with daily aggregates and rolling price correlation.
+
+    Args:
+        db: Database session
+        symbol: Stock symbol
+        days: Lookback in days
+        window: Rolling correlation window in trading days
+
+    Returns:
+        Dictionary with snapshot and daily series (columnar lists)
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    rows = db.query(SentimentAnalysis).filter(
+        SentimentAnalysis.symbol == symbol,
+        SentimentAnalysis.timestamp >= since
+    ).order_by(SentimentAnalysis.timestamp).all()
+
+    snapshots = {
+        "timestamps": [row.timestamp.isoformat() if row.timestamp else None for row in rows],
+        "sentiment_score": [row.sentiment_score for row in rows],
+        "news_count": [row.news_count for row in rows],
+        "social_buzz_score": [row.social_buzz_score for row in rows],
+        "price_correlation": [row.price_sentiment_correlation for row in rows],
+    }
+
+    daily = {"dates": [], "sentiment": [], "forward_return": [], "rolling_correlation": []}
+    sentiment = daily_sentiment(db, symbol, since)
+    # Cache only, like get_correlation (the route loads the bars off the event loop)
+    hist = bar_store.get_cached(symbol, sentiment_correlation.timeframe) if not sentiment.empty else None
+    if hist is not None and not hist.empty:
+        pairs = pair_forward_returns(sentiment, hist['Close'])
+        rolling = pairs['sentiment'].rolling(window, min_periods=MIN_PAIRS).corr(pairs['forward_return'])
+        daily = {
+            "dates": [day.isoformat() for day in pairs.index],
+            "sentiment": pairs['sentiment'].round(2).tolist(),
+            "forward_return": (pairs['forward_return'] * 100).round(4).tolist(),
+            "rolling_correlation": rolling.round(4).tolist(),
+        }
+
+    return {"snapshots": snapshots, "daily": daily}
+
+
+def news_buzz(db: Session, symbol: str) -> Dict[str, any]:
+    """
+    Buzz from stored article counts.
+
+    mentions_24h counts articles first seen in the last 24 hours; the trend
+    compares them with the daily average of the preceding 6 days.
+    """
+    now = datetime.now(timezone.utc)
+    day_ago = now - timedelta(days=1)
+    week_ago = now - timedelta(days=7)
+
+    mentions_24h, mentions_week = db.query(
+        func.count(NewsArticle.id).filter(NewsArticle.first_seen_at >= day_ago),
+        func.count(NewsArticle.id)
+    ).filter(
+        NewsArticle.symbol == symbol,
+        NewsArticle.first_seen_at >= week_ago
+    ).one()
+    mentions_24h = mentions_24h or 0
+    baseline = ((mentions_week or 0) - mentions_24h) / 6
+
+    if baseline > 0 and mentions_24h > baseline * 1.5:
+        trend = "RISING"
+    elif baseline > 0 and mentions_24h < baseline * 0.5:
+        trend = "FALLING"
+    else:
+        trend = "STABLE"
+
+    return {
+        "score": float(min(100, mentions_24h * 10)),
+        "trend": trend,
+        "mentions_24h": int(mentions_24h),
+    }
+
+
+# Global tracker instance
+sentiment_correlation = SentimentCorrelationTracker()
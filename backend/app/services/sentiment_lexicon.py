@@ -0,0 +1,158 @@
+"""
+Sentiment Lexicon
+
+Weighted bullish/bearish keyword lexicon for news headlines and a matcher
+that compiles the whole lexicon (including common inflections) into one
+case-insensitive regex with word boundaries. Each text is scanned once,
+and "up" no longer matches inside "update" or "cut" inside "execute".
+"""
+import re
+from typing import Dict, Iterable, List, NamedTuple
+
+# Positive weights are bullish, negative weights bearish. Strong, unambiguous
+# terms weigh more than generic ones such as "up" or "target".
+NEWS_LEXICON: Dict[str, float] = {
+    # Bullish
+    'surge': 1.5, 'rally': 1.5, 'gain': 1.0, 'profit': 1.0, 'growth': 1.0,
+    'bullish': 1.5, 'upgrade': 2.0, 'beat': 1.5, 'exceed': 1.0, 'strong': 1.0,
+    'record': 1.0, 'soar': 2.0, 'jump': 1.0, 'rise': 1.0, 'outperform': 1.5,
+    'buy': 0.5, 'target': 0.5, 'momentum': 0.5, 'breakout': 1.0, 'positive': 1.0,
+    'up': 0.5, 'higher': 0.5, 'boom': 1.5, 'bull': 1.0, 'breakthrough': 1.5,
+    'all-time high': 1.5,
+
+    # Bearish
+    'fall': -1.0, 'drop': -1.0, 'decline': -1.0, 'loss': -1.0, 'bearish': -1.5,
+    'downgrade': -2.0, 'miss': -1.5, 'weak': -1.0, 'plunge': -2.0, 'slump': -1.5,
+    'collapse': -2.0, 'sell': -0.5, 'risk': -0.5, 'concern': -1.0, 'warning': -1.0,
+    'cut': -1.0, 'layoff': -1.5, 'struggle': -1.0, 'uncertain': -0.5, 'negative': -1.0,
+    'down': -0.5, 'lower': -0.5, 'crash': -2.0, 'bear': -1.0, 'fear': -1.0,
+}
+
+# Irregular past forms; they replace the regular -ed form
+IRREGULAR_FORMS: Dict[str, List[str]] = {
+    'fall': ['fell', 'fallen'],
+    'rise': ['rose', 'risen'],
+    'beat': ['beat', 'beaten'],
+    'sell': ['sold'],
+    'buy': ['bought'],
+    'cut': ['cut'],
+}
+
+# Particles and adjectives are matched as is ("ups" would match the ticker UPS)
+UNINFLECTED = {
+    'up', 'down', 'higher', 'strong', 'weak', 'positive', 'negative', 'uncertain', 'bullish', 'bearish',
+}
+
+VOWELS = set('aeiou')
+
+
+class KeywordMatch(NamedTuple):
+    """Result of matching one text against a lexicon"""
+    score: float          # -100 to +100
+    bullish_weight: float
+    bearish_weight: float
+    bullish_hits: int
+    bearish_hits: int
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regex alternation for words, factored by common prefixes.
+
+    "surge|surged|surging" becomes "surg(?:e(?:d)?|ing)", so the regex engine
+    tries each prefix once instead of once per alternative.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        optional = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if optional:
+            return ('(?:' + body + ')?') if len(branches) == 1 else body + '?'
+        return body
+
+    return build(trie)
+
+
+def syllables(word: str) -> int:
+    """Rough syllable count: number of vowel groups"""
+    return len(re.findall(r'[aeiouy]+', word)) or 1
+
+
+def inflections(term: str) -> List[str]:
+    """Common English inflections of a lexicon term (phrases and UNINFLECTED terms are kept as is)"""
+    if ' ' in term or '-' in term or term in UNINFLECTED or len(term) <= 2:
+        return [term]
+
+    forms = {term}
+    if term.endswith(('s', 'x', 'sh', 'ch')):
+        forms.add(term + 'es')
+    elif not (term.endswith('y') and len(term) > 2 and term[-2] not in VOWELS):
+        forms.add(term + 's')
+    if term.endswith('e'):
+        past, present_participle = [term + 'd'], term[:-1] + 'ing'
+    elif term.endswith('y') and len(term) > 2 and term[-2] not in VOWELS:
+        forms.add(term[:-1] + 'ies')
+        past, present_participle = [term[:-1] + 'ied'], term + 'ing'
+    elif (len(term) >= 3 and term[-1] not in VOWELS | set('wxy')
+            and term[-2] in VOWELS and term[-3] not in VOWELS and syllables(term) == 1):
+        # Consonant doubling for one-syllable CVC words: drop -> dropped, cut -> cutting
+        # (but target -> targeted, profit -> profited)
+        past, present_participle = [term + term[-1] + 'ed'], term + term[-1] + 'ing'
+    else:
+        past, present_participle = [term + 'ed'], term + 'ing'
+    forms.add(present_participle)
+    forms.update(IRREGULAR_FORMS.get(term, past))
+    return sorted(forms)
+
+
+class KeywordMatcher:
+    """
+    Multi-pattern matcher over a weighted lexicon.
+
+    All terms and their inflections are compiled into a single prefix-factored
+    alternation so one regex scan finds every hit in a text.
+    """
+
+    def __init__(self, lexicon: Dict[str, float]):
+        self.lexicon = dict(lexicon)
+        self._weights: Dict[str, float] = {}
+        for term, weight in self.lexicon.items():
+            for form in inflections(term.lower()):
+                self._weights.setdefault(form, weight)
+
+        self._pattern = re.compile(rf"\b(?:{trie_pattern(self._weights)})\b", re.IGNORECASE)
+
+    def match(self, text: str) -> KeywordMatch:
+        """Score one text (-100 to +100) from its weighted keyword hits"""
+        bullish_weight = bearish_weight = 0.0
+        bullish_hits = bearish_hits = 0
+
+        for hit in self._pattern.findall(text or ''):
+            weight = self._weights[hit.lower()]
+            if weight > 0:
+                bullish_weight += weight
+                bullish_hits += 1
+            else:
+                bearish_weight -= weight
+                bearish_hits += 1
+
+        total = bullish_weight + bearish_weight
+        score = (bullish_weight - bearish_weight) / total * 100 if total > 0 else 0.0
+        return KeywordMatch(score, bullish_weight, bearish_weight, bullish_hits, bearish_hits)
+
+    def match_many(self, texts: Iterable[str]) -> List[KeywordMatch]:
+        """Score many texts"""
+        return [self.match(text) for text in texts]
+
+
+# Matcher for news headlines and summaries, compiled once at import
+news_matcher = KeywordMatcher(NEWS_LEXICON)
@@ -3,31 +3,40 @@ Sentiment Analysis Service
 
 Analyzes news and social media sentiment using AI and keyword analysis.
 """
+import asyncio
 import logging
-import feedparser
-import requests
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Set, Tuple
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 
+from .news_fetcher import news_fetcher, article_key
+from .news_store import NewsStore, article_to_dict
+from .sentiment_lexicon import news_matcher
+from .sentiment_correlation import sentiment_correlation, news_buzz
+
 logger = logging.getLogger(__name__)
 
 
 class SentimentAnalysisService:
     """
     Analyzes sentiment from multiple sources:
-    - Yahoo Finance News (RSS)
+    - Yahoo Finance News (yfinance + RSS, fetched concurrently)
     - Social media (Twitter/X, Reddit) - Phase 2
     - Seeking Alpha - Phase 2
 
     Returns sentiment score (-100 to +100) with detailed breakdown.
+
+    Articles are persisted with their scores (news_articles) and every
+    analysis is stored as a snapshot (sentiment_analysis). Only articles not
+    seen before are scored, and a snapshot younger than cache_duration is
+    answered from the database without fetching.
     """
 
     def __init__(self, db: Session, ai_service=None):
         self.db = db
         self.ai_service = ai_service
         self.logger = logger
-        self.cache = {}
+        self.store = NewsStore(db)
         self.cache_duration = timedelta(minutes=10)
 
     async def analyze_sentiment(
@@ -46,53 +55,21 @@ class SentimentAnalysisService:
             Dict with sentiment_score, breakdown, top_headlines, etc.
         """
         try:
-            # Check cache
-            cache_key = f"sentiment_{symbol}"
-            if cache_key in self.cache:
-                cached = self.cache[cache_key]
-                if datetime.now() - cached['timestamp'] < self.cache_duration:
-                    return cached['data']
-
-            # Fetch news from multiple sources
-            news_data = await self._fetch_news(symbol)
+            # Serve recent analyses from stored articles
+            news_data = self._get_stored_news(symbol)
+            fresh = news_data is None
+            if fresh:
+                # Fetch news from multiple sources and score unseen articles
+                news_data = await self._fetch_news(symbol)
+                scored, persisted = self._score_articles({symbol: news_data})
+                news_data = scored[symbol]
 
             if not news_data:
                 return self._get_no_data_response(symbol)
 
-            # Analyze sentiment
-            sentiment_results = self._analyze_news_sentiment(news_data)
-
-            # Calculate overall sentiment
-            overall_sentiment = self._calculate_overall_sentiment(sentiment_results)
-
-            # Get top headlines
-            top_headlines = self._get_top_headlines(news_data, sentiment_results)
-
-            # Prepare response
-            response = {
-                "symbol": symbol,
-                "sentiment_score": overall_sentiment["score"],
-                "sentiment_label": overall_sentiment["label"],
-                "confidence": overall_sentiment["confidence"],
-                "breakdown": {
-                    "news": {
-                        "score": sentiment_results.get("average_score", 0),
-                        "count": len(news_data),
-                        "positive": sentiment_results.get("positive_count", 0),
-                        "negative": sentiment_results.get("negative_count", 0),
-                        "neutral": sentiment_results.get("neutral_count", 0),
-                    }
-                },
-                "top_headlines": top_headlines,
-                "social_buzz": {
-                    "score": 0,  # Phase 2
-                    "trend": "STABLE",  # Phase 2
-                    "mentions_24h": 0  # Phase 2
-                },
-                "price_correlation": None,  # Phase 2: Compare sentiment with price movement
-                "data_sources": "Yahoo Finance RSS",
-                "timestamp": datetime.now().isoformat()
-            }
+            await asyncio.to_thread(sentiment_correlation.load_bars, [symbol])
+
+            response = self._build_response(symbol, news_data)
 
             # AI-enhanced analysis (if requested and available)
             if use_ai and self.ai_service:
@@ -102,11 +79,8 @@ class SentimentAnalysisService:
                 except Exception as e:
                     self.logger.warning(f"AI sentiment analysis failed: {e}")
 
-            # Cache response
-            self.cache[cache_key] = {
-                'data': response,
-                'timestamp': datetime.now()
-            }
+            if fresh and symbol in persisted:
+                self._store_snapshots({symbol: (news_data, response)})
 
             return response
 
@@ -114,81 +88,114 @@ class SentimentAnalysisService:
             self.logger.error(f"Error in sentiment analysis: {e}")
             return self._get_error_response(symbol)
 
-    async def _fetch_news(self, symbol: str) -> List[Dict[str, Any]]:
-        """Fetch news from multiple sources with fallback"""
-        news_items = []
+    async def analyze_sentiment_batch(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Perform sentiment analysis for many symbols.
 
-        # Method 1: Try yfinance news (most reliable)
-        try:
-            import yfinance as yf
-            ticker = yf.Ticker(symbol)
-
-            # yfinance returns news as a list of dicts with NEW structure:
-            # [{'id': ..., 'content': {'title': ..., 'summary': ..., 'canonicalUrl': ..., 'pubDate': ...}}]
-            yf_news = ticker.news
-
-            if yf_news:
-                for item in yf_news[:10]:  # Limit to 10 most recent
-                    content = item.get('content', {})
-                    if not content:
-                        continue
-
-                    # Extract title from nested content structure
-                    title_text = content.get('title', '')
-
-                    # Extract link from canonicalUrl or clickThroughUrl
-                    canonical_url = content.get('canonicalUrl', {})
-                    click_url = content.get('clickThroughUrl', {})
-                    link_url = canonical_url.get('url', '') if isinstance(canonical_url, dict) else ''
-                    if not link_url:
-                        link_url = click_url.get('url', '') if isinstance(click_url, dict) else ''
-
-                    # Extract published date
-                    published = content.get('pubDate', '')
-
-                    # Extract summary
-                    summary = content.get('summary', '')[:500]  # Limit summary length
-
-                    if title_text:  # Only add if we have a title
-                        news_items.append({
-                            "title": title_text,
-                            "summary": summary,
-                            "link": link_url,
-                            "published": published,
-                            "source": "Yahoo Finance"
-                        })
-
-                if news_items:
-                    self.logger.info(f"Fetched {len(news_items)} news items from yfinance for {symbol}")
-                    return news_items
+        News for all symbols without a recent snapshot is fetched concurrently
+        (under the fetcher's global concurrency cap). Articles mentioning
+        several symbols are scored once and shared.
 
-        except Exception as e:
-            self.logger.warning(f"yfinance news fetch failed for {symbol}: {e}")
-            import traceback
-            self.logger.warning(traceback.format_exc())
+        Args:
+            symbols: Stock symbols
+
+        Returns:
+            Dict of symbol -> sentiment response (same format as analyze_sentiment)
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        news_by_symbol: Dict[str, List[Dict]] = {}
+        to_fetch = []
+
+        for symbol in symbols:
+            stored = self._get_stored_news(symbol)
+            if stored is not None:
+                news_by_symbol[symbol] = stored
+            else:
+                to_fetch.append(symbol)
+
+        fetched = await news_fetcher.fetch_many(to_fetch) if to_fetch else {}
+
+        # Warm the bar store with one bulk download for the price correlation
+        await asyncio.to_thread(sentiment_correlation.load_bars, symbols)
+
+        scored, persisted = self._score_articles({s: news for s, news in fetched.items() if news})
+
+        snapshots = {}
+        for symbol in symbols:
+            try:
+                if symbol in scored:
+                    news_data = scored[symbol]
+                    results[symbol] = self._build_response(symbol, news_data)
+                    if symbol in persisted:
+                        snapshots[symbol] = (news_data, results[symbol])
+                elif news_by_symbol.get(symbol):
+                    results[symbol] = self._build_response(symbol, news_by_symbol[symbol])
+                else:
+                    results[symbol] = self._get_no_data_response(symbol)
+            except Exception as e:
+                self.logger.error(f"Error in sentiment analysis for {symbol}: {e}")
+                results[symbol] = self._get_error_response(symbol)
+
+        self._store_snapshots(snapshots)
+        return results
+
+    def _build_response(self, symbol: str, news_data: List[Dict]) -> Dict[str, Any]:
+        """Sentiment response from scored articles"""
+        # Analyze sentiment
+        sentiment_results = self._aggregate_article_scores([a["sentiment_score"] for a in news_data])
 
-        # Method 2: Fallback to RSS feedparser
+        # Calculate overall sentiment
+        overall_sentiment = self._calculate_overall_sentiment(sentiment_results)
+
+        # Get top headlines
+        top_headlines = self._get_top_headlines(news_data, sentiment_results)
+
+        return {
+            "symbol": symbol,
+            "sentiment_score": overall_sentiment["score"],
+            "sentiment_label": overall_sentiment["label"],
+            "confidence": overall_sentiment["confidence"],
+            "breakdown": {
+                "news": {
+                    "score": sentiment_results.get("average_score", 0),
+                    "count": len(news_data),
+                    "positive": sentiment_results.get("positive_count", 0),
+                    "negative": sentiment_results.get("negative_count", 0),
+                    "neutral": sentiment_results.get("neutral_count", 0),
+                }
+            },
+            "top_headlines": top_headlines,
+            "social_buzz": self._get_news_buzz(symbol),
+            "price_correlation": self._get_price_correlation(symbol),
+            "data_sources": ", ".join(dict.fromkeys(item.get("source", "") for item in news_data)),
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def _get_news_buzz(self, symbol: str) -> Dict[str, Any]:
+        """News buzz from stored article counts (social sources are Phase 2)"""
         try:
-            rss_url = f"https://query1.finance.yahoo.com/rss?s={symbol}"
-            feed = feedparser.parse(rss_url)
-
-            for entry in feed.entries[:10]:
-                news_items.append({
-                    "title": entry.get('title', ''),
-                    "summary": entry.get('summary', entry.get('description', '')),
-                    "link": entry.get('link', ''),
-                    "published": entry.get('published', ''),
-                    "source": "Yahoo Finance RSS"
-                })
-
-            if news_items:
-                self.logger.info(f"Fetched {len(news_items)} news items from RSS for {symbol}")
-                return news_items
+            return news_buzz(self.db, symbol)
+        except Exception as e:
+            self.db.rollback()
+            self.logger.warning(f"Could not calculate news buzz for {symbol}: {e}")
+            return {"score": 0, "trend": "STABLE", "mentions_24h": 0}
 
+    def _get_price_correlation(self, symbol: str) -> Optional[float]:
+        """Rolling correlation of daily sentiment with next-day returns"""
+        try:
+            return sentiment_correlation.get_correlation(self.db, symbol)
         except Exception as e:
-            self.logger.warning(f"RSS fetch failed for {symbol}: {e}")
+            self.db.rollback()
+            self.logger.warning(f"Could not calculate sentiment/price correlation for {symbol}: {e}")
+            return None
 
-        # Method 3: Return mock data for testing (if nothing works)
+    async def _fetch_news(self, symbol: str) -> List[Dict[str, Any]]:
+        """Fetch news from all sources concurrently (merged and deduplicated)"""
+        news_items = await news_fetcher.fetch(symbol)
+        if news_items:
+            return news_items
+
+        # Return placeholder data if no source delivered anything
         self.logger.warning(f"No news found for {symbol}, using placeholder data")
         return [{
             "title": f"No recent news available for {symbol}",
@@ -198,69 +205,134 @@ class SentimentAnalysisService:
             "source": "System"
         }]
 
-    def _analyze_news_sentiment(self, news_data: List[Dict]) -> Dict[str, Any]:
-        """Analyze sentiment using keyword-based approach"""
-        if not news_data:
-            return {"average_score": 0, "positive_count": 0, "negative_count": 0, "neutral_count": 0}
-
-        # Bullish and bearish keywords
-        bullish_keywords = [
-            'surge', 'rally', 'gain', 'profit', 'growth', 'bullish', 'upgrade',
-            'beat', 'exceed', 'strong', 'record', 'soar', 'jump', 'rise',
-            'outperform', 'buy', 'target', 'momentum', 'breakout', 'rally',
-            'positive', 'up', 'higher', 'boom', 'bull', 'breakthrough'
-        ]
-
-        bearish_keywords = [
-            'fall', 'drop', 'decline', 'loss', 'bearish', 'downgrade',
-            'miss', 'weak', 'plunge', 'slump', 'collapse', 'sell', 'risk',
-            'concern', 'warning', 'cut', 'layoff', 'struggle', 'uncertain',
-            'negative', 'down', 'lower', 'crash', 'bear', 'fear'
-        ]
-
-        total_score = 0
-        positive_count = 0
-        negative_count = 0
-        neutral_count = 0
-
-        for article in news_data:
-            # Title is now a string directly from the new yfinance structure
-            title = article.get('title', '')
-            title = str(title).lower() if title else ''
+    def _get_stored_news(self, symbol: str) -> Optional[List[Dict]]:
+        """Scored articles of the latest snapshot within cache_duration (None on miss or DB error)"""
+        try:
+            snapshot = self.store.latest_snapshot(symbol, self.cache_duration)
+            if snapshot is None:
+                return None
+            return [article_to_dict(row) for row in self.store.recent_articles(symbol, snapshot.news_count or 10)]
+        except Exception as e:
+            self.db.rollback()
+            self.logger.warning(f"Could not read sentiment snapshot for {symbol}: {e}")
+            return None
 
-            summary = article.get('summary', '')
-            summary = str(summary).lower() if summary else ''
+    def _score_articles(self, news_by_symbol: Dict[str, List[Dict]]) -> Tuple[Dict[str, List[Dict]], Set[str]]:
+        """
+        Attach sentiment scores to fetched articles, scoring each article once.
 
-            text = f"{title} {summary}"
+        Articles already stored (for any symbol) take their stored score; new
+        ones are scored once even if several symbols returned them, and are
+        added per symbol in a savepoint (committed by _store_snapshots).
+        Falls back to scoring in memory if the store is unavailable.
 
-            # Count bullish and bearish mentions
-            bullish_count = sum(1 for word in bullish_keywords if word in text)
-            bearish_count = sum(1 for word in bearish_keywords if word in text)
+        Returns:
+            Scored articles per symbol, and the symbols whose (non-placeholder)
+            articles were stored; only these may get a snapshot
+        """
+        news_by_symbol = {
+            symbol: [dict(article) for article in articles]
+            for symbol, articles in news_by_symbol.items()
+        }
+        keys = {
+            symbol: [article_key(article) for article in articles]
+            for symbol, articles in news_by_symbol.items()
+        }
+        all_keys = [key for symbol_keys in keys.values() for key in symbol_keys]
+
+        rows = []
+        persist = any(
+            article.get("source") != "System"
+            for articles in news_by_symbol.values() for article in articles
+        )
+        if persist:
+            try:
+                rows = self.store.find(all_keys)
+            except Exception as e:
+                self.db.rollback()
+                self.logger.warning(f"News store unavailable: {e}")
+                persist = False
+
+        scores: Dict[str, Dict[str, Any]] = {
+            row.article_id: {
+                "sentiment_score": row.sentiment_score,
+                "bullish_hits": row.bullish_hits or 0,
+                "bearish_hits": row.bearish_hits or 0,
+            }
+            for row in rows
+        }
+        known = {(row.symbol, row.article_id): row for row in rows}
+        added = set()
+        persisted: Set[str] = set()
+        scored_count = 0
+
+        seen_at = datetime.now(timezone.utc)
+        for symbol, articles in news_by_symbol.items():
+            new_articles, seen_rows = [], []
+            for key, article in zip(keys[symbol], articles):
+                if key not in scores:
+                    scores[key] = self._score_article(article)
+                    scored_count += 1
+                article.update(scores[key])
+
+                if article.get("source") == "System":
+                    continue
+                row = known.get((symbol, key))
+                if row is not None:
+                    seen_rows.append(row)
+                elif (symbol, key) not in added:
+                    new_articles.append(article)
+                    added.add((symbol, key))
+
+            if persist and (new_articles or seen_rows):
+                try:
+                    # A failing symbol only rolls back its own writes
+                    with self.db.begin_nested():
+                        self.store.add_articles(symbol, new_articles, seen_at)
+                        self.store.mark_seen(seen_rows, seen_at)
+                        self.db.flush()  # Visible to the news buzz queries of this analysis
+                    persisted.add(symbol)
+                except Exception as e:
+                    self.logger.warning(f"Could not store news articles for {symbol}: {e}")
 
-            # Calculate sentiment score for this article (-100 to +100)
-            total_mentions = bullish_count + bearish_count
-            if total_mentions > 0:
-                article_score = ((bullish_count - bearish_count) / total_mentions) * 100
-            else:
-                article_score = 0
-                neutral_count += 1
+        self.logger.info(f"Scored {scored_count} new of {len(all_keys)} articles for {len(news_by_symbol)} symbol(s)")
+        return news_by_symbol, persisted
 
-            total_score += article_score
+    def _store_snapshots(self, snapshots: Dict[str, tuple]) -> None:
+        """
+        Store sentiment snapshots and commit them together with the articles
+        added by _score_articles (callers pass only symbols whose articles
+        were stored).
+        """
+        try:
+            for symbol, (news_data, response) in snapshots.items():
+                self.store.add_snapshot(symbol, response)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            self.logger.warning(f"Could not store news articles and sentiment snapshots: {e}")
 
-            if article_score > 20:
-                positive_count += 1
-            elif article_score < -20:
-                negative_count += 1
-            else:
-                neutral_count += 1
+    def _score_article(self, article: Dict) -> Dict[str, Any]:
+        """Weighted keyword sentiment of one article (-100 to +100)"""
+        text = f"{article.get('title') or ''} {article.get('summary') or ''}"
+        match = news_matcher.match(text)
+
+        return {
+            "sentiment_score": match.score,
+            "bullish_hits": match.bullish_hits,
+            "bearish_hits": match.bearish_hits
+        }
 
-        average_score = total_score / len(news_data) if news_data else 0
+    def _aggregate_article_scores(self, scores: List[float]) -> Dict[str, Any]:
+        """Average score and positive/negative/neutral counts of article scores"""
+        positive_count = sum(1 for score in scores if score > 20)
+        negative_count = sum(1 for score in scores if score < -20)
 
         return {
-            "average_score": average_score,
+            "average_score": sum(scores) / len(scores) if scores else 0,
             "positive_count": positive_count,
             "negative_count": negative_count,
-            "neutral_count": neutral_count
+            "neutral_count": len(scores) - positive_count - negative_count
         }
 
     def _calculate_overall_sentiment(self, results: Dict[str, Any]) -> Dict[str, Any]:
@@ -305,11 +377,11 @@ class SentimentAnalysisService:
             title = item.get('title', '')
             title = str(title)[:100] if title else ''  # Truncate long titles
 
-            # Determine sentiment contribution based on keywords
-            title_lower = title.lower()
-            if any(word in title_lower for word in ['surge', 'rally', 'gain', 'profit', 'growth', 'bullish', 'upgrade', 'beat', 'record', 'soar']):
+            # Determine sentiment contribution based on headline keywords
+            title_score = news_matcher.match(title).score
+            if title_score > 0:
                 sentiment = "Positive"
-            elif any(word in title_lower for word in ['fall', 'drop', 'decline', 'loss', 'bearish', 'downgrade', 'miss', 'plunge', 'slump']):
+            elif title_score < 0:
                 sentiment = "Negative"
             else:
                 sentiment = "Neutral"
@@ -4,6 +4,8 @@ Signal Generation Service
 Generates comprehensive trading signals for quantitative analysis.
 """
 import logging
+import numpy as np
+import pandas as pd
 from typing import Dict, List, Any
 from datetime import datetime
 
@@ -314,3 +316,86 @@ def generate_signals(hist: Any, technical_indicators: Dict) -> List[Dict[str, An
             })
 
     return signals
+
+
+def generate_signal_points_series(
+    hist: pd.DataFrame,
+    indicator_series: pd.DataFrame,
+    strength_points: Dict[str, float]
+) -> pd.DataFrame:
+    """
+    Evaluate the generate_signals rules for every bar at once.
+
+    Instead of signal dicts, returns the net signal points per timeframe:
+    BUY signals add and SELL signals subtract the points of their strength,
+    HOLD signals contribute nothing.
+
+    Args:
+        hist: Historical OHLCV data
+        indicator_series: Output of technical_indicators.calculate_indicator_series
+        strength_points: Points per signal strength (WEAK, MEDIUM, STRONG, VERY_STRONG)
+
+    Returns:
+        DataFrame indexed like hist with 'short', 'medium' and 'long' columns
+    """
+    close = hist['Close'].to_numpy(dtype=float)
+    col = {name: indicator_series[name].to_numpy(dtype=float) for name in indicator_series.columns}
+    nan = np.full(len(close), np.nan)
+    weak, medium, strong, very_strong = (
+        strength_points['WEAK'], strength_points['MEDIUM'],
+        strength_points['STRONG'], strength_points['VERY_STRONG']
+    )
+
+    def has(*names: str) -> np.ndarray:
+        return np.logical_and.reduce([~np.isnan(col.get(name, nan)) for name in names])
+
+    rsi = col.get('rsi', nan)
+    stoch_k, stoch_d = col.get('stoch_k', nan), col.get('stoch_d', nan)
+    williams_r = col.get('williams_r', nan)
+    cci = col.get('cci', nan)
+    macd, macd_signal, macd_hist = col.get('macd', nan), col.get('macd_signal', nan), col.get('macd_histogram', nan)
+    adx, plus_di, minus_di = col.get('adx', nan), col.get('plus_di', nan), col.get('minus_di', nan)
+    sma_20, sma_50, sma_200 = col.get('sma_20', nan), col.get('sma_50', nan), col.get('sma_200', nan)
+    bb_percent = col.get('bb_percent', nan)
+    vroc = col.get('vroc', nan)
+    resistance_1, support_1 = col.get('resistance_1', nan), col.get('support_1', nan)
+
+    # === MOMENTUM SIGNALS (SHORT-TERM) ===
+    short = np.select(
+        [rsi < 20, rsi < 30, rsi > 80, rsi > 70],
+        [very_strong, strong, -very_strong, -strong], default=0
+    ).astype(float)
+    short += np.select(
+        [(stoch_k < 20) & (stoch_d < 20) & (stoch_k > stoch_d),
+         (stoch_k > 80) & (stoch_d > 80) & (stoch_k < stoch_d)],
+        [strong, -strong], default=0
+    )
+    short += np.select([williams_r < -80, williams_r > -20], [strong, -strong], default=0)
+    short += np.select([cci < -100, cci > 100], [medium, -medium], default=0)
+    bb_ok = has('bb_upper', 'bb_lower', 'bb_percent')
+    short += np.select([bb_ok & (bb_percent < 0.1), bb_ok & (bb_percent > 0.9)], [medium, -medium], default=0)
+    pivot_ok = has('pivot_point', 'resistance_1', 'support_1')
+    short += np.select(
+        [pivot_ok & (close > resistance_1), pivot_ok & (close < support_1)],
+        [strong, -strong], default=0
+    )
+
+    # === TREND SIGNALS (MEDIUM-TERM) ===
+    mid = np.select(
+        [(macd > macd_signal) & (macd_hist > 0), (macd < macd_signal) & (macd_hist < 0)],
+        [strong, -strong], default=0
+    ).astype(float)
+    adx_ok = has('adx', 'plus_di', 'minus_di') & (adx > 25)
+    mid += np.select(
+        [adx_ok & (plus_di > minus_di), adx_ok & (minus_di > plus_di)],
+        [medium, -medium], default=0
+    )
+    volume_ok = has('obv', 'vroc')
+    mid += np.select([volume_ok & (vroc > 50), volume_ok & (vroc < -30)], [medium, -weak], default=0)
+
+    # === MOVING AVERAGE SIGNALS (LONG-TERM) ===
+    long = np.select([sma_20 > sma_50, sma_20 < sma_50], [medium, -medium], default=0).astype(float)
+    sma_200_ok = has('sma_200')
+    long += np.select([sma_200_ok & (close > sma_200), sma_200_ok], [weak, -weak], default=0)
+
+    return pd.DataFrame({'short': short, 'medium': mid, 'long': long}, index=hist.index)
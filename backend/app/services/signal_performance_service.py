@@ -3,17 +3,79 @@ Signal Performance Tracking Service
 
 Tracks and analyzes historical performance of generated signals.
 Calculates win-rates, average returns, and benchmark comparisons.
+
+Signals are recorded in bulk with their entry price, one row per evaluation
+horizon. Due signals are evaluated set-based: exit prices for all due
+(symbol, evaluate_after) pairs are taken from the bar store, loaded into a
+temporary table, and one UPDATE ... FROM computes returns, excess returns
+and is_profitable for every matching row. The evaluated rows are then added
+to signal_performance_rollups, from which accuracy metrics are read.
 """
 import logging
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import Column, DateTime, Float, MetaData, String, Table, and_, case, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
-from ..models.investment_engine import SignalPerformance
+from ..models.investment_engine import SignalPerformance, SignalPerformanceRollup
+from .bar_store import bar_store
 
 logger = logging.getLogger(__name__)
 
+BENCHMARK_SYMBOL = "SPY"
+EVALUATION_HORIZONS = (1, 7, 30)  # Days
+
+# A HOLD signal is right if the price stayed within this band (percent)
+HOLD_BAND_PERCENT = 2.0
+
+# Aggregated metrics per filter set: (symbol, signal_type, timeframe_days) -> (stored_at, groups)
+METRICS_CACHE_SECONDS = 300
+_metrics_cache: Dict[Tuple[Optional[str], Optional[str], Optional[int]], Tuple[float, List[Dict[str, Any]]]] = {}
+
+# Per-transaction scratch table with the exit prices of due signals
+_exit_prices = Table(
+    "signal_exit_prices",
+    MetaData(),
+    Column("symbol", String, nullable=False),
+    Column("evaluate_after", DateTime(timezone=True), nullable=False),
+    Column("exit_price", Float, nullable=False),
+    Column("benchmark_exit_price", Float),
+    prefixes=["TEMPORARY"],
+)
+
+
+def invalidate_metrics_cache() -> None:
+    """Drop cached accuracy metrics (called after signals were evaluated)"""
+    _metrics_cache.clear()
+
+
+def signal_from_recommendation(recommendation: str, confidence: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Map a master score recommendation to (signal_type, signal_strength).
+
+    STRONG_BUY with HIGH confidence -> ("BUY", "VERY_STRONG"), HOLD -> ("HOLD", ...).
+    """
+    recommendation = (recommendation or "HOLD").upper()
+    if "BUY" in recommendation:
+        signal_type = "BUY"
+    elif "SELL" in recommendation:
+        signal_type = "SELL"
+    else:
+        signal_type = "HOLD"
+
+    level = 2 if recommendation.startswith("STRONG") else 1
+    if confidence == "HIGH":
+        level += 1
+    elif confidence == "LOW":
+        level -= 1
+    strength = ["WEAK", "MEDIUM", "STRONG", "VERY_STRONG"][max(0, min(level, 3))]
+    return signal_type, strength
+
 
 class SignalPerformanceService:
     """
@@ -24,108 +86,233 @@ class SignalPerformanceService:
         self.db = db
         self.logger = logger
 
-    def save_signal(
+    def record_signals(
         self,
-        symbol: str,
-        signal_type: str,
-        signal_strength: str,
-        master_score: float,
-        technical_score: Optional[float] = None,
-        sentiment_score: Optional[float] = None,
-        activity_score: Optional[float] = None,
-    ) -> SignalPerformance:
-        """Save a generated signal to the database for later evaluation"""
+        signals: Iterable[Dict[str, Any]],
+        horizons: Iterable[int] = EVALUATION_HORIZONS,
+        benchmark_price: Optional[float] = None
+    ) -> int:
+        """
+        Record generated signals for later evaluation in one bulk insert.
+
+        Each signal dict needs symbol, signal_type, signal_strength,
+        master_score and entry_price; technical_score, sentiment_score,
+        activity_score and generated_at are optional. One row per horizon is
+        written. A symbol/type that already has pending signals from the
+        same UTC day is skipped, so repeated requests do not inflate the
+        statistics.
+
+        Args:
+            signals: Generated signals
+            horizons: Evaluation horizons in days
+            benchmark_price: Current SPY price (fetched from the bar store if omitted)
+
+        Returns:
+            Number of rows inserted
+        """
         try:
-            signal = SignalPerformance(
-                symbol=symbol,
-                signal_type=signal_type,
-                signal_strength=signal_strength,
-                master_score=master_score,
-                technical_score=technical_score,
-                sentiment_score=sentiment_score,
-                activity_score=activity_score,
-                generated_at=datetime.now(),
-                is_pending=True
-            )
+            now = datetime.now(timezone.utc)
+            horizons = tuple(horizons)
+            signals = [s for s in signals if s.get("entry_price")]
+            if not signals:
+                return 0
 
-            self.db.add(signal)
+            day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            recorded = set(self.db.execute(
+                select(SignalPerformance.symbol, SignalPerformance.signal_type).where(
+                    SignalPerformance.symbol.in_({s["symbol"] for s in signals}),
+                    SignalPerformance.is_pending == True,
+                    SignalPerformance.generated_at >= day_start
+                ).distinct()
+            ).all())
+
+            if benchmark_price is None:
+                benchmark_price = self._latest_close(BENCHMARK_SYMBOL)
+
+            rows = []
+            for signal in signals:
+                key = (signal["symbol"], signal["signal_type"])
+                if key in recorded:
+                    continue
+                recorded.add(key)
+
+                generated_at = signal.get("generated_at") or now
+                for days in horizons:
+                    rows.append({
+                        "symbol": signal["symbol"],
+                        "signal_type": signal["signal_type"],
+                        "signal_strength": signal.get("signal_strength"),
+                        "master_score": signal.get("master_score"),
+                        "technical_score": signal.get("technical_score"),
+                        "sentiment_score": signal.get("sentiment_score"),
+                        "activity_score": signal.get("activity_score"),
+                        "entry_price": float(signal["entry_price"]),
+                        "benchmark_entry_price": benchmark_price,
+                        "generated_at": generated_at,
+                        "timeframe_days": days,
+                        "evaluate_after": generated_at + timedelta(days=days),
+                        "is_pending": True,
+                    })
+
+            if rows:
+                self.db.execute(insert(SignalPerformance), rows)
             self.db.commit()
-            self.db.refresh(signal)
 
-            self.logger.info(f"Saved signal for {symbol}: {signal_type} ({signal_strength})")
-            return signal
+            self.logger.info(f"Recorded {len(rows)} signal rows ({len(horizons)} horizons per signal)")
+            return len(rows)
 
         except Exception as e:
-            self.logger.error(f"Error saving signal: {e}")
+            self.logger.error(f"Error recording signals: {e}")
             self.db.rollback()
-            return None
+            return 0
 
-    def evaluate_pending_signals(
+    def save_signal(
         self,
         symbol: str,
-        current_price: float,
-        benchmark_return: float
+        signal_type: str,
+        signal_strength: str,
+        master_score: float,
+        entry_price: float,
+        technical_score: Optional[float] = None,
+        sentiment_score: Optional[float] = None,
+        activity_score: Optional[float] = None,
     ) -> int:
+        """Save a generated signal to the database for later evaluation"""
+        return self.record_signals([{
+            "symbol": symbol,
+            "signal_type": signal_type,
+            "signal_strength": signal_strength,
+            "master_score": master_score,
+            "entry_price": entry_price,
+            "technical_score": technical_score,
+            "sentiment_score": sentiment_score,
+            "activity_score": activity_score,
+        }])
+
+    def evaluate_pending_signals(self, symbols: Optional[List[str]] = None) -> int:
         """
-        Evaluate pending signals for a symbol.
+        Evaluate all due signals (evaluate_after has passed) in one UPDATE.
+
+        The exit price of a signal is the first close on or after the UTC
+        date of evaluate_after; signals whose exit bar does not exist yet stay
+        pending. Returns are direction-aware: a SELL signal is profitable if
+        the price fell, a HOLD signal if it stayed within HOLD_BAND_PERCENT.
 
         Args:
-            symbol: Stock symbol
-            current_price: Current price of the stock
-            benchmark_return: Return of benchmark (e.g., S&P 500) over the period
+            symbols: Restrict the evaluation to these symbols (default: all)
 
         Returns:
             Number of signals evaluated
         """
         try:
-            # Get pending signals older than 1 day
-            cutoff_date = datetime.now() - timedelta(days=1)
-
-            pending_signals = self.db.query(SignalPerformance).filter(
-                and_(
-                    SignalPerformance.symbol == symbol,
-                    SignalPerformance.is_pending == True,
-                    SignalPerformance.generated_at < cutoff_date
+            now = datetime.now(timezone.utc)
+            query = select(SignalPerformance.symbol, SignalPerformance.evaluate_after).where(
+                SignalPerformance.is_pending == True,
+                SignalPerformance.entry_price.isnot(None),
+                SignalPerformance.evaluate_after <= now
+            ).distinct()
+            if symbols:
+                query = query.where(SignalPerformance.symbol.in_(symbols))
+            due = self.db.execute(query).all()
+            if not due:
+                return 0
+
+            exit_rows = self._exit_prices(due)
+            if not exit_rows:
+                return 0
+
+            connection = self.db.connection()
+            _exit_prices.create(connection, checkfirst=True)
+            try:
+                connection.execute(insert(_exit_prices), exit_rows)
+                result = self.db.execute(
+                    self._evaluation_update(now),
+                    execution_options={"synchronize_session": False}
                 )
-            ).all()
-
-            evaluated_count = 0
-
-            for signal in pending_signals:
-                # Calculate days since generation
-                days_elapsed = (datetime.now() - signal.generated_at).days
-
-                # Determine which timeframe to evaluate
-                timeframe_days = self._get_evaluation_timeframe(days_elapsed)
-
-                if timeframe_days:
-                    # Get the price at signal generation (from stored data or historical)
-                    # For now, we'll use a simplified approach
-                    # In production, you'd store the price at generation
-
-                    # Calculate return
-                    # Note: This is simplified - you'd need the price at generation
-                    # For now, skip actual return calculation
-
-                    signal.timeframe_days = timeframe_days
-                    signal.evaluated_at = datetime.now()
-                    # signal.return_percent = calculated_return
-                    signal.benchmark_return_percent = benchmark_return
-                    # signal.excess_return = signal.return_percent - benchmark_return
-                    # signal.is_profitable = signal.return_percent > 0
-                    signal.is_pending = False
-
-                    evaluated_count += 1
-
+                if result.rowcount:
+                    # Add the signals evaluated by this update to the rollups
+                    self._apply_rollup(SignalPerformance.evaluated_at == now, from_exit_prices=True)
+            finally:
+                _exit_prices.drop(connection, checkfirst=True)
             self.db.commit()
-            self.logger.info(f"Evaluated {evaluated_count} signals for {symbol}")
-            return evaluated_count
+            if result.rowcount:
+                invalidate_metrics_cache()
+
+            self.logger.info(f"Evaluated {result.rowcount} signals")
+            return result.rowcount
 
         except Exception as e:
             self.logger.error(f"Error evaluating signals: {e}")
             self.db.rollback()
             return 0
 
+    def _exit_prices(self, due: List[Tuple[str, datetime]]) -> List[Dict[str, Any]]:
+        """Exit and benchmark exit prices for due (symbol, evaluate_after) pairs"""
+        symbols = sorted({symbol for symbol, _ in due})
+        closes = bar_store.get_close_matrix(symbols + [BENCHMARK_SYMBOL], "1Y")
+        if closes.empty:
+            return []
+
+        frame = pd.DataFrame(due, columns=["symbol", "evaluate_after"])
+        exit_dates = pd.to_datetime(frame["evaluate_after"], utc=True).dt.tz_localize(None).dt.normalize().to_numpy()
+
+        benchmark = _first_close_on_or_after(closes.get(BENCHMARK_SYMBOL), exit_dates)
+        exit_prices = np.full(len(frame), np.nan)
+        for symbol, positions in frame.groupby("symbol").indices.items():
+            exit_prices[positions] = _first_close_on_or_after(closes.get(symbol), exit_dates[positions])
+
+        return [
+            {
+                "symbol": symbol,
+                "evaluate_after": evaluate_after,
+                "exit_price": float(price),
+                "benchmark_exit_price": float(bench) if np.isfinite(bench) else None,
+            }
+            for symbol, evaluate_after, price, bench in zip(frame["symbol"], frame["evaluate_after"], exit_prices, benchmark)
+            if np.isfinite(price)
+        ]
+
+    def _evaluation_update(self, now: datetime):
+        """UPDATE signal_performance ... FROM signal_exit_prices"""
+        signal = SignalPerformance
+        return_percent = (_exit_prices.c.exit_price / signal.entry_price - 1) * 100
+        benchmark_return = case(
+            (signal.benchmark_entry_price > 0,
+             (_exit_prices.c.benchmark_exit_price / signal.benchmark_entry_price - 1) * 100),
+            else_=None
+        )
+        excess_return = case(
+            (signal.signal_type == "SELL", benchmark_return - return_percent),
+            else_=return_percent - benchmark_return
+        )
+        is_profitable = case(
+            (signal.signal_type == "BUY", return_percent > 0),
+            (signal.signal_type == "SELL", return_percent < 0),
+            else_=func.abs(return_percent) <= HOLD_BAND_PERCENT
+        )
+
+        return update(signal).where(
+            and_(
+                signal.symbol == _exit_prices.c.symbol,
+                signal.evaluate_after == _exit_prices.c.evaluate_after,
+                signal.is_pending == True,
+                signal.entry_price > 0
+            )
+        ).values(
+            return_percent=return_percent,
+            benchmark_return_percent=benchmark_return,
+            excess_return=excess_return,
+            is_profitable=is_profitable,
+            evaluated_at=now,
+            is_pending=False
+        )
+
+    def _latest_close(self, symbol: str) -> Optional[float]:
+        hist = bar_store.get_history(symbol, "1M")
+        if hist is None or hist.empty:
+            return None
+        return float(hist['Close'].iloc[-1])
+
     def get_accuracy_metrics(
         self,
         symbol: Optional[str] = None,
@@ -144,73 +331,40 @@ class SignalPerformanceService:
             Dict with accuracy metrics
         """
         try:
-            # Build query
-            query = self.db.query(SignalPerformance).filter(
-                SignalPerformance.is_pending == False
-            )
-
-            if symbol:
-                query = query.filter(SignalPerformance.symbol == symbol)
-            if signal_type:
-                query = query.filter(SignalPerformance.signal_type == signal_type)
-            if timeframe_days:
-                query = query.filter(SignalPerformance.timeframe_days == timeframe_days)
-
-            signals = query.all()
-
-            if not signals:
+            groups = self._aggregate(symbol, signal_type, timeframe_days)
+            if not groups:
                 return self._get_no_metrics_response()
 
-            # Calculate metrics
-            total_signals = len(signals)
-            profitable_signals = sum(1 for s in signals if s.is_profitable)
+            overall = _combine(groups)
+            total_signals = overall["count"]
 
-            win_rate = (profitable_signals / total_signals * 100) if total_signals > 0 else 0
-
-            # Average returns
-            avg_return = sum(s.return_percent or 0 for s in signals) / total_signals
-            avg_benchmark_return = sum(s.benchmark_return_percent or 0 for s in signals) / total_signals
-            avg_excess_return = sum(s.excess_return or 0 for s in signals) / total_signals
-
-            # By signal type
             by_type = {}
             for sig_type in ["BUY", "SELL", "HOLD"]:
-                type_signals = [s for s in signals if s.signal_type == sig_type]
-                if type_signals:
-                    type_profitable = sum(1 for s in type_signals if s.is_profitable)
-                    by_type[sig_type] = {
-                        "count": len(type_signals),
-                        "win_rate": round((type_profitable / len(type_signals) * 100), 2),
-                        "avg_return": round(sum(s.return_percent or 0 for s in type_signals) / len(type_signals), 2)
-                    }
-
-            # By timeframe
+                stats = _combine(g for g in groups if g["signal_type"] == sig_type)
+                if stats["count"]:
+                    by_type[sig_type] = _summary(stats)
+
             by_timeframe = {}
             for tf in [1, 7, 30]:
-                tf_signals = [s for s in signals if s.timeframe_days == tf]
-                if tf_signals:
-                    tf_profitable = sum(1 for s in tf_signals if s.is_profitable)
-                    by_timeframe[f"{tf}D"] = {
-                        "count": len(tf_signals),
-                        "win_rate": round((tf_profitable / len(tf_signals) * 100), 2),
-                        "avg_return": round(sum(s.return_percent or 0 for s in tf_signals) / len(tf_signals), 2)
-                    }
+                stats = _combine(g for g in groups if g["timeframe_days"] == tf)
+                if stats["count"]:
+                    by_timeframe[f"{tf}D"] = _summary(stats)
 
             return {
                 "overall": {
                     "total_signals": total_signals,
-                    "profitable_signals": profitable_signals,
-                    "win_rate": round(win_rate, 2),
-                    "avg_return_percent": round(avg_return, 2),
-                    "avg_benchmark_return_percent": round(avg_benchmark_return, 2),
-                    "avg_excess_return_percent": round(avg_excess_return, 2)
+                    "profitable_signals": overall["profitable"],
+                    "win_rate": round(overall["profitable"] / total_signals * 100, 2),
+                    "avg_return_percent": round(overall["return_sum"] / total_signals, 2),
+                    "avg_benchmark_return_percent": round(overall["benchmark_sum"] / total_signals, 2),
+                    "avg_excess_return_percent": round(overall["excess_sum"] / total_signals, 2)
                 },
                 "by_signal_type": by_type,
                 "by_timeframe": by_timeframe,
                 "vs_benchmark": {
-                    "outperformed": sum(1 for s in signals if (s.excess_return or 0) > 0),
-                    "underperformed": sum(1 for s in signals if (s.excess_return or 0) < 0),
-                    "beat_rate": round((sum(1 for s in signals if (s.excess_return or 0) > 0) / total_signals * 100), 2)
+                    "outperformed": overall["outperformed"],
+                    "underperformed": overall["underperformed"],
+                    "beat_rate": round(overall["outperformed"] / total_signals * 100, 2)
                 },
                 "timestamp": datetime.now().isoformat()
             }
@@ -222,23 +376,12 @@ class SignalPerformanceService:
     def get_signal_strength_accuracy(self) -> Dict[str, Any]:
         """Get accuracy breakdown by signal strength"""
         try:
-            signals = self.db.query(SignalPerformance).filter(
-                SignalPerformance.is_pending == False
-            ).all()
-
-            if not signals:
-                return {}
-
+            groups = self._aggregate()
             by_strength = {}
             for strength in ["WEAK", "MEDIUM", "STRONG", "VERY_STRONG"]:
-                strength_signals = [s for s in signals if s.signal_strength == strength]
-                if strength_signals:
-                    profitable = sum(1 for s in strength_signals if s.is_profitable)
-                    by_strength[strength] = {
-                        "count": len(strength_signals),
-                        "win_rate": round((profitable / len(strength_signals) * 100), 2),
-                        "avg_return": round(sum(s.return_percent or 0 for s in strength_signals) / len(strength_signals), 2)
-                    }
+                stats = _combine(g for g in groups if g["signal_strength"] == strength)
+                if stats["count"]:
+                    by_strength[strength] = _summary(stats)
 
             return by_strength
 
@@ -246,16 +389,141 @@ class SignalPerformanceService:
             self.logger.error(f"Error getting strength accuracy: {e}")
             return {}
 
-    def _get_evaluation_timeframe(self, days_elapsed: int) -> Optional[int]:
-        """Determine which timeframe to evaluate based on days elapsed"""
-        if days_elapsed >= 30:
-            return 30
-        elif days_elapsed >= 7:
-            return 7
-        elif days_elapsed >= 1:
-            return 1
-        else:
-            return None
+    def rebuild_rollups(self, symbols: Optional[List[str]] = None) -> int:
+        """
+        Recompute signal_performance_rollups from signal_performance (backfills, repairs).
+
+        Args:
+            symbols: Rebuild only these symbols (default: all)
+
+        Returns:
+            Number of rollup rows written
+        """
+        try:
+            rollup = SignalPerformanceRollup
+            delete_stmt = delete(rollup)
+            condition = None
+            if symbols:
+                delete_stmt = delete_stmt.where(rollup.symbol.in_(symbols))
+                condition = SignalPerformance.symbol.in_(symbols)
+
+            self.db.execute(delete_stmt)
+            self._apply_rollup(condition)
+            self.db.commit()
+            invalidate_metrics_cache()
+
+            query = select(func.count()).select_from(rollup)
+            if symbols:
+                query = query.where(rollup.symbol.in_(symbols))
+            return self.db.execute(query).scalar() or 0
+
+        except Exception as e:
+            self.logger.error(f"Error rebuilding signal performance rollups: {e}")
+            self.db.rollback()
+            return 0
+
+    def _apply_rollup(self, condition=None, from_exit_prices: bool = False) -> None:
+        """
+        Add the statistics of evaluated signals matching condition to the rollups.
+
+        A single INSERT ... SELECT ... GROUP BY ... ON CONFLICT DO UPDATE adds
+        counts and sums to existing rollup rows and creates missing ones. With
+        from_exit_prices, the SELECT is driven by the signal_exit_prices rows
+        of the current evaluation (joined through the symbol index) instead of
+        scanning every evaluated signal.
+        """
+        signal = SignalPerformance
+        rollup = SignalPerformanceRollup
+        query = select(
+            signal.symbol,
+            signal.signal_type,
+            func.coalesce(signal.timeframe_days, 0),
+            func.coalesce(signal.signal_strength, ""),
+            func.count(),
+            func.sum(case((signal.is_profitable == True, 1), else_=0)),
+            func.sum(case((signal.excess_return > 0, 1), else_=0)),
+            func.sum(case((signal.excess_return < 0, 1), else_=0)),
+            func.coalesce(func.sum(signal.return_percent), 0.0),
+            func.coalesce(func.sum(signal.benchmark_return_percent), 0.0),
+            func.coalesce(func.sum(signal.excess_return), 0.0),
+        ).where(
+            signal.is_pending == False
+        ).group_by(
+            signal.symbol, signal.signal_type,
+            func.coalesce(signal.timeframe_days, 0), func.coalesce(signal.signal_strength, "")
+        )
+        if from_exit_prices:
+            query = query.select_from(_exit_prices).join(signal, and_(
+                signal.symbol == _exit_prices.c.symbol,
+                signal.evaluate_after == _exit_prices.c.evaluate_after
+            ))
+        if condition is not None:
+            query = query.where(condition)
+
+        columns = [
+            "symbol", "signal_type", "timeframe_days", "signal_strength",
+            "signal_count", "profitable_count", "outperformed_count", "underperformed_count",
+            "return_sum", "benchmark_return_sum", "excess_return_sum",
+        ]
+        dialect_insert = pg_insert if self.db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        stmt = dialect_insert(rollup).from_select(columns, query)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["symbol", "signal_type", "timeframe_days", "signal_strength"],
+            set_={
+                **{
+                    name: getattr(rollup, name) + getattr(stmt.excluded, name)
+                    for name in columns[4:]
+                },
+                "updated_at": func.now(),
+            }
+        )
+        self.db.execute(stmt)
+
+    def _aggregate(
+        self,
+        symbol: Optional[str] = None,
+        signal_type: Optional[str] = None,
+        timeframe_days: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluated signal statistics grouped by type, timeframe and strength.
+
+        Read from signal_performance_rollups: a symbol's statistics are a few
+        rows found through the rollup's unique index; without a symbol the
+        per-symbol rows are summed. Results are cached per filter set until
+        the next evaluation or METRICS_CACHE_SECONDS.
+        """
+        key = (symbol, signal_type, timeframe_days)
+        cached = _metrics_cache.get(key)
+        if cached is not None and time.time() - cached[0] < METRICS_CACHE_SECONDS:
+            return cached[1]
+
+        rollup = SignalPerformanceRollup
+        query = select(
+            rollup.signal_type,
+            rollup.timeframe_days,
+            rollup.signal_strength,
+            func.sum(rollup.signal_count).label("count"),
+            func.sum(rollup.profitable_count).label("profitable"),
+            func.sum(rollup.return_sum).label("return_sum"),
+            func.sum(rollup.benchmark_return_sum).label("benchmark_sum"),
+            func.sum(rollup.excess_return_sum).label("excess_sum"),
+            func.sum(rollup.outperformed_count).label("outperformed"),
+            func.sum(rollup.underperformed_count).label("underperformed"),
+        ).group_by(
+            rollup.signal_type, rollup.timeframe_days, rollup.signal_strength
+        )
+
+        if symbol:
+            query = query.where(rollup.symbol == symbol)
+        if signal_type:
+            query = query.where(rollup.signal_type == signal_type)
+        if timeframe_days:
+            query = query.where(rollup.timeframe_days == timeframe_days)
+
+        groups = [dict(row._mapping) for row in self.db.execute(query)]
+        _metrics_cache[key] = (time.time(), groups)
+        return groups
 
     def _get_no_metrics_response(self) -> Dict[str, Any]:
         """Return response when no metrics available"""
@@ -290,3 +558,34 @@ class SignalPerformanceService:
             "error": "Unable to retrieve performance metrics",
             "timestamp": datetime.now().isoformat()
         }
+
+
+def _first_close_on_or_after(closes: Optional[pd.Series], dates: np.ndarray) -> np.ndarray:
+    """First non-NaN close on or after each date (NaN if there is none yet)"""
+    if closes is None:
+        return np.full(len(dates), np.nan)
+    closes = closes.dropna()
+    positions = closes.index.searchsorted(dates, side='left')
+    values = np.append(closes.to_numpy(dtype=float), np.nan)
+    return values[positions]
+
+
+def _combine(groups: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum grouped statistics"""
+    totals = {
+        "count": 0, "profitable": 0, "return_sum": 0.0, "benchmark_sum": 0.0,
+        "excess_sum": 0.0, "outperformed": 0, "underperformed": 0,
+    }
+    for group in groups:
+        for name in totals:
+            totals[name] += group[name] or 0
+    return totals
+
+
+def _summary(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """count / win_rate / avg_return of combined statistics"""
+    return {
+        "count": stats["count"],
+        "win_rate": round(stats["profitable"] / stats["count"] * 100, 2),
+        "avg_return": round(stats["return_sum"] / stats["count"], 2)
+    }
@@ -0,0 +1,175 @@
+"""
+Streaming Statistics
+
+Constant-time building blocks for incremental (per-bar) analytics:
+rolling/expanding mean and variance (Welford), sliding-window extrema and
+rolling pairwise correlation.
+"""
+import math
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+
+class RollingStats:
+    """
+    Welford mean/variance over a sliding window, or over all values if window is None.
+
+    push() is O(1): the value leaving the window is removed with the inverse
+    Welford update instead of re-scanning the window.
+    """
+
+    def __init__(self, window: Optional[int] = None):
+        self.window = window
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._values: Deque[float] = deque()
+
+    def push(self, value: float) -> None:
+        """Add a value, evicting the oldest one once the window is full"""
+        if self.window is not None:
+            if len(self._values) == self.window:
+                self._remove(self._values.popleft())
+            self._values.append(value)
+        self._add(value)
+
+    def variance(self, ddof: int = 1) -> float:
+        """Variance of the values in the window (NaN if not enough values)"""
+        if self.count - ddof <= 0:
+            return float('nan')
+        return max(self._m2, 0.0) / (self.count - ddof)
+
+    def std(self, ddof: int = 1) -> float:
+        """Standard deviation of the values in the window"""
+        return math.sqrt(self.variance(ddof))
+
+    def zscore(self, value: float, ddof: int = 0) -> float:
+        """Z-score of a value against the current window (0 if std is 0 or undefined)"""
+        std = self.std(ddof)
+        if not std or math.isnan(std):
+            return 0.0
+        return (value - self.mean) / std
+
+    def copy(self) -> "RollingStats":
+        """Independent copy (O(window))"""
+        clone = RollingStats(self.window)
+        clone.count, clone.mean, clone._m2 = self.count, self.mean, self._m2
+        clone._values = deque(self._values)
+        return clone
+
+    def _add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def _remove(self, value: float) -> None:
+        if self.count <= 1:
+            self.count, self.mean, self._m2 = 0, 0.0, 0.0
+            return
+        old_mean = self.mean
+        self.count -= 1
+        self.mean = (old_mean * (self.count + 1) - value) / self.count
+        self._m2 -= (value - old_mean) * (value - self.mean)
+
+
+class RollingExtrema:
+    """
+    Sliding-window maximum and minimum using monotonic deques.
+
+    Each value enters and leaves each deque at most once, so push() is
+    amortized O(1) and max/min are O(1).
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._index = 0
+        self._max: Deque[Tuple[int, float]] = deque()
+        self._min: Deque[Tuple[int, float]] = deque()
+
+    def push(self, value: float) -> None:
+        """Add a value and drop values that left the window"""
+        i = self._index
+        self._index += 1
+
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((i, value))
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((i, value))
+
+        oldest = i - self.window
+        while self._max[0][0] <= oldest:
+            self._max.popleft()
+        while self._min[0][0] <= oldest:
+            self._min.popleft()
+
+    @property
+    def max(self) -> float:
+        return self._max[0][1] if self._max else float('nan')
+
+    @property
+    def min(self) -> float:
+        return self._min[0][1] if self._min else float('nan')
+
+    def copy(self) -> "RollingExtrema":
+        """Independent copy (O(window))"""
+        clone = RollingExtrema(self.window)
+        clone._index = self._index
+        clone._max = deque(self._max)
+        clone._min = deque(self._min)
+        return clone
+
+
+class RollingCorrelation:
+    """
+    Pearson correlation of (x, y) pairs over a sliding window.
+
+    Keeps running sums of x, y, x², y² and xy, so push() is O(1).
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._pairs: Deque[Tuple[float, float]] = deque()
+        self._sx = self._sy = self._sxx = self._syy = self._sxy = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self._pairs)
+
+    def push(self, x: float, y: float) -> None:
+        """Add a pair, evicting the oldest one once the window is full"""
+        if len(self._pairs) == self.window:
+            old_x, old_y = self._pairs.popleft()
+            self._update(old_x, old_y, -1.0)
+        self._pairs.append((x, y))
+        self._update(x, y, 1.0)
+
+    def correlation(self, min_count: int = 3) -> float:
+        """Correlation of the pairs in the window (NaN if fewer than min_count or constant)"""
+        n = len(self._pairs)
+        if n < max(min_count, 2):
+            return float('nan')
+        cov = self._sxy - self._sx * self._sy / n
+        var_x = self._sxx - self._sx * self._sx / n
+        var_y = self._syy - self._sy * self._sy / n
+        if var_x <= 0 or var_y <= 0:
+            return float('nan')
+        return max(-1.0, min(1.0, cov / math.sqrt(var_x * var_y)))
+
+    def copy(self) -> "RollingCorrelation":
+        """Independent copy (O(window))"""
+        clone = RollingCorrelation(self.window)
+        clone._pairs = deque(self._pairs)
+        clone._sx, clone._sy, clone._sxx, clone._syy, clone._sxy = (
+            self._sx, self._sy, self._sxx, self._syy, self._sxy
+        )
+        return clone
+
+    def _update(self, x: float, y: float, sign: float) -> None:
+        self._sx += sign * x
+        self._sy += sign * y
+        self._sxx += sign * x * x
+        self._syy += sign * y * y
+        self._sxy += sign * x * y
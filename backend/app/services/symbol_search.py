@@ -0,0 +1,282 @@
+"""
+Symbol Search
+
+Answers symbol searches from the symbol_master table through an in-memory
+index:
+- symbols: sorted list, prefix matches by binary search
+- names: sorted list of name words, word-prefix matches by binary search
+- names: trigram postings for typos and infix matches
+
+Yahoo's search API is called for queries the index cannot fully answer
+(fewer than limit matches); its results are stored in symbol_master and
+added to the index, and queries answered upstream are not sent again within
+REMOTE_QUERY_TTL seconds.
+"""
+import re
+import time
+import asyncio
+import logging
+import threading
+import requests
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..models.market import SymbolMaster
+
+logger = logging.getLogger(__name__)
+
+YAHOO_SEARCH_URL = "https://query2.finance.yahoo.com/v1/finance/search"
+REMOTE_TIMEOUT = 5  # Seconds
+REMOTE_QUERY_TTL = 24 * 60 * 60
+REMOTE_QUOTES_COUNT = 10
+
+# Share of a query's trigrams a name must contain to match
+TRIGRAM_MIN_OVERLAP = 0.6
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SymbolIndex:
+    """In-memory prefix and trigram index over symbol_master rows"""
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._symbols: List[str] = []
+        self._words: List[Tuple[str, str]] = []  # (word, symbol)
+        self._trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Add or replace entries (dicts with symbol, name, exchange)"""
+        with self._lock:
+            for entry in entries:
+                symbol = entry["symbol"].upper()
+                previous = self._entries.get(symbol)
+                if previous is not None:
+                    self._remove_name(symbol, previous.get("name") or "")
+                else:
+                    insort(self._symbols, symbol)
+                self._entries[symbol] = {
+                    "symbol": symbol,
+                    "name": entry.get("name") or "",
+                    "exchange": entry.get("exchange") or "",
+                }
+                self._add_name(symbol, entry.get("name") or "")
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Rank matches: exact symbol, symbol prefix, name word prefix; name
+        trigrams if none of these matched.
+
+        Within a group shorter symbols come first.
+        """
+        upper = query.strip().upper()
+        lower = query.strip().lower()
+        if not upper:
+            return []
+
+        ranked: Dict[str, Tuple[int, float, int]] = {}
+
+        def rank(symbol: str, group: int, score: float = 0.0) -> None:
+            key = (group, -score, len(symbol))
+            if symbol not in ranked or key < ranked[symbol]:
+                ranked[symbol] = key
+
+        with self._lock:
+            if upper in self._entries:
+                rank(upper, 0)
+
+            for symbol in self._prefix(self._symbols, upper, limit * 20):
+                rank(symbol, 1)
+
+            words = _WORD.findall(lower)
+            if words:
+                matches = None
+                for word in words:
+                    found = {symbol for _, symbol in self._word_prefix(word, limit * 20)}
+                    matches = found if matches is None else matches & found
+                for symbol in matches or ():
+                    rank(symbol, 2)
+
+            # Typos and infix matches: only when nothing matched a prefix
+            if not ranked and len(lower) >= 3:
+                grams = _trigrams(lower)
+                counts: Dict[str, int] = defaultdict(int)
+                for gram in grams:
+                    for symbol in self._trigrams.get(gram, ()):
+                        counts[symbol] += 1
+                needed = TRIGRAM_MIN_OVERLAP * len(grams)
+                for symbol, count in counts.items():
+                    if count >= needed:
+                        rank(symbol, 3, count / len(grams))
+
+            best = sorted(ranked, key=ranked.get)[:limit]
+            return [dict(self._entries[symbol]) for symbol in best]
+
+    def _add_name(self, symbol: str, name: str) -> None:
+        name = name.lower()
+        for word in set(_WORD.findall(name)):
+            insort(self._words, (word, symbol))
+        for gram in _trigrams(name) if name else ():
+            self._trigrams[gram].add(symbol)
+
+    def _remove_name(self, symbol: str, name: str) -> None:
+        name = name.lower()
+        for word in set(_WORD.findall(name)):
+            position = bisect_left(self._words, (word, symbol))
+            if position < len(self._words) and self._words[position] == (word, symbol):
+                del self._words[position]
+        for gram in _trigrams(name) if name else ():
+            self._trigrams[gram].discard(symbol)
+
+    @staticmethod
+    def _prefix(values: List[str], prefix: str, limit: int) -> List[str]:
+        start = bisect_left(values, prefix)
+        result = []
+        for value in values[start:start + limit]:
+            if not value.startswith(prefix):
+                break
+            result.append(value)
+        return result
+
+    def _word_prefix(self, prefix: str, limit: int) -> List[Tuple[str, str]]:
+        start = bisect_left(self._words, (prefix, ""))
+        result = []
+        for word, symbol in self._words[start:start + limit]:
+            if not word.startswith(prefix):
+                break
+            result.append((word, symbol))
+        return result
+
+
+class SymbolSearchService:
+    """
+    Local-first symbol search.
+
+    The index is loaded from symbol_master on first use; remote results are
+    persisted, so the index survives restarts.
+    """
+
+    def __init__(self):
+        self.index = SymbolIndex()
+        self._loaded = False
+        self._remote_queries: Dict[str, float] = {}
+        self.logger = logger
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Load symbol_master into the index (once)"""
+        if self._loaded:
+            return
+        rows = db.query(SymbolMaster.symbol, SymbolMaster.name, SymbolMaster.exchange).all()
+        self.index.add({"symbol": r.symbol, "name": r.name, "exchange": r.exchange} for r in rows)
+        self._loaded = True
+        self.logger.info(f"Symbol index loaded with {len(self.index)} symbols")
+
+    async def search(self, db: Session, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search symbols and company names.
+
+        Args:
+            db: Database session
+            query: Symbol or name fragment
+            limit: Maximum number of results
+
+        Returns:
+            List of dicts with symbol, name and exchange
+        """
+        # The first load scans symbol_master; loading and storing run in a worker thread
+        await asyncio.to_thread(self.ensure_loaded, db)
+        results = self.index.search(query, limit)
+        if len(results) >= limit or not self._should_query_remote(query):
+            return results
+
+        quotes = await asyncio.to_thread(self.fetch_remote, query)
+        if quotes:
+            await asyncio.to_thread(self.store, db, quotes)
+            # Upstream also matches on fields the index does not know
+            results = self.index.search(query, limit) or [
+                {"symbol": q["symbol"], "name": q["name"], "exchange": q["exchange"]} for q in quotes[:limit]
+            ]
+        return results
+
+    def refresh(self, db: Session, queries: Iterable[str]) -> int:
+        """Fetch queries from the remote API and store the results; returns the number of symbols stored"""
+        self.ensure_loaded(db)
+        stored = 0
+        for query in queries:
+            quotes = self.fetch_remote(query)
+            if quotes:
+                self.store(db, quotes)
+                stored += len(quotes)
+        return stored
+
+    def fetch_remote(self, query: str) -> List[Dict[str, Any]]:
+        """Query Yahoo's search API (blocking); only answered queries are recorded"""
+        try:
+            response = requests.get(
+                YAHOO_SEARCH_URL,
+                params={'q': query, 'quotesCount': REMOTE_QUOTES_COUNT, 'newsCount': 0},
+                headers={'User-Agent': 'Mozilla/5.0'},
+                timeout=REMOTE_TIMEOUT,
+            )
+            if response.status_code != 200:
+                self.logger.warning(f"Symbol search for '{query}' returned HTTP {response.status_code}")
+                return []
+            quotes = response.json().get('quotes', [])
+        except Exception as e:
+            self.logger.error(f"Search error: {str(e)}")
+            return []
+
+        now = time.time()
+        if len(self._remote_queries) > 10000:
+            self._remote_queries = {q: t for q, t in self._remote_queries.items() if now - t <= REMOTE_QUERY_TTL}
+        self._remote_queries[query.strip().lower()] = now
+
+        return [{
+            'symbol': quote['symbol'].upper(),
+            'name': quote.get('shortname') or quote.get('longname') or '',
+            'exchange': quote.get('exchange', ''),
+            'quote_type': quote.get('quoteType'),
+        } for quote in quotes if quote.get('symbol')]
+
+    def store(self, db: Session, quotes: List[Dict[str, Any]]) -> None:
+        """Upsert symbols into symbol_master and the index"""
+        quotes = list({quote["symbol"]: quote for quote in quotes}.values())
+        dialect_insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        statement = dialect_insert(SymbolMaster).values(quotes)
+        statement = statement.on_conflict_do_update(
+            index_elements=[SymbolMaster.symbol],
+            set_={
+                "name": statement.excluded.name,
+                "exchange": statement.excluded.exchange,
+                "quote_type": statement.excluded.quote_type,
+            },
+        )
+        try:
+            db.execute(statement)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self.logger.error(f"Could not store {len(quotes)} symbols: {e}")
+        self.index.add(quotes)
+
+    def _should_query_remote(self, query: str) -> bool:
+        fetched_at = self._remote_queries.get(query.strip().lower())
+        return fetched_at is None or time.time() - fetched_at > REMOTE_QUERY_TTL
+
+
+# Global search service instance
+symbol_search = SymbolSearchService()
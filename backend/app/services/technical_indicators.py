@@ -8,6 +8,8 @@ import pandas as pd
 import logging
 from typing import Dict, Optional
 
+from .market_data import series_to_timestamp_map
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,22 +55,14 @@ def calculate_technical_indicators(hist: pd.DataFrame) -> Dict[str, Dict]:
         current['sma_20'] = safe_float(sma_20.iloc[-1])
         # Historical SMA20 for charting - convert timestamps to Unix timestamps
         sma_20_series = sma_20.dropna()
-        historical['sma_20'] = {
-            int(ts.timestamp()): val
-            for ts, val in ((ts, safe_float(val)) for ts, val in sma_20_series.items())
-            if val is not None
-        }
+        historical['sma_20'] = series_to_timestamp_map(sma_20_series)
 
     if len(hist) >= 50:
         sma_50 = close.rolling(window=50).mean()
         current['sma_50'] = safe_float(sma_50.iloc[-1])
         # Historical SMA50 for charting
         sma_50_series = sma_50.dropna()
-        historical['sma_50'] = {
-            int(ts.timestamp()): val
-            for ts, val in ((ts, safe_float(val)) for ts, val in sma_50_series.items())
-            if val is not None
-        }
+        historical['sma_50'] = series_to_timestamp_map(sma_50_series)
 
     if len(hist) >= 200:
         sma_200 = close.rolling(window=200).mean().iloc[-1]
@@ -170,21 +164,9 @@ def calculate_technical_indicators(hist: pd.DataFrame) -> Dict[str, Dict]:
             bb_lower_series = bb_lower.dropna()
             bb_middle_series = bb_middle.dropna()
 
-            historical['bb_upper'] = {
-                int(ts.timestamp()): val
-                for ts, val in ((ts, safe_float(val)) for ts, val in bb_upper_series.items())
-                if val is not None
-            }
-            historical['bb_lower'] = {
-                int(ts.timestamp()): val
-                for ts, val in ((ts, safe_float(val)) for ts, val in bb_lower_series.items())
-                if val is not None
-            }
-            historical['bb_middle'] = {
-                int(ts.timestamp()): val
-                for ts, val in ((ts, safe_float(val)) for ts, val in bb_middle_series.items())
-                if val is not None
-            }
+            historical['bb_upper'] = series_to_timestamp_map(bb_upper_series)
+            historical['bb_lower'] = series_to_timestamp_map(bb_lower_series)
+            historical['bb_middle'] = series_to_timestamp_map(bb_middle_series)
 
     # ATR (Average True Range)
     if len(hist) >= 14:
@@ -291,3 +273,110 @@ def calculate_support_resistance(high: pd.Series, low: pd.Series, close: pd.Seri
         'recent_high': safe_float(recent_high),
         'recent_low': safe_float(recent_low)
     }
+
+
+def calculate_indicator_series(hist: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate the technical indicators for every bar of the history at once.
+
+    Mirrors the keys and look-back requirements of calculate_technical_indicators,
+    but returns full columns instead of only the latest value. Indicators that
+    need more history than available are returned as all-NaN columns.
+
+    Args:
+        hist: Historical OHLCV data from yfinance
+
+    Returns:
+        DataFrame indexed like hist with one column per indicator
+    """
+    close = hist['Close']
+    high = hist['High']
+    low = hist['Low']
+    volume = hist['Volume'] if 'Volume' in hist.columns else None
+    n = len(hist)
+    series = pd.DataFrame(index=hist.index)
+
+    def _column(values: pd.Series, min_length: int) -> pd.Series:
+        if n < min_length:
+            return pd.Series(np.nan, index=hist.index)
+        return values.replace([np.inf, -np.inf], np.nan)
+
+    # === MOVING AVERAGES ===
+    series['sma_20'] = _column(close.rolling(window=20).mean(), 20)
+    series['sma_50'] = _column(close.rolling(window=50).mean(), 50)
+    series['sma_200'] = _column(close.rolling(window=200).mean(), 200)
+    series['ema_12'] = _column(close.ewm(span=12, adjust=False).mean(), 12)
+    series['ema_26'] = _column(close.ewm(span=26, adjust=False).mean(), 26)
+
+    # === MOMENTUM INDICATORS ===
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+    loss = -delta.where(delta < 0, 0).rolling(window=14).mean()
+    series['rsi'] = _column(100 - (100 / (1 + gain / loss)), 14)
+
+    lowest_low = low.rolling(window=14).min()
+    highest_high = high.rolling(window=14).max()
+    k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
+    series['stoch_k'] = _column(k_percent, 14)
+    series['stoch_d'] = _column(k_percent.rolling(window=3).mean(), 14)
+    series['williams_r'] = _column(-100 * ((highest_high - close) / (highest_high - lowest_low)), 14)
+
+    typical_price = (high + low + close) / 3
+    sma_tp = typical_price.rolling(window=20).mean()
+    mad = typical_price.rolling(window=20).apply(lambda x: np.mean(np.abs(x - x.mean())), raw=True)
+    series['cci'] = _column((typical_price - sma_tp) / (0.015 * mad), 20)
+
+    # === TREND INDICATORS ===
+    exp12 = close.ewm(span=12, adjust=False).mean()
+    exp26 = close.ewm(span=26, adjust=False).mean()
+    macd = exp12 - exp26
+    signal = macd.ewm(span=9, adjust=False).mean()
+    series['macd'] = _column(macd, 26)
+    series['macd_signal'] = _column(signal, 26)
+    series['macd_histogram'] = _column(macd - signal, 26)
+
+    high_diff = high.diff()
+    low_diff = low.diff()
+    plus_dm = high_diff.where((high_diff > low_diff) & (high_diff > 0), 0)
+    minus_dm = -low_diff.where((low_diff > high_diff) & (low_diff > 0), 0)
+    atr = calculate_atr(high, low, close, 14)
+    plus_di = 100 * (plus_dm.rolling(window=14).mean() / atr)
+    minus_di = 100 * (minus_dm.rolling(window=14).mean() / atr)
+    dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    series['adx'] = _column(dx.rolling(window=14).mean(), 14)
+    series['plus_di'] = _column(plus_di, 14)
+    series['minus_di'] = _column(minus_di, 14)
+
+    # === VOLATILITY INDICATORS ===
+    sma = close.rolling(window=20).mean()
+    std = close.rolling(window=20).std()
+    bb_upper = sma + (std * 2)
+    bb_lower = sma - (std * 2)
+    series['bb_upper'] = _column(bb_upper, 20)
+    series['bb_lower'] = _column(bb_lower, 20)
+    series['bb_middle'] = _column(sma, 20)
+    series['bb_width'] = _column((bb_upper - bb_lower) / sma, 20)
+    series['bb_percent'] = _column((close - bb_lower) / (bb_upper - bb_lower), 20)
+    series['atr'] = _column(atr, 14)
+
+    # === VOLUME INDICATORS ===
+    if volume is not None:
+        direction = np.sign(close.diff().fillna(0))
+        obv = (direction * volume).cumsum() + (volume.iloc[0] if n > 0 else 0)
+        series['obv'] = _column(obv, 20)
+        series['vroc'] = _column(((volume - volume.shift(12)) / volume.shift(12)) * 100, 20)
+        series['ad_line'] = _column(calculate_ad_line(high, low, close, volume), 20)
+
+    # === SUPPORT/RESISTANCE ===
+    recent_high = high.rolling(window=20).max()
+    recent_low = low.rolling(window=20).min()
+    pivot = (recent_high + recent_low + close) / 3
+    series['support_1'] = _column(2 * pivot - recent_high, 20)
+    series['support_2'] = _column(pivot - (recent_high - recent_low), 20)
+    series['resistance_1'] = _column(2 * pivot - recent_low, 20)
+    series['resistance_2'] = _column(pivot + (recent_high - recent_low), 20)
+    series['pivot_point'] = _column(pivot, 20)
+    series['recent_high'] = _column(recent_high, 20)
+    series['recent_low'] = _column(recent_low, 20)
+
+    return series
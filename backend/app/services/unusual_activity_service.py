@@ -7,12 +7,17 @@ Detects unusual market activity that may indicate institutional moves:
 - Dark pool activity (Phase 2)
 - Price anomalies
 """
+import json
 import logging
-import numpy as np
+import pandas as pd
 from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 
+from ..models.investment_engine import UnusualActivity
+from .activity_detector import activity_detector
+from .volume_profile import apply_profile, volume_profiles
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +25,9 @@ class UnusualActivityService:
     """
     Detects unusual market activity using statistical analysis.
     Flags activity that deviates significantly from normal patterns.
+
+    Baselines are rolling windows kept per symbol by the streaming
+    activity_detector; detections are persisted to unusual_activity.
     """
 
     # Thresholds for detection
@@ -27,179 +35,268 @@ class UnusualActivityService:
     PRICE_ANOMALY_THRESHOLD = 2.5  # 2.5x standard deviations
     MIN_HISTORY_DAYS = 30  # Minimum days for baseline calculation
 
+    ACTIVITY_TYPES = ("VOLUME_SPIKE", "PRICE_ANOMALY")
+
     def __init__(self, db: Session):
         self.db = db
         self.logger = logger
-        self.cache = {}
-        self.cache_duration = timedelta(minutes=1)  # Real-time, short cache
 
     async def detect_unusual_activity(
         self,
         symbol: str,
-        market_data: List[Dict[str, Any]],
-        current_price: Optional[float] = None
+        hist: pd.DataFrame,
+        current_price: Optional[float] = None,
+        timeframe: str = "3M",
+        persist: bool = True
     ) -> Dict[str, Any]:
         """
         Detect unusual activity for a symbol.
 
         Args:
             symbol: Stock symbol
-            market_data: Historical OHLCV data
+            hist: Historical OHLCV data
             current_price: Current price (optional, defaults to last close)
+            timeframe: Timeframe of hist (part of the baseline state key)
+            persist: Store detections in the unusual_activity table
 
         Returns:
             Dict with detected activities and severity levels
         """
         try:
-            if not market_data or len(market_data) < self.MIN_HISTORY_DAYS:
+            if hist is None or len(hist) < self.MIN_HISTORY_DAYS:
                 return self._get_insufficient_data_response(symbol)
 
-            # Check cache (very short cache for real-time data)
-            cache_key = f"activity_{symbol}"
-            if cache_key in self.cache:
-                cached = self.cache[cache_key]
-                if datetime.now() - cached['timestamp'] < self.cache_duration:
-                    return cached['data']
-
-            # Analyze data
-            activities = []
-
-            # Volume spike detection
-            volume_activity = self._detect_volume_spike(market_data)
-            if volume_activity:
-                activities.append(volume_activity)
-
-            # Price anomaly detection
-            price_activity = self._detect_price_anomaly(market_data, current_price)
-            if price_activity:
-                activities.append(price_activity)
-
-            # Build response
-            has_activity = len(activities) > 0
-
-            response = {
-                "symbol": symbol,
-                "has_unusual_activity": has_activity,
-                "activities": activities,
-                "overall_severity": self._calculate_overall_severity(activities),
-                "timestamp": datetime.now().isoformat()
-            }
-
-            # Cache response
-            self.cache[cache_key] = {
-                'data': response,
-                'timestamp': datetime.now()
-            }
-
-            return response
+            evaluation = activity_detector.evaluate_history(f"{symbol}:{timeframe}", hist, current_price)
+            if volume_profiles.supports(timeframe):
+                # Intraday: compare volume with the same time of day on previous sessions
+                profile = volume_profiles.get_profile(symbol, timeframe, hist.index[-1].date())
+                evaluation = apply_profile(evaluation, profile)
+            return self.process_evaluation(symbol, evaluation, timeframe=timeframe, persist=persist)
 
         except Exception as e:
             self.logger.error(f"Error detecting unusual activity: {e}")
             return self._get_error_response(symbol)
 
-    def _detect_volume_spike(self, market_data: List[Dict]) -> Optional[Dict[str, Any]]:
-        """Detect unusual volume spikes"""
-        try:
-            # Extract volumes
-            volumes = [data.get('volume', 0) for data in market_data]
-            volumes = [v for v in volumes if v > 0]
+    def process_evaluation(
+        self,
+        symbol: str,
+        evaluation: Dict[str, Any],
+        timeframe: str = "3M",
+        persist: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Turn a detector evaluation into the activity response and persist it.
 
-            if len(volumes) < self.MIN_HISTORY_DAYS:
-                return None
+        Args:
+            symbol: Stock symbol
+            evaluation: ActivityDetector evaluation of the latest bar
+            timeframe: Timeframe of the evaluated bars
+            persist: Store detections in the unusual_activity table
 
-            # Calculate statistics
-            mean_volume = np.mean(volumes[:-1])  # Exclude current (last) volume
-            std_volume = np.std(volumes[:-1])
-            current_volume = volumes[-1]
+        Returns:
+            Dict with detected activities and severity levels
+        """
+        activities = []
 
-            # Check for spike
-            if std_volume > 0:
-                z_score = (current_volume - mean_volume) / std_volume
-            else:
-                z_score = 0
-
-            if z_score >= self.VOLUME_SPIKE_THRESHOLD:
-                # Calculate severity
-                ratio = current_volume / mean_volume if mean_volume > 0 else 1
-
-                return {
-                    "type": "VOLUME_SPIKE",
-                    "severity": self._get_severity_level(z_score, threshold=self.VOLUME_SPIKE_THRESHOLD),
-                    "confidence": min(100, int(z_score * 20)),
-                    "details": {
-                        "current_volume": int(current_volume),
-                        "average_volume": int(mean_volume),
-                        "ratio": round(ratio, 2),
-                        "z_score": round(z_score, 2),
-                        "deviation": f"{z_score:.1f}σ from mean"
-                    },
-                    "price_at_detection": market_data[-1].get('close'),
-                    "timestamp": market_data[-1].get('timestamp'),
-                    "interpretation": self._interpret_volume_spike(ratio, market_data)
-                }
+        # Volume spike detection
+        volume_activity = self._detect_volume_spike(evaluation)
+        if volume_activity:
+            activities.append(volume_activity)
+
+        # Price anomaly detection
+        price_activity = self._detect_price_anomaly(evaluation)
+        if price_activity:
+            activities.append(price_activity)
+
+        if persist:
+            self.persist_activities(symbol, activities, evaluation, timeframe)
+
+        return {
+            "symbol": symbol,
+            "has_unusual_activity": len(activities) > 0,
+            "activities": activities,
+            "overall_severity": self._calculate_overall_severity(activities),
+            "timestamp": datetime.now().isoformat()
+        }
 
+    def get_active_activities(self, symbols: Optional[List[str]] = None, limit: int = 100) -> List[UnusualActivity]:
+        """Active (unresolved) detections, newest first"""
+        query = self.db.query(UnusualActivity).filter(UnusualActivity.is_active == True)
+        if symbols:
+            query = query.filter(UnusualActivity.symbol.in_(symbols))
+        return query.order_by(UnusualActivity.timestamp.desc()).limit(limit).all()
+
+    def _detect_volume_spike(self, evaluation: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Detect unusual volume spikes"""
+        time_of_day = evaluation.get("volume_baseline") == "time_of_day"
+        if not time_of_day and evaluation["volume_count"] < self.MIN_HISTORY_DAYS - 1:
             return None
 
-        except Exception as e:
-            self.logger.error(f"Error detecting volume spike: {e}")
+        z_score = evaluation["volume_z_score"]
+        if z_score < self.VOLUME_SPIKE_THRESHOLD:
             return None
 
-    def _detect_price_anomaly(
-        self,
-        market_data: List[Dict],
-        current_price: Optional[float] = None
-    ) -> Optional[Dict[str, Any]]:
+        current_volume = evaluation["current_volume"]
+        mean_volume = evaluation["average_volume"]
+        ratio = current_volume / mean_volume if mean_volume > 0 else 1
+
+        return {
+            "type": "VOLUME_SPIKE",
+            "severity": self._get_severity_level(z_score, threshold=self.VOLUME_SPIKE_THRESHOLD),
+            "confidence": min(100, int(z_score * 20)),
+            "details": {
+                "current_volume": int(current_volume),
+                "average_volume": int(mean_volume),
+                "ratio": round(ratio, 2),
+                "z_score": round(z_score, 2),
+                "deviation": f"{z_score:.1f}σ from mean",
+                "baseline": "time_of_day" if time_of_day else "rolling"
+            },
+            "price_at_detection": evaluation["current_price"],
+            "timestamp": _isoformat(evaluation["timestamp"]),
+            "interpretation": self._interpret_volume_spike(ratio, self._daily_change(evaluation))
+        }
+
+    def _detect_price_anomaly(self, evaluation: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Detect unusual price movements"""
-        try:
-            # Use provided current price or last close
-            if current_price is None:
-                current_price = market_data[-1].get('close', 0)
-
-            if current_price == 0:
-                return None
-
-            # Calculate price changes
-            closes = [data.get('close', 0) for data in market_data[:-1]]
-            closes = [c for c in closes if c > 0]
-
-            if len(closes) < self.MIN_HISTORY_DAYS:
-                return None
-
-            # Calculate statistics
-            mean_price = np.mean(closes)
-            std_price = np.std(closes)
-
-            if std_price == 0:
-                return None
-
-            # Check for anomaly
-            z_score = abs(current_price - mean_price) / std_price
-
-            if z_score >= self.PRICE_ANOMALY_THRESHOLD:
-                # Calculate daily change
-                prev_close = closes[-1]
-                daily_change = ((current_price - prev_close) / prev_close) * 100 if prev_close > 0 else 0
-
-                return {
-                    "type": "PRICE_ANOMALY",
-                    "severity": self._get_severity_level(z_score, threshold=self.PRICE_ANOMALY_THRESHOLD),
-                    "confidence": min(100, int(z_score * 20)),
-                    "details": {
-                        "current_price": round(current_price, 2),
-                        "average_price": round(mean_price, 2),
-                        "daily_change_percent": round(daily_change, 2),
-                        "z_score": round(z_score, 2),
-                        "deviation": f"{z_score:.1f}σ from mean"
-                    },
-                    "timestamp": market_data[-1].get('timestamp'),
-                    "interpretation": self._interpret_price_anomaly(daily_change, z_score)
-                }
+        current_price = evaluation["current_price"]
+        if not current_price or evaluation["price_count"] < self.MIN_HISTORY_DAYS:
+            return None
 
+        z_score = evaluation["price_z_score"]
+        if z_score < self.PRICE_ANOMALY_THRESHOLD:
             return None
 
+        daily_change = self._daily_change(evaluation)
+
+        return {
+            "type": "PRICE_ANOMALY",
+            "severity": self._get_severity_level(z_score, threshold=self.PRICE_ANOMALY_THRESHOLD),
+            "confidence": min(100, int(z_score * 20)),
+            "details": {
+                "current_price": round(current_price, 2),
+                "average_price": round(evaluation["average_price"], 2),
+                "daily_change_percent": round(daily_change, 2),
+                "z_score": round(z_score, 2),
+                "deviation": f"{z_score:.1f}σ from mean"
+            },
+            "price_at_detection": current_price,
+            "timestamp": _isoformat(evaluation["timestamp"]),
+            "interpretation": self._interpret_price_anomaly(daily_change, z_score)
+        }
+
+    @staticmethod
+    def _daily_change(evaluation: Dict[str, Any]) -> float:
+        prev_close = evaluation.get("previous_close")
+        current_price = evaluation["current_price"]
+        return ((current_price - prev_close) / prev_close) * 100 if prev_close else 0
+
+    def persist_activities(
+        self,
+        symbol: str,
+        activities: List[Dict],
+        evaluation: Dict[str, Any],
+        timeframe: str,
+        commit: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Store new detections and resolve active ones that no longer trigger.
+
+        A detection is stored once per bar and activity type; a repeated
+        detection of the same bar updates its row, and a detection on a new
+        bar resolves the previous active row of that type. At most one row
+        per symbol, timeframe and type is active, so on-demand checks on other
+        timeframes do not resolve the scanner's detections.
+
+        Args:
+            symbol: Stock symbol
+            activities: Detected activities of the evaluated bar
+            evaluation: ActivityDetector evaluation of the bar
+            timeframe: Timeframe of the evaluated bars
+            commit: Commit the session (False lets callers batch many symbols;
+                the writes of each call are a savepoint)
+
+        Returns:
+            The activities that were newly stored (empty if storing failed)
+        """
+        symbol = symbol.upper()
+        stored = []
+        try:
+            # A failing symbol only rolls back its own savepoint, not the caller's batch
+            with self.db.begin_nested():
+                bar_timestamp = _isoformat(evaluation["timestamp"])
+                detected = {activity["type"]: activity for activity in activities}
+                now = datetime.now(timezone.utc)
+
+                resolved = [t for t in self.ACTIVITY_TYPES if t not in detected]
+                if resolved:
+                    self.db.query(UnusualActivity).filter(
+                        UnusualActivity.symbol == symbol,
+                        UnusualActivity.timeframe == timeframe,
+                        UnusualActivity.activity_type.in_(resolved),
+                        UnusualActivity.is_active == True
+                    ).update({"is_active": False, "resolved_at": now}, synchronize_session=False)
+
+                if detected:
+                    last = self.db.query(UnusualActivity).filter(
+                        UnusualActivity.symbol == symbol
+                    ).order_by(UnusualActivity.timestamp.desc()).first()
+                    active = {
+                        row.activity_type: row for row in self.db.query(UnusualActivity).filter(
+                            UnusualActivity.symbol == symbol,
+                            UnusualActivity.timeframe == timeframe,
+                            UnusualActivity.activity_type.in_(list(detected)),
+                            UnusualActivity.is_active == True
+                        )
+                    }
+
+                    for activity_type, activity in detected.items():
+                        details = json.dumps({**activity["details"], "bar_timestamp": bar_timestamp})
+                        row = active.get(activity_type)
+                        if row is not None:
+                            if json.loads(row.details or "{}").get("bar_timestamp") == bar_timestamp:
+                                # Already stored for this bar: keep the latest values
+                                row.severity = activity["severity"]
+                                row.confidence = activity["confidence"]
+                                row.details = details
+                                row.price_at_detection = activity.get("price_at_detection")
+                                row.volume_at_detection = evaluation.get("current_volume")
+                                row.benchmark_deviation = activity["details"].get("z_score")
+                                continue
+                            row.is_active = False
+                            row.resolved_at = now
+
+                        last_time = last.timestamp if last is not None else None
+                        if last_time is not None and last_time.tzinfo is None:
+                            last_time = last_time.replace(tzinfo=timezone.utc)
+
+                        self.db.add(UnusualActivity(
+                            symbol=symbol,
+                            timestamp=now,
+                            activity_type=activity_type,
+                            timeframe=timeframe,
+                            severity=activity["severity"],
+                            confidence=activity["confidence"],
+                            details=details,
+                            price_at_detection=activity.get("price_at_detection"),
+                            volume_at_detection=evaluation.get("current_volume"),
+                            benchmark_deviation=activity["details"].get("z_score"),
+                            hours_since_last_activity=(
+                                int((now - last_time).total_seconds() // 3600) if last_time is not None else None
+                            ),
+                            is_active=True
+                        ))
+                        stored.append(activity)
+
+            if commit:
+                self.db.commit()
         except Exception as e:
-            self.logger.error(f"Error detecting price anomaly: {e}")
-            return None
+            if commit:
+                self.db.rollback()
+            self.logger.warning(f"Could not persist unusual activity for {symbol}: {e}")
+            return []
+
+        return stored
 
     def _get_severity_level(self, z_score: float, threshold: float) -> str:
         """Determine severity level based on z-score"""
@@ -212,14 +309,8 @@ class UnusualActivityService:
         else:
             return "LOW"
 
-    def _interpret_volume_spike(self, ratio: float, market_data: List[Dict]) -> str:
+    def _interpret_volume_spike(self, ratio: float, price_change: float) -> str:
         """Generate human-readable interpretation of volume spike"""
-        # Check price movement with volume
-        current_close = market_data[-1].get('close', 0)
-        prev_close = market_data[-2].get('close', 0) if len(market_data) > 1 else current_close
-
-        price_change = ((current_close - prev_close) / prev_close) * 100 if prev_close > 0 else 0
-
         if ratio >= 5:
             if price_change > 2:
                 return "Massive volume spike with strong upward price movement - possible breakout or institutional accumulation"
@@ -297,3 +388,7 @@ class UnusualActivityService:
             "timestamp": datetime.now().isoformat(),
             "error": "Unusual activity detection temporarily unavailable"
         }
+
+
+def _isoformat(timestamp) -> Optional[str]:
+    return timestamp.isoformat() if hasattr(timestamp, "isoformat") else timestamp
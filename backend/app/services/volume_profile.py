@@ -0,0 +1,190 @@
+"""
+Intraday Volume Profiles
+
+Intraday volume follows a U-shaped curve: heavy at the open and the close,
+light around midday. Comparing a bar with the mean of all earlier bars
+therefore flags every open and close as a spike. A volume profile stores the
+mean and standard deviation of volume per time-of-day bucket, built from the
+completed sessions of a multi-day intraday history, so a bar is compared with
+the same time of day on previous days.
+
+Profiles are built once per symbol and session date and cached; evaluating a
+bar is a dictionary lookup.
+"""
+import logging
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .bar_store import bar_store
+from .market_data import PROFILE_TIMEFRAME_MAP, resolve_timeframe
+
+logger = logging.getLogger(__name__)
+
+# Sessions a bucket needs before it replaces the rolling baseline
+MIN_PROFILE_DAYS = 5
+
+INTERVAL_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "60m": 60, "90m": 90, "1h": 60}
+
+
+class VolumeProfile:
+    """Volume mean/std/session count per time-of-day bucket"""
+
+    def __init__(
+        self,
+        bucket_minutes: int,
+        stats: Dict[int, Tuple[float, float, int]],
+        as_of: Optional[date]
+    ):
+        self.bucket_minutes = bucket_minutes
+        self.stats = stats
+        self.as_of = as_of  # Sessions before this date are included
+
+    def bucket(self, timestamp: pd.Timestamp) -> int:
+        """Time-of-day bucket of a bar (minutes since midnight / bucket size)"""
+        return (timestamp.hour * 60 + timestamp.minute) // self.bucket_minutes
+
+    def lookup(self, timestamp: pd.Timestamp) -> Optional[Tuple[float, float, int]]:
+        """(mean, std, sessions) of the bar's bucket, or None if the bucket is too thin"""
+        entry = self.stats.get(self.bucket(timestamp))
+        if entry is None or entry[2] < MIN_PROFILE_DAYS:
+            return None
+        return entry
+
+
+def build_profile(hist: pd.DataFrame, bucket_minutes: int, before: Optional[date] = None) -> VolumeProfile:
+    """
+    Build a volume profile from an intraday history.
+
+    Args:
+        hist: Intraday OHLCV data (bar clock time in the index's timezone)
+        bucket_minutes: Bucket size in minutes (the bar interval)
+        before: Only sessions before this date are used (default: all)
+
+    Returns:
+        VolumeProfile
+    """
+    index = hist.index
+    volumes = hist['Volume'].to_numpy(dtype=float) if 'Volume' in hist.columns else np.zeros(len(hist))
+    sessions = index.date
+    mask = volumes > 0
+    if before is not None:
+        mask &= sessions < before
+
+    buckets = (index.hour * 60 + index.minute) // bucket_minutes
+    frame = pd.DataFrame({'bucket': np.asarray(buckets)[mask], 'volume': volumes[mask]})
+    grouped = frame.groupby('bucket')['volume']
+    mean, std, count = grouped.mean(), grouped.std(ddof=0), grouped.count()
+
+    stats = {
+        int(bucket): (float(m), float(sd), int(n))
+        for bucket, m, sd, n in zip(mean.index, mean.to_numpy(), std.to_numpy(), count.to_numpy())
+    }
+    return VolumeProfile(bucket_minutes, stats, before)
+
+
+class VolumeProfileStore:
+    """
+    Per-symbol cache of volume profiles for intraday timeframes.
+
+    A profile is rebuilt when the session date of the evaluated bar changes,
+    i.e. at most once per symbol and trading day.
+    """
+
+    def __init__(self, max_symbols: int = 2000):
+        self.max_symbols = max_symbols
+        self._profiles: "OrderedDict[str, VolumeProfile]" = OrderedDict()
+        self.logger = logger
+
+    @staticmethod
+    def supports(timeframe: str) -> bool:
+        """Whether a timeframe has intraday bars with a profile history"""
+        return f"{timeframe}:profile" in PROFILE_TIMEFRAME_MAP
+
+    def get_profile(self, symbol: str, timeframe: str, session: date) -> Optional[VolumeProfile]:
+        """Profile for a symbol built from the sessions before session"""
+        return self.get_profiles([symbol], timeframe, session).get(symbol.upper())
+
+    def get_profiles(self, symbols: Iterable[str], timeframe: str, session: date) -> Dict[str, VolumeProfile]:
+        """
+        Profiles for many symbols; missing or outdated ones are built from one bulk history fetch.
+
+        Args:
+            symbols: Stock symbols
+            timeframe: Intraday timeframe (1D, 1W)
+            session: Session date of the bars to evaluate
+
+        Returns:
+            Dict of symbol -> VolumeProfile (symbols without history are omitted)
+        """
+        if not self.supports(timeframe):
+            return {}
+
+        profile_timeframe = f"{timeframe}:profile"
+        bucket_minutes = INTERVAL_MINUTES.get(resolve_timeframe(profile_timeframe)[1], 5)
+
+        result: Dict[str, VolumeProfile] = {}
+        missing = []
+        for symbol in dict.fromkeys(s.upper() for s in symbols):
+            profile = self._profiles.get(f"{symbol}:{timeframe}")
+            if profile is not None and profile.as_of == session:
+                self._profiles.move_to_end(f"{symbol}:{timeframe}")
+                result[symbol] = profile
+            else:
+                missing.append(symbol)
+
+        if missing:
+            histories = bar_store.get_histories(missing, profile_timeframe)
+            for symbol, hist in histories.items():
+                try:
+                    profile = build_profile(hist, bucket_minutes, before=session)
+                except Exception as e:
+                    self.logger.warning(f"Could not build volume profile for {symbol}: {e}")
+                    continue
+                self._store(f"{symbol}:{timeframe}", profile)
+                result[symbol] = profile
+
+        return result
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        """Drop the profiles of symbol, or all profiles"""
+        if symbol:
+            for key in [k for k in self._profiles if k.startswith(f"{symbol.upper()}:")]:
+                del self._profiles[key]
+        else:
+            self._profiles.clear()
+
+    def _store(self, key: str, profile: VolumeProfile) -> None:
+        self._profiles[key] = profile
+        self._profiles.move_to_end(key)
+        while len(self._profiles) > self.max_symbols:
+            self._profiles.popitem(last=False)
+
+
+def apply_profile(evaluation: Dict[str, Any], profile: Optional[VolumeProfile]) -> Dict[str, Any]:
+    """
+    Replace the rolling volume baseline of an evaluation with the bar's time-of-day bucket.
+
+    Evaluations without a usable bucket keep the rolling baseline.
+    """
+    if profile is None:
+        return evaluation
+    entry = profile.lookup(pd.Timestamp(evaluation["timestamp"]))
+    if entry is None:
+        return evaluation
+
+    mean, std, sessions = entry
+    volume = evaluation["current_volume"]
+    evaluation.update({
+        "average_volume": mean,
+        "volume_count": sessions,
+        "volume_z_score": (volume - mean) / std if std > 0 and volume > 0 else 0.0,
+        "volume_baseline": "time_of_day",
+    })
+    return evaluation
+
+
+# Global profile store instance
+volume_profiles = VolumeProfileStore()
@@ -1,10 +1,12 @@
 from fastapi import WebSocket
-from typing import Dict, Set, List  # List hinzugefügt
+from typing import Any, Dict, Set, List, Optional  # List hinzugefügt
+from datetime import datetime
 import asyncio
 import logging
 
 from .market_service import MarketService
-from ..models.database import get_db
+from .currency_resolver import currency_resolver
+from ..models.database import session_scope
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +15,9 @@ class WebSocketManager:
     def __init__(self):
         self._connections: Dict[str, Set[WebSocket]] = {}
         self._tasks: Dict[str, asyncio.Task] = {}
+        # Alert-Verbindungen pro User und abonnierte Symbole pro Verbindung (None = alle)
+        self._alert_connections: Dict[int, Set[WebSocket]] = {}
+        self._alert_symbols: Dict[WebSocket, Optional[Set[str]]] = {}
         self.update_interval = 5  # Sekunden zwischen Updates
         logger.info("WebSocket Manager initialized")
 
@@ -76,14 +81,15 @@ class WebSocketManager:
     async def _send_initial_data(self, websocket: WebSocket, symbol: str):
         """Initiales Datenpaket senden"""
         try:
-            db = next(get_db())
-            market_service = MarketService(db)
-            data = await market_service.fetch_market_data(symbol, "1d")
+            with session_scope() as db:
+                market_service = MarketService(db)
+                data = await market_service.fetch_market_data(symbol, "1d")
             if data:
                 await websocket.send_json({
                     "type": "initial_data",
                     "symbol": symbol,
-                    "data": data
+                    "data": data,
+                    **currency_resolver.resolve(symbol)
                 })
         except Exception as e:
             logger.error(f"Error sending initial data for {symbol}: {str(e)}")
@@ -97,20 +103,21 @@ class WebSocketManager:
                     break
 
                 try:
-                    db = next(get_db())
-                    market_service = MarketService(db)
-                    data = await market_service.fetch_market_data(symbol, "1m")
+                    with session_scope() as db:
+                        market_service = MarketService(db)
+                        data = await market_service.fetch_market_data(symbol, "1m")
 
-                    if data:
-                        # Technische Indikatoren berechnen
-                        technical_data = market_service.calculate_technical_indicators(data)
+                        if data:
+                            # Technische Indikatoren berechnen
+                            technical_data = market_service.calculate_technical_indicators(data)
 
-                        # Muster erkennen
-                        patterns = await market_service.detect_patterns(data)
+                            # Muster erkennen
+                            patterns = await market_service.detect_patterns(data)
 
-                        # Trading Signale generieren
-                        signals = market_service.generate_signals(data, technical_data)
+                            # Trading Signale generieren
+                            signals = market_service.generate_signals(data, technical_data)
 
+                    if data:
                         await self.broadcast_to_symbol(
                             symbol,
                             {
@@ -120,7 +127,8 @@ class WebSocketManager:
                                 "data": data[-100:],  # Letzte 100 Datenpunkte
                                 "technical": technical_data,
                                 "patterns": patterns,
-                                "signals": signals
+                                "signals": signals,
+                                **currency_resolver.resolve(symbol)
                             }
                         )
 
@@ -162,4 +170,52 @@ class WebSocketManager:
 
     def get_active_symbols(self) -> List[str]:
         """Gibt eine Liste aller aktiven Symbole zurück"""
-        return list(self._connections.keys())
\ No newline at end of file
+        return list(self._connections.keys())
+
+    # === UNUSUAL ACTIVITY ALERTS ===
+
+    async def connect_alerts(self, websocket: WebSocket, user_id: int, symbols: Optional[Set[str]] = None):
+        """Alert-Verbindung für einen User registrieren"""
+        self._alert_connections.setdefault(user_id, set()).add(websocket)
+        self.set_alert_symbols(websocket, symbols)
+        logger.info(f"Alert connection established for user {user_id}. Active: {len(self._alert_connections[user_id])}")
+
+    async def disconnect_alerts(self, websocket: WebSocket, user_id: int):
+        """Alert-Verbindung eines Users trennen"""
+        self._alert_symbols.pop(websocket, None)
+        connections = self._alert_connections.get(user_id)
+        if connections is None:
+            return
+        connections.discard(websocket)
+        if not connections:
+            del self._alert_connections[user_id]
+
+    def set_alert_symbols(self, websocket: WebSocket, symbols: Optional[Set[str]]):
+        """Abonnierte Symbole einer Verbindung setzen (None = alle Symbole)"""
+        self._alert_symbols[websocket] = {s.upper() for s in symbols} if symbols is not None else None
+
+    async def broadcast_alert(self, symbol: str, activities: List[Dict[str, Any]]):
+        """Unusual-Activity-Alert an alle User senden, die das Symbol abonniert haben"""
+        message = {
+            "type": "unusual_activity",
+            "symbol": symbol,
+            "activities": activities,
+            "timestamp": datetime.now().isoformat()
+        }
+        for user_id, connections in list(self._alert_connections.items()):
+            dead_connections = set()
+            for connection in connections.copy():
+                subscribed = self._alert_symbols.get(connection)
+                if subscribed is not None and symbol not in subscribed:
+                    continue
+                try:
+                    await connection.send_json(message)
+                except Exception as e:
+                    logger.error(f"Error sending alert to user {user_id}: {str(e)}")
+                    dead_connections.add(connection)
+            for dead in dead_connections:
+                await self.disconnect_alerts(dead, user_id)
+
+    def get_alert_connections(self) -> int:
+        """Gibt die Anzahl aktiver Alert-Verbindungen zurück"""
+        return sum(len(connections) for connections in self._alert_connections.values())
@@ -0,0 +1,103 @@
+"""
+Shared fixtures.
+
+The settings are read at import time, so the test database and the
+background-task switches are set before anything from app is imported.
+"""
+import asyncio
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="market-data-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ["JWT_SECRET_KEY"] = "test-secret-key"
+os.environ["ACTIVITY_SCANNER_ENABLED"] = "false"
+os.environ["PREFETCH_ENABLED"] = "false"
+os.environ["FUNDAMENTALS_REFRESH_ENABLED"] = "false"
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models import database
+import app.models  # noqa: F401  Registers all tables on Base
+
+
+@pytest.fixture
+def db():
+    """Session on a freshly created schema"""
+    from app.auth import principal_cache
+    from app.services.scoring_profiles import scoring_profiles
+
+    database.Base.metadata.create_all(bind=database.engine)
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        principal_cache.clear()
+        scoring_profiles.invalidate()
+        database.Base.metadata.drop_all(bind=database.engine)
+
+
+@pytest.fixture
+def user(db):
+    from app.models.user import User
+
+    user = User(
+        username="trader",
+        email="trader@example.com",
+        full_name="Trader",
+        is_active=True,
+        hashed_password=User.get_password_hash("secret-password"),
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def auth_headers(user):
+    from app.auth import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.username})}"}
+
+
+@pytest.fixture
+def client(db):
+    """API client (startup and shutdown events run, background tasks are disabled)"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def on_event_loop():
+    """Whether the calling thread runs an event loop (TestClient runs the app outside the main thread)"""
+    def check() -> bool:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+    return check
+
+
+@pytest.fixture
+def make_history():
+    """Factory for synthetic OHLCV frames (geometric random walk)"""
+    def make(n: int = 300, seed: int = 0, freq: str = "B", start: str = "2024-01-02", drift: float = 0.0):
+        rng = np.random.default_rng(seed)
+        close = 100 * np.exp(np.cumsum(rng.normal(drift, 0.01, n)))
+        index = pd.date_range(start, periods=n, freq=freq)
+        return pd.DataFrame({
+            "Open": close * (1 + rng.normal(0, 0.002, n)),
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": rng.integers(100_000, 1_000_000, n).astype(float),
+        }, index=index)
+    return make
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from app.services import activity_scanner as scanner_module
+from app.services.activity_scanner import ActivityScanner
+from app.services.unusual_activity_service import UnusualActivityService
+
+
+@pytest.fixture
+def scanned(db, monkeypatch):
+    """Histories returned by the (faked) bar refresh, and the symbols evaluated per scan"""
+    state = {"histories": {}, "evaluated": []}
+    scanner = ActivityScanner(timeframe="1D")
+    scanner.base_symbols = ["AAPL"]
+
+    monkeypatch.setattr(scanner_module.bar_store, "refresh", lambda symbols, timeframe: dict(state["histories"]))
+    evaluate = scanner.evaluate
+    monkeypatch.setattr(scanner, "evaluate",
+                        lambda histories, profiles=None: state["evaluated"].append(sorted(histories))
+                        or evaluate(histories, profiles))
+    state["scanner"] = scanner
+    return state
+
+
+def test_forming_bar_is_reevaluated_until_it_stops_changing(scanned, make_history):
+    hist = make_history(n=40)
+    scanned["histories"] = {"AAPL": hist}
+    scanner = scanned["scanner"]
+
+    asyncio.run(scanner.scan_once())
+    asyncio.run(scanner.scan_once())  # Unchanged: skipped
+
+    growing = hist.copy()
+    growing.iloc[-1, growing.columns.get_loc("Volume")] *= 3
+    scanned["histories"] = {"AAPL": growing}
+    asyncio.run(scanner.scan_once())
+
+    assert scanned["evaluated"] == [["AAPL"], ["AAPL"]]
+
+
+def test_volume_spike_on_a_forming_bar_is_detected_once_it_builds_up(scanned, make_history):
+    hist = make_history(n=40)
+    scanned["histories"] = {"AAPL": hist}
+    scanner = scanned["scanner"]
+    assert asyncio.run(scanner.scan_once()) == {}
+
+    spiking = hist.copy()
+    spiking.iloc[-1, spiking.columns.get_loc("Volume")] = hist["Volume"].max() * 10
+    scanned["histories"] = {"AAPL": spiking}
+    alerts = asyncio.run(scanner.scan_once())
+
+    assert [a["type"] for a in alerts["AAPL"]] == ["VOLUME_SPIKE"]
+
+
+def test_alert_subscriptions_require_a_symbol_list(client, user, auth_headers):
+    from app.api.routes.websocket import ws_manager
+
+    token = auth_headers["Authorization"].split()[1]
+    with client.websocket_connect(f"/api/v1/ws/alerts?token={token}") as websocket:
+        websocket.send_json({"type": "subscribe", "symbols": "AAPL"})
+        assert websocket.receive_json()["type"] == "error"
+        assert list(ws_manager._alert_symbols.values()) == [set()]
+
+        websocket.send_json({"type": "subscribe", "symbols": ["aapl", "MSFT"]})
+        assert websocket.receive_json() == {"type": "subscribed", "symbols": ["aapl", "MSFT"]}
+        assert list(ws_manager._alert_symbols.values()) == [{"AAPL", "MSFT"}]
+
+
+def test_alert_subscriptions_are_per_connection(client, user, auth_headers):
+    from app.api.routes.websocket import ws_manager
+
+    token = auth_headers["Authorization"].split()[1]
+    with client.websocket_connect(f"/api/v1/ws/alerts?token={token}") as first, \
+            client.websocket_connect(f"/api/v1/ws/alerts?token={token}") as second:
+        first.send_json({"type": "subscribe", "symbols": ["AAPL"]})
+        assert first.receive_json()["type"] == "subscribed"
+        second.send_json({"type": "subscribe", "symbols": ["MSFT"]})
+        assert second.receive_json()["type"] == "subscribed"
+
+        client.portal.call(ws_manager.broadcast_alert, "AAPL", [])
+        for websocket in (first, second):
+            websocket.send_json({"type": "ping"})
+
+        assert first.receive_json()["symbol"] == "AAPL"
+        assert first.receive_json() == {"type": "pong"}
+        assert second.receive_json() == {"type": "pong"}  # No AAPL alert before the pong
+
+
+def test_alert_sockets_do_not_hold_database_connections(client, user, auth_headers):
+    from app.models.database import async_engine, engine
+
+    token = auth_headers["Authorization"].split()[1]
+    checked_out = engine.pool.checkedout(), async_engine.sync_engine.pool.checkedout()
+    with client.websocket_connect(f"/api/v1/ws/alerts?token={token}") as websocket:
+        websocket.send_json({"type": "ping"})
+        assert websocket.receive_json() == {"type": "pong"}
+        assert (engine.pool.checkedout(), async_engine.sync_engine.pool.checkedout()) == checked_out
+
+
+def test_failed_symbols_are_neither_stored_nor_alerted(scanned, make_history, on_event_loop, monkeypatch):
+    from app.models.database import SessionLocal
+    from app.models.investment_engine import UnusualActivity
+
+    persist_activities = UnusualActivityService.persist_activities
+    threads = []
+
+    def failing_for_msft(self, symbol, activities, evaluation, *args, **kwargs):
+        threads.append(on_event_loop())
+        if symbol == "MSFT":
+            evaluation = {k: v for k, v in evaluation.items() if k != "timestamp"}
+        return persist_activities(self, symbol, activities, evaluation, *args, **kwargs)
+
+    monkeypatch.setattr(UnusualActivityService, "persist_activities", failing_for_msft)
+    scanner = scanned["scanner"]
+    scanner.base_symbols = ["AAPL", "MSFT"]
+    histories = {symbol: make_history(n=40, seed=i) for i, symbol in enumerate(scanner.base_symbols)}
+    scanned["histories"] = histories
+    asyncio.run(scanner.scan_once())
+
+    for hist in histories.values():
+        hist.iloc[-1, hist.columns.get_loc("Volume")] = hist["Volume"].max() * 10
+    alerts = asyncio.run(scanner.scan_once())
+
+    assert list(alerts) == ["AAPL"]
+    with SessionLocal() as session:
+        assert [row.symbol for row in session.query(UnusualActivity)] == ["AAPL"]
+    assert not any(threads)
@@ -0,0 +1,33 @@
+from app.models import database
+from app.models.user import User
+from app.services.api_token_service import APITokenService
+
+
+def stored_token(user_id):
+    """Token as persisted, read through a fresh session"""
+    with database.SessionLocal() as session:
+        return session.get(User, user_id).api_key_token
+
+
+def test_token_service_attaches_detached_users(db, user):
+    token = APITokenService.store_api_key(db, user, "sk-test")
+    db.refresh(user)
+    db.expunge(user)
+    user_id = user.id
+
+    with database.SessionLocal() as session:
+        rotated = APITokenService.rotate_token(session, user)
+    assert rotated != token
+    assert stored_token(user_id) == rotated
+
+
+def test_rotated_token_is_saved(client, user, auth_headers):
+    settings = {"ai_provider": "openai", "ai_model": "gpt-4o", "ai_api_key": "sk-test"}
+    assert client.put("/api/v1/ai-settings/", headers=auth_headers, json=settings).status_code == 200
+    stored = stored_token(user.id)
+
+    response = client.post("/api/v1/ai-settings/rotate-token", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["token"] != stored
+    assert stored_token(user.id) == response.json()["token"]
@@ -0,0 +1,59 @@
+import itertools
+import threading
+
+from app.services import bar_store as bar_store_module
+from app.services.bar_store import BarStore
+from app.services.market_data import TIMEFRAME_MAP
+
+
+def test_prefetched_histories_fit_in_the_default_store(make_history, monkeypatch):
+    monkeypatch.setattr(bar_store_module.settings, "PREFETCH_MAX_SYMBOLS", 50)
+    store = BarStore()
+    hist = make_history(5)
+
+    symbols = [f"SYM{i}" for i in range(50)]
+    for timeframe in TIMEFRAME_MAP:
+        for symbol in symbols:
+            store.put(symbol, timeframe, hist)
+    for i in range(bar_store_module.MAX_ENTRIES_HEADROOM):
+        store.put(f"OTHER{i}", "1D", hist)
+
+    assert all(store.get_cached(symbol, timeframe) is not None for symbol in symbols for timeframe in TIMEFRAME_MAP)
+
+
+def test_entries_are_bounded(make_history):
+    store = BarStore(max_entries=2)
+    hist = make_history(5)
+    for symbol in ("AAPL", "MSFT"):
+        store.put(symbol, "1D", hist)
+    store.get_cached("AAPL", "1D")  # Most recently used
+    store.put("NVDA", "1D", hist)
+
+    assert store.get_cached("MSFT", "1D") is None
+    assert store.get_cached("AAPL", "1D") is not None
+
+
+def test_concurrent_access_with_eviction_and_expiry(make_history, monkeypatch):
+    store = BarStore(ttl_seconds=0, max_entries=4)
+    hist = make_history(5)
+    clock = itertools.count()
+    monkeypatch.setattr(bar_store_module.time, "time", lambda: float(next(clock)))  # Every entry read is expired
+    errors = []
+
+    def work(offset):
+        try:
+            for i in range(20000):
+                symbol = f"SYM{(i + offset) % 6}"
+                store.put(symbol, "1D", hist)
+                store.get_cached(symbol, "1D")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(store._bars) <= store.max_entries
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.bar_store import bar_store
+from app.services.correlation_service import CorrelationService
+
+
+@pytest.fixture
+def closes(make_history):
+    return pd.DataFrame({
+        symbol: make_history(200, seed=seed)["Close"]
+        for seed, symbol in enumerate(["AAA", "BBB", "CCC"])
+    })
+
+
+def expected_matrix(closes, window):
+    returns = closes.pct_change().iloc[1:].dropna()
+    return returns.tail(window).corr().to_numpy()
+
+
+def serve(monkeypatch, frame):
+    monkeypatch.setattr(bar_store, "get_close_matrix", lambda symbols, timeframe="1Y": frame)
+
+
+def test_incremental_updates_match_full_recompute(monkeypatch, closes):
+    service = CorrelationService()
+    for stop in (120, 121, 125, 160, 200):
+        serve(monkeypatch, closes.iloc[:stop])
+        result = service.get_correlations(closes.columns, window=60)
+        np.testing.assert_allclose(result["matrix"], expected_matrix(closes.iloc[:stop], 60), atol=1e-9)
+
+
+def test_forming_bar_is_re_evaluated_until_complete(monkeypatch, closes):
+    service = CorrelationService()
+    base = closes.iloc[:150].copy()
+    serve(monkeypatch, base)
+    service.get_correlations(closes.columns, window=60)
+
+    # The last bar's close changes on every refresh while it is forming
+    for move in (0.9, 1.1, 1.02):
+        forming = base.copy()
+        forming.iloc[-1] = base.iloc[-2] * move
+        serve(monkeypatch, forming)
+        result = service.get_correlations(closes.columns, window=60)
+        np.testing.assert_allclose(result["matrix"], expected_matrix(forming, 60), atol=1e-9)
+
+    # Once a newer bar exists, the final value of the former last bar counts
+    final = pd.concat([forming, closes.iloc[150:151]])
+    serve(monkeypatch, final)
+    result = service.get_correlations(closes.columns, window=60)
+    np.testing.assert_allclose(result["matrix"], expected_matrix(final, 60), atol=1e-9)
+
+
+def test_correlation_route_runs_off_the_event_loop(client, auth_headers, closes, on_event_loop, monkeypatch):
+    calls = []
+
+    def get_close_matrix(symbols, timeframe="1Y"):
+        calls.append(on_event_loop())
+        return closes
+
+    monkeypatch.setattr(bar_store, "get_close_matrix", get_close_matrix)
+
+    response = client.get("/api/v1/investment-engine/correlations", headers=auth_headers,
+                          params={"symbols": "AAA,BBB,CCC"})
+
+    assert response.status_code == 200
+    assert calls == [False]
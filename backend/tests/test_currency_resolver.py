@@ -0,0 +1,37 @@
+import pytest
+
+from app.services import currency_resolver as resolver_module
+from app.services.currency_resolver import currency_resolver
+
+
+@pytest.fixture
+def metadata(monkeypatch):
+    """Stored fundamentals per symbol, as returned by the (faked) fundamentals cache"""
+    stored = {}
+    monkeypatch.setattr(resolver_module.fundamentals_service, "get_cached", lambda symbol: stored.get(symbol))
+    return stored
+
+
+@pytest.mark.parametrize("symbol, expected", [
+    ("AAPL", ("US", "USD", "$")),
+    ("VOD.L", ("LSE", "GBp", "£")),
+    ("SAP.DE", ("GER", "EUR", "€")),
+    ("EURUSD=X", ("CCY", "USD", "$")),
+    ("BTC-EUR", ("CCC", "EUR", "€")),
+])
+def test_symbols_without_metadata_resolve_from_their_suffix(metadata, symbol, expected):
+    resolved = currency_resolver.resolve(symbol)
+    assert (resolved["exchange"], resolved["currency"], resolved["currencySymbol"]) == expected
+    assert resolved["priceDivisor"] == (100 if symbol.endswith(".L") else 1)
+
+
+def test_exchange_does_not_change_when_metadata_arrives(metadata):
+    before = {symbol: currency_resolver.resolve(symbol) for symbol in ("AAPL", "VOD.L")}
+
+    metadata["AAPL"] = {"exchange": "NMS", "currency": "USD"}
+    metadata["VOD.L"] = {"exchange": "IOB", "currency": "USD"}  # A dollar-quoted London line
+
+    assert currency_resolver.resolve("AAPL") == before["AAPL"]
+    assert currency_resolver.resolve("VOD.L") == {
+        "exchange": "LSE", "currency": "USD", "currencySymbol": "$", "priceDivisor": 1
+    }
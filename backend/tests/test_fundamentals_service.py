@@ -0,0 +1,92 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.market import SymbolFundamentals
+from app.services import fundamentals_service as fundamentals_module
+from app.services.fundamentals_service import FundamentalsService
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Symbols requested from the (faked) ticker.info, its answers, and a gate holding the calls"""
+    state = {"calls": [], "info": {}, "gate": threading.Event()}
+    state["gate"].set()
+
+    class Ticker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        @property
+        def info(self):
+            state["calls"].append(self.symbol)
+            assert state["gate"].wait(5)
+            info = state["info"].get(self.symbol)
+            if isinstance(info, Exception):
+                raise info
+            return info
+
+    monkeypatch.setattr(fundamentals_module.yf, "Ticker", Ticker)
+    return state
+
+
+def info(name, market_cap=1_000):
+    return {"longName": name, "quoteType": "EQUITY", "exchange": "NMS", "currency": "USD", "marketCap": market_cap}
+
+
+def test_concurrent_lookups_share_one_fetch(db, upstream):
+    service = FundamentalsService(ttl_seconds=3600)
+    upstream["info"]["AAPL"] = info("Apple Inc.")
+    upstream["gate"].clear()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.get("aapl"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    upstream["gate"].set()
+    for thread in threads:
+        thread.join()
+
+    assert [r["name"] for r in results] == ["Apple Inc."] * 4
+    assert upstream["calls"] == ["AAPL"]
+    assert db.query(SymbolFundamentals).one().market_cap == 1_000
+
+
+def test_expired_values_are_served_while_they_refresh(db, upstream):
+    db.add(SymbolFundamentals(symbol="MSFT", name="Microsoft", market_cap=1_000,
+                              fetched_at=datetime.now(timezone.utc) - timedelta(hours=2)))
+    db.commit()
+    service = FundamentalsService(ttl_seconds=3600)
+    upstream["info"]["MSFT"] = info("Microsoft Corporation", market_cap=2_000)
+    upstream["gate"].clear()
+
+    assert service.get("MSFT")["name"] == "Microsoft"
+    upstream["gate"].set()
+    service._executor.shutdown(wait=True)  # Joins the background refresh
+
+    assert service.get_cached("MSFT")["market_cap"] == 2_000
+    assert upstream["calls"] == ["MSFT"]
+
+
+def test_get_cached_never_calls_upstream(db, upstream):
+    db.add(SymbolFundamentals(symbol="NVDA", name="NVIDIA", fetched_at=datetime.now(timezone.utc)))
+    db.commit()
+    service = FundamentalsService(ttl_seconds=0)
+
+    assert service.get_cached("nvda")["name"] == "NVIDIA"
+    assert service.get_cached("TSLA") is None
+    assert upstream["calls"] == []
+
+
+def test_failed_lookups_back_off(db, upstream):
+    service = FundamentalsService(ttl_seconds=3600)
+    upstream["info"]["XYZ"] = ConnectionError("offline")
+
+    assert service.get("XYZ")["name"] is None
+    assert service.get_many(["XYZ"]) == {}
+    assert upstream["calls"] == ["XYZ"]
+
+    upstream["info"]["XYZ"] = info("XYZ Corp")
+    assert service.refresh(["XYZ"]) == 1  # Explicit refreshes ignore the backoff
+    assert service.get("XYZ")["name"] == "XYZ Corp"
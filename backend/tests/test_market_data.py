@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.market_data import (
+    QUOTE_TIMEFRAME, epoch_seconds, hist_to_columns, hist_to_records, isoformat_index,
+    resolve_timeframe, series_to_timestamp_map,
+)
+
+
+@pytest.mark.parametrize("timeframe, expected", [
+    ("1D", ("1d", "5m")),
+    ("1Y", ("1y", "1d")),
+    ("1D:profile", ("1mo", "5m")),
+    (QUOTE_TIMEFRAME, ("5d", "1d")),
+    ("unknown", ("1mo", "1d")),
+])
+def test_resolve_timeframe(timeframe, expected):
+    assert resolve_timeframe(timeframe) == expected
+
+
+def test_isoformat_index_matches_timestamp_isoformat():
+    index = pd.date_range("2024-03-08 15:00", periods=6, freq="12h", tz="America/New_York")
+    assert isoformat_index(index) == [ts.isoformat() for ts in index]
+
+    naive = pd.date_range("2024-01-02", periods=3, freq="D")
+    assert isoformat_index(naive) == [ts.isoformat() for ts in naive]
+
+
+def test_epoch_seconds_treats_naive_timestamps_as_utc():
+    aware = pd.DatetimeIndex(["2024-01-02 09:30"]).tz_localize("America/New_York")
+    naive = pd.DatetimeIndex(["2024-01-02 14:30"])
+    assert epoch_seconds(aware).tolist() == epoch_seconds(naive).tolist() == [1704205800]
+
+
+def test_hist_conversions(make_history):
+    hist = make_history(n=3)
+    hist.iloc[1, hist.columns.get_loc("Volume")] = np.nan
+
+    columns = hist_to_columns(hist, timestamps="epoch")
+    records = hist_to_records(hist)
+
+    assert columns["timestamp"] == epoch_seconds(hist.index).tolist()
+    assert columns["volume"][1] == 0
+    assert records[0] == {
+        "timestamp": hist.index[0].isoformat(), "open": hist["Open"].iloc[0], "high": hist["High"].iloc[0],
+        "low": hist["Low"].iloc[0], "close": hist["Close"].iloc[0], "volume": int(hist["Volume"].iloc[0]),
+    }
+    assert hist_to_records(hist[["Close"]])[2] == {"timestamp": hist.index[2].isoformat(), "close": hist["Close"].iloc[2]}
+
+
+def test_series_to_timestamp_map_skips_missing_values():
+    series = pd.Series([1.0, np.nan, np.inf, 4.0], index=pd.date_range("2024-01-02", periods=4, freq="D"))
+    assert series_to_timestamp_map(series) == {1704153600: 1.0, 1704412800: 4.0}
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from app.services.master_score_service import MasterScoreService
+from app.services.signal_generation import generate_signals
+from app.services.technical_indicators import calculate_technical_indicators
+
+
+@pytest.mark.parametrize("bar", [220, 260, 299])
+def test_series_matches_scalar_components(make_history, bar):
+    hist = make_history(300, seed=1)
+    service = MasterScoreService()
+    series = service.calculate_master_score_series(hist)
+
+    window = hist.iloc[:bar + 1]
+    indicators = calculate_technical_indicators(window)
+    components = service.calculate_components(indicators, generate_signals(window, indicators))
+
+    for name in ("short_term", "medium_term", "long_term"):
+        assert series[name].iloc[bar] == pytest.approx(components[name])
+
+
+def test_series_scores_every_bar(make_history):
+    hist = make_history(120, seed=2)
+    series = MasterScoreService().calculate_master_score_series(hist)
+
+    assert series.index.equals(hist.index)
+    assert np.all((series["master_score"] >= 0) & (series["master_score"] <= 100))
+    assert set(series["recommendation"]) <= {"STRONG_SELL", "SELL", "HOLD", "BUY", "STRONG_BUY"}
+    assert set(series["confidence"]) <= {"HIGH", "MEDIUM", "LOW"}
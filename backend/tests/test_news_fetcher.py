@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+from app.services.news_fetcher import NewsFetcher, dedupe_articles
+
+
+def article(title, link="", source="Yahoo Finance"):
+    return {"id": "", "title": title, "summary": "", "link": link, "published": "", "source": source}
+
+
+def make_fetcher(monkeypatch, yfinance_delay=0.2, rss_delay=0.2, **kwargs):
+    fetcher = NewsFetcher(**kwargs)
+
+    async def yfinance(symbol):
+        await asyncio.sleep(yfinance_delay)
+        return [article(f"{symbol} beats estimates", "https://www.example.com/a/"), article(f"{symbol} guidance")]
+
+    async def rss(symbol):
+        await asyncio.sleep(rss_delay)
+        return [article(f"{symbol} beats estimates", "https://example.com/a", "Yahoo Finance RSS"),
+                article(f"{symbol} new product", source="Yahoo Finance RSS")]
+
+    monkeypatch.setattr(fetcher, "_fetch_yfinance", yfinance)
+    monkeypatch.setattr(fetcher, "_fetch_rss", rss)
+    return fetcher
+
+
+def test_sources_run_concurrently_and_are_deduplicated(monkeypatch):
+    fetcher = make_fetcher(monkeypatch)
+
+    started = time.perf_counter()
+    articles = asyncio.run(fetcher.fetch("AAPL"))
+
+    assert time.perf_counter() - started < 0.35
+    assert [a["title"] for a in articles] == ["AAPL beats estimates", "AAPL guidance", "AAPL new product"]
+
+
+def test_slow_source_times_out_without_losing_the_others(monkeypatch):
+    fetcher = make_fetcher(monkeypatch, rss_delay=5, timeout=0.5)
+
+    articles = asyncio.run(fetcher.fetch("AAPL"))
+
+    assert [a["source"] for a in articles] == ["Yahoo Finance", "Yahoo Finance"]
+
+
+def test_first_policy_returns_the_fastest_source(monkeypatch):
+    fetcher = make_fetcher(monkeypatch, yfinance_delay=1, rss_delay=0.05)
+
+    started = time.perf_counter()
+    articles = asyncio.run(fetcher.fetch("AAPL", policy="first"))
+
+    assert time.perf_counter() - started < 0.5
+    assert {a["source"] for a in articles} == {"Yahoo Finance RSS"}
+
+
+def test_fetch_many_respects_the_concurrency_cap(monkeypatch):
+    fetcher = NewsFetcher(max_concurrency=2)
+    running, peak = 0, 0
+
+    async def fetch(symbol, policy="merge"):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        if symbol == "BAD":
+            raise RuntimeError("upstream error")
+        return [article(symbol)]
+
+    monkeypatch.setattr(fetcher, "fetch", fetch)
+    news = asyncio.run(fetcher.fetch_many(["A", "B", "BAD", "C", "D"]))
+
+    assert peak == 2
+    assert news["BAD"] == [] and news["D"][0]["title"] == "D"
+
+
+def test_dedupe_matches_on_normalized_url_id_or_title():
+    articles = [
+        article("One", "https://www.example.com/x/"),
+        article("One (updated)", "https://example.com/x"),
+        {**article("Two"), "id": "42"},
+        {**article("Three"), "id": "42"},
+        article("two"),
+    ]
+    assert [a["title"] for a in dedupe_articles(articles)] == ["One", "Two"]
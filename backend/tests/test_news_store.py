@@ -0,0 +1,156 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from app.models.investment_engine import NewsArticle, SentimentAnalysis
+from app.services import sentiment_service as sentiment_module
+from app.services.news_store import NewsStore, parse_published
+from app.services.sentiment_service import SentimentAnalysisService
+
+
+def article(title, link):
+    return {"id": "", "title": title, "summary": "", "link": link,
+            "published": "Tue, 01 Oct 2024 12:00:00 GMT", "source": "Yahoo Finance RSS"}
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    """Articles returned by the (faked) news fetcher, and the number of fetches"""
+    state = {"articles": [], "fetches": 0}
+
+    async def fetch(symbol, policy="merge"):
+        state["fetches"] += 1
+        return [dict(a) for a in state["articles"]]
+
+    monkeypatch.setattr(sentiment_module.news_fetcher, "fetch", fetch)
+    monkeypatch.setattr(sentiment_module.sentiment_correlation, "get_correlation", lambda db, symbol: None)
+    monkeypatch.setattr(sentiment_module.sentiment_correlation, "load_bars", lambda symbols: None)
+    return state
+
+
+def test_articles_are_stored_once_and_marked_seen(db):
+    store = NewsStore(db)
+    first = datetime(2024, 10, 1, tzinfo=timezone.utc)
+    scored = {**article("Record profit", "https://example.com/a"), "sentiment_score": 40.0}
+    store.add_articles("AAPL", [scored], first)
+    db.commit()
+
+    rows = store.find(["example.com/a"])
+    assert [(row.symbol, row.sentiment_score) for row in rows] == [("AAPL", 40.0)]
+    assert store.find(["example.com/a"], symbols=["MSFT"]) == []
+
+    store.mark_seen(rows, first + timedelta(hours=1))
+    db.commit()
+    db.expire_all()
+    assert store.recent_articles("AAPL")[0].last_seen_at.replace(tzinfo=timezone.utc) == first + timedelta(hours=1)
+
+
+def test_latest_snapshot_respects_max_age(db):
+    store = NewsStore(db)
+    response = {"sentiment_score": 10, "sentiment_label": "Neutral", "confidence": "HIGH"}
+    snapshot = store.add_snapshot("AAPL", response)
+    db.commit()
+
+    assert store.latest_snapshot("AAPL", timedelta(minutes=10)).id == snapshot.id
+    snapshot.timestamp = datetime.now(timezone.utc) - timedelta(hours=1)
+    db.commit()
+    assert store.latest_snapshot("AAPL", timedelta(minutes=10)) is None
+
+
+def test_unseen_articles_are_scored_and_snapshots_served_from_the_database(db, fetched):
+    fetched["articles"] = [article("Apple beats estimates", "https://example.com/a"),
+                           article("Apple faces lawsuit", "https://example.com/b")]
+    service = SentimentAnalysisService(db)
+
+    first = asyncio.run(service.analyze_sentiment("AAPL"))
+    second = asyncio.run(service.analyze_sentiment("AAPL"))
+
+    assert fetched["fetches"] == 1
+    assert db.query(NewsArticle).count() == 2
+    assert second["sentiment_score"] == first["sentiment_score"]
+    assert second["breakdown"]["news"]["count"] == 2
+
+
+def test_stored_scores_are_reused_for_known_articles(db, fetched, monkeypatch):
+    fetched["articles"] = [article("Apple beats estimates", "https://example.com/a")]
+    service = SentimentAnalysisService(db)
+    asyncio.run(service.analyze_sentiment("AAPL"))
+
+    scored = []
+    original = SentimentAnalysisService._score_article
+    monkeypatch.setattr(SentimentAnalysisService, "_score_article",
+                        lambda self, a: scored.append(a["title"]) or original(self, a))
+    fetched["articles"].append(article("Apple recalls devices", "https://example.com/c"))
+    service.cache_duration = timedelta(0)  # Force a new fetch
+    asyncio.run(service.analyze_sentiment("AAPL"))
+
+    assert scored == ["Apple recalls devices"]
+    assert db.query(NewsArticle).count() == 2
+
+
+def test_articles_and_snapshots_are_committed_once(db, fetched):
+    fetched["articles"] = [article("Apple beats estimates", "https://example.com/a")]
+    service = SentimentAnalysisService(db)
+    commits = []
+    engine = db.get_bind()
+    count_commit = commits.append
+    event.listen(engine, "commit", count_commit)  # Database commits (savepoint releases are not counted)
+    try:
+        asyncio.run(service.analyze_sentiment_batch(["AAPL", "MSFT"]))
+    finally:
+        event.remove(engine, "commit", count_commit)
+
+    assert len(commits) == 1
+    assert db.query(NewsArticle).count() == 2
+    assert db.query(SentimentAnalysis).count() == 2
+
+
+def test_store_errors_do_not_fail_the_batch(db, fetched, monkeypatch):
+    fetched["articles"] = [article("Apple beats estimates", "https://example.com/a")]
+    service = SentimentAnalysisService(db)
+    asyncio.run(service.analyze_sentiment_batch(["AAPL"]))
+
+    def mark_seen(rows, seen_at):
+        raise OperationalError("UPDATE news_articles", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(service.store, "mark_seen", mark_seen)
+    service.cache_duration = timedelta(0)  # Force a new fetch
+    results = asyncio.run(service.analyze_sentiment_batch(["AAPL"]))
+
+    assert results["AAPL"]["breakdown"]["news"]["count"] == 1
+    assert results["AAPL"]["sentiment_score"] > 0
+
+
+def test_snapshots_are_only_stored_with_their_articles(db, fetched, monkeypatch):
+    fetched["articles"] = [article("Apple beats estimates", "https://example.com/a")]
+    service = SentimentAnalysisService(db)
+    add_articles = service.store.add_articles
+
+    def failing_for_msft(symbol, articles, seen_at):
+        if symbol == "MSFT":
+            raise OperationalError("INSERT INTO news_articles", {}, Exception("database is locked"))
+        return add_articles(symbol, articles, seen_at)
+
+    monkeypatch.setattr(service.store, "add_articles", failing_for_msft)
+    results = asyncio.run(service.analyze_sentiment_batch(["AAPL", "MSFT"]))
+
+    assert results["MSFT"]["breakdown"]["news"]["count"] == 1
+    assert [row.symbol for row in db.query(NewsArticle)] == ["AAPL"]
+    assert [row.symbol for row in db.query(SentimentAnalysis)] == ["AAPL"]
+
+    fetches = fetched["fetches"]
+    asyncio.run(service.analyze_sentiment("MSFT"))  # No snapshot: fetched again instead of "No Data"
+    assert fetched["fetches"] == fetches + 1
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2024-10-01T12:00:00Z", datetime(2024, 10, 1, 12, tzinfo=timezone.utc)),
+    ("Tue, 01 Oct 2024 12:00:00 GMT", datetime(2024, 10, 1, 12, tzinfo=timezone.utc)),
+    ("not a date", None),
+    ("", None),
+])
+def test_parse_published(value, expected):
+    assert parse_published(value) == expected
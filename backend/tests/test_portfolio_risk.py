@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models.watchlist import Watchlist
+from app.services.bar_store import bar_store
+from app.services.portfolio_risk import calculate_portfolio_risk
+
+
+def test_equal_weighted_volatility_matches_portfolio_returns(make_history):
+    closes = pd.DataFrame({
+        "A": make_history(120, seed=10)["Close"],
+        "B": make_history(120, seed=11)["Close"],
+    })
+    result = calculate_portfolio_risk(closes)
+
+    returns = closes.pct_change().dropna().mean(axis=1)
+    assert result["portfolio_volatility"] == pytest.approx(returns.std() * np.sqrt(252) * 100)
+    assert result["holdings_count"] == 2
+    assert sum(h["risk_contribution"] for h in result["holdings"]) == pytest.approx(100)
+
+
+def test_portfolio_risk_route_normalises_symbols_off_the_event_loop(client, db, user, auth_headers, make_history,
+                                                                    on_event_loop, monkeypatch):
+    db.add_all([
+        Watchlist(user_id=user.id, symbol="aapl", is_active=True),
+        Watchlist(user_id=user.id, symbol="Msft", is_active=True),
+    ])
+    db.commit()
+
+    calls = []
+
+    def get_histories(symbols, timeframe="1M"):
+        calls.append((list(symbols), on_event_loop()))
+        return {symbol: make_history(120, seed=i) for i, symbol in enumerate(symbols)}
+
+    monkeypatch.setattr(bar_store, "get_histories", get_histories)
+
+    response = client.get("/api/v1/investment-engine/portfolio-risk", headers=auth_headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert sorted(h["symbol"] for h in body["holdings"]) == ["AAPL", "MSFT"]
+    assert body["missing_symbols"] == []
+    assert calls == [(["AAPL", "MSFT", "SPY"], False)]
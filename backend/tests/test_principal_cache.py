@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+from sqlalchemy import inspect as sa_inspect
+
+from app.auth import PrincipalCache, _resolve_user, create_access_token, principal_cache
+from app.models.database import AsyncSessionLocal
+
+
+def resolve(token, db=None):
+    async def run():
+        if db is not None:
+            return await _resolve_user(token, db)
+        async with AsyncSessionLocal() as session:
+            return await _resolve_user(token, session)
+    return asyncio.run(run())
+
+
+def test_cache_hit_is_a_detached_user_without_a_query(user):
+    token = create_access_token({"sub": user.username})
+    resolved = resolve(token)
+
+    cached = resolve(token, db=object())  # Any query would fail on this session
+    assert (cached.id, cached.username, cached.is_active) == (resolved.id, "trader", True)
+    assert sa_inspect(cached).detached
+
+
+def test_entries_expire_with_the_token_and_are_bounded(user):
+    cache = PrincipalCache(ttl_seconds=60, max_entries=2)
+    cache.put("expired", user, token_expires_at=time.time() - 1)
+    assert cache.get("expired") is None
+
+    for token in ("a", "b", "c"):
+        cache.put(token, user)
+    assert cache.get("a") is None
+    assert cache.get("c").username == "trader"
+
+
+def test_user_changes_invalidate_cached_entries(db, user, client, auth_headers):
+    assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+
+    user.is_active = False
+    db.commit()
+
+    assert principal_cache.get(auth_headers["Authorization"].split()[1]) is None
+    assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 400
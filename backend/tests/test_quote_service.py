@@ -0,0 +1,68 @@
+import pytest
+
+from app.services import quote_service as quote_module
+from app.services.market_data import QUOTE_TIMEFRAME
+from app.services.quote_service import QuoteService, quote_from_history
+
+
+@pytest.fixture
+def refreshed(make_history, monkeypatch):
+    """Symbols per (faked) bar store refresh; symbols listed in "failing" return no bars"""
+    state = {"calls": [], "failing": set()}
+
+    def refresh(symbols, timeframe):
+        assert timeframe == QUOTE_TIMEFRAME
+        state["calls"].append(list(symbols))
+        return {s: make_history(5, seed=i) for i, s in enumerate(symbols) if s not in state["failing"]}
+
+    monkeypatch.setattr(quote_module.bar_store, "refresh", refresh)
+    return state
+
+
+def test_misses_are_fetched_in_one_call_and_then_cached(refreshed):
+    service = QuoteService(ttl_seconds=60)
+
+    quotes = service.get_quotes(["aapl", "MSFT", "AAPL"])
+    assert sorted(quotes) == ["AAPL", "MSFT"]
+
+    assert service.get_quotes(["AAPL", "MSFT", "NVDA"])["AAPL"] == quotes["AAPL"]
+    assert refreshed["calls"] == [["AAPL", "MSFT"], ["NVDA"]]
+
+
+def test_failed_refresh_serves_the_last_quote_as_stale(refreshed, monkeypatch):
+    service = QuoteService(ttl_seconds=60, max_stale_seconds=300)
+    fresh = service.get_quote("AAPL")
+    refreshed["failing"].add("AAPL")
+
+    clock = quote_module.time.time()
+    monkeypatch.setattr(quote_module.time, "time", lambda: clock + 120)
+    assert service.get_quote("AAPL") == {**fresh, "stale": True}
+
+    monkeypatch.setattr(quote_module.time, "time", lambda: clock + 600)
+    assert service.get_quote("AAPL") is None
+
+
+def test_entries_are_bounded(refreshed):
+    service = QuoteService(ttl_seconds=60, max_entries=2)
+    service.get_quotes(["AAPL", "MSFT"])
+    service.get_quote("AAPL")  # Most recently used
+    service.get_quote("NVDA")
+
+    service.get_quotes(["AAPL", "NVDA"])
+    service.get_quote("MSFT")
+    assert refreshed["calls"] == [["AAPL", "MSFT"], ["NVDA"], ["MSFT"]]
+
+
+def test_quote_from_history(make_history):
+    hist = make_history(5)
+    quote = quote_from_history("AAPL", hist)
+
+    price, previous_close = hist["Close"].iloc[-1], hist["Close"].iloc[-2]
+    assert quote["price"] == pytest.approx(price, abs=1e-4)
+    assert quote["change"] == pytest.approx(price - previous_close, abs=1e-4)
+    assert quote["change_percent"] == pytest.approx((price / previous_close - 1) * 100, abs=1e-4)
+    assert quote["volume"] == int(hist["Volume"].iloc[-1])
+    assert quote["timestamp"] == hist.index[-1].isoformat()
+
+    single = quote_from_history("AAPL", hist.iloc[:1])
+    assert single["previous_close"] is single["change"] is single["change_percent"] is None
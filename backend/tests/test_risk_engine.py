@@ -0,0 +1,43 @@
+import pytest
+
+from app.services.risk_engine import RiskEngine
+from app.services.risk_metrics import calculate_risk_metrics
+
+COMPARED = ("max_drawdown", "current_drawdown", "historical_volatility_20d", "price_range_20d", "gap_percentage")
+
+
+def assert_matches_full_recompute(engine, key, hist):
+    incremental = engine.get_risk_metrics(key, hist, {})
+    expected = calculate_risk_metrics(hist, {})
+    for name in COMPARED:
+        assert incremental[name] == pytest.approx(expected[name], rel=1e-9, abs=1e-9), name
+
+
+def test_growing_history_matches_full_recompute(make_history):
+    full = make_history(150, seed=3)
+    engine = RiskEngine()
+    for stop in range(30, 151, 7):
+        assert_matches_full_recompute(engine, "X:1Y", full.iloc[:stop])
+
+
+def test_rolling_window_drops_old_drawdowns(make_history):
+    # A crash early on, then a recovery: once the crash leaves the window,
+    # the max drawdown must only reflect the bars still in it
+    full = make_history(400, seed=4)
+    full.iloc[20:40, full.columns.get_loc("Close")] *= 0.5
+
+    engine = RiskEngine()
+    for start in range(0, 140, 5):
+        assert_matches_full_recompute(engine, "X:1Y", full.iloc[start:start + 252])
+
+
+def test_forming_bar_is_not_committed(make_history):
+    hist = make_history(60, seed=5)
+    engine = RiskEngine()
+    engine.get_risk_metrics("X:1D", hist, {})
+
+    # The last bar keeps changing until it is complete
+    for close in (90.0, 130.0, float(hist["Close"].iloc[-1]) * 1.01):
+        forming = hist.copy()
+        forming.iloc[-1, forming.columns.get_loc("Close")] = close
+        assert_matches_full_recompute(engine, "X:1D", forming)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from app.services.scoring_profiles import CompiledScoringProfile, scoring_profiles, validate_profile
+
+WEIGHTS = {"short_term": 2, "medium_term": 1, "long_term": 1, "risk": 0}
+
+
+def test_weights_are_normalized():
+    weights, thresholds = validate_profile(WEIGHTS)
+    assert weights == {"short_term": 0.5, "medium_term": 0.25, "long_term": 0.25, "risk": 0.0}
+    assert thresholds == {"SELL": 20.0, "HOLD": 40.0, "BUY": 60.0, "STRONG_BUY": 80.0}
+
+
+@pytest.mark.parametrize("weights, thresholds", [
+    ({"short_term": 1, "medium_term": 1, "long_term": 1}, None),
+    ({**WEIGHTS, "risk": -1}, None),
+    ({c: 0 for c in WEIGHTS}, None),
+    (WEIGHTS, {"SELL": 50, "HOLD": 40}),
+])
+def test_invalid_profiles_are_rejected(weights, thresholds):
+    with pytest.raises(ValueError):
+        validate_profile(weights, thresholds)
+
+
+def test_scores_and_classifies_many_rows_at_once():
+    profile = CompiledScoringProfile("test", WEIGHTS, {"SELL": 25, "HOLD": 45, "BUY": 65, "STRONG_BUY": 85})
+    components = np.array([[100, 100, 100, 0], [40, 40, 40, 100], [0, 0, 0, 100]], dtype=float)
+
+    scores = profile.score(components)
+
+    np.testing.assert_allclose(scores, [100, 40, 0])
+    assert list(profile.classify(scores)) == ["STRONG_BUY", "SELL", "STRONG_SELL"]
+    assert profile.recommendation(65.0) == "BUY"
+
+
+def test_custom_profile_round_trip(client, db, user, auth_headers):
+    payload = {"name": "growth", "description": "Growth", "weights": WEIGHTS}
+    created = client.post("/api/v1/investment-engine/scoring-profiles", json=payload, headers=auth_headers)
+    assert created.status_code == 201
+    assert created.json()["weights"]["short_term"] == 0.5
+
+    updated = client.put(
+        "/api/v1/investment-engine/scoring-profiles/growth",
+        json={**payload, "weights": {**WEIGHTS, "risk": 4}},
+        headers=auth_headers,
+    )
+    assert updated.status_code == 200
+    # The compiled profile is rebuilt after a change
+    assert scoring_profiles.get(db, "growth").weights["risk"] == 0.5
+
+    names = [p["name"] for p in client.get("/api/v1/investment-engine/scoring-profiles", headers=auth_headers).json()]
+    assert names[:3] == ["balanced", "momentum", "risk_averse"] and "growth" in names
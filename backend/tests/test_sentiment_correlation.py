@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.services.bar_store import bar_store
+from app.services.news_store import NewsStore
+from app.services.sentiment_correlation import (
+    SentimentCorrelationTracker, daily_sentiment, pair_forward_returns,
+)
+
+
+@pytest.fixture
+def snapshots(db):
+    """One stored snapshot per day for the last 30 days (UTC noon)"""
+    store = NewsStore(db)
+    today = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+    rng = np.random.default_rng(1)
+    for days_ago in range(30):
+        response = {"sentiment_score": float(rng.normal(0, 30)), "sentiment_label": "Neutral", "confidence": "LOW"}
+        store.add_snapshot("AAPL", response).timestamp = today - timedelta(days=days_ago)
+    db.commit()
+    yield today.date()
+    bar_store.clear()
+
+
+def test_forming_daily_close_is_paired_once_final(db, snapshots, make_history):
+    tracker = SentimentCorrelationTracker(window=20)
+    forming = make_history(n=30, freq="D", start=str(snapshots - timedelta(days=29)))
+    bar_store.put("AAPL", tracker.timeframe, forming)
+
+    tracker.get_correlation(db, "AAPL")
+    assert tracker._states["AAPL"].last_paired_date == snapshots - timedelta(days=2)
+
+    # Today's bar closes at a different price and tomorrow's bar starts forming
+    final = make_history(n=31, freq="D", start=str(snapshots - timedelta(days=29)))
+    final.iloc[:30] = forming.to_numpy()
+    final.iloc[29, final.columns.get_loc("Close")] *= 1.05
+    bar_store.put("AAPL", tracker.timeframe, final)
+
+    value = tracker.get_correlation(db, "AAPL")
+    assert tracker._states["AAPL"].last_paired_date == snapshots - timedelta(days=1)
+
+    since = datetime.now(timezone.utc) - timedelta(days=90)
+    pairs = pair_forward_returns(daily_sentiment(db, "AAPL", since), final["Close"].iloc[:-1]).tail(20)
+    assert value == pytest.approx(pairs["sentiment"].corr(pairs["forward_return"]), abs=1e-4)
+
+
+def test_correlation_reads_cached_bars_only(db, snapshots, monkeypatch):
+    def download(*args, **kwargs):
+        raise AssertionError("get_correlation must not download bars")
+
+    monkeypatch.setattr(bar_store, "get_history", download)
+    monkeypatch.setattr(bar_store, "get_histories", download)
+    tracker = SentimentCorrelationTracker(window=20)
+
+    assert tracker.get_correlation(db, "AAPL") is None
+    assert tracker._states["AAPL"].last_paired_date is None
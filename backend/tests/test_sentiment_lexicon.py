@@ -0,0 +1,57 @@
+import pytest
+
+from app.services.sentiment_lexicon import KeywordMatcher, NEWS_LEXICON, inflections, news_matcher, trie_pattern
+
+
+@pytest.mark.parametrize("term, expected", [
+    ("drop", {"dropped", "dropping", "drops"}),
+    ("cut", {"cutting", "cuts"}),
+    ("target", {"targeted", "targeting", "targets"}),
+    ("profit", {"profited", "profiting", "profits"}),
+    ("surge", {"surged", "surging", "surges"}),
+    ("rally", {"rallied", "rallies"}),
+    ("fall", {"fell", "fallen", "falls"}),
+])
+def test_inflections(term, expected):
+    assert expected <= set(inflections(term))
+
+
+@pytest.mark.parametrize("term, invalid", [
+    ("cut", {"cutted"}),
+    ("up", {"ups", "uped", "uping", "upped"}),
+    ("sell", {"selled"}),
+    ("buy", {"buyed"}),
+    ("beat", {"beated"}),
+    ("fall", {"falled"}),
+    ("strong", {"stronged", "strongs"}),
+])
+def test_irregular_and_uninflected_terms(term, invalid):
+    assert not invalid & set(inflections(term))
+
+
+def test_multi_syllable_words_are_not_doubled():
+    assert "targetted" not in inflections("target")
+    assert "profitted" not in inflections("profit")
+
+
+@pytest.mark.parametrize("text, bullish, bearish", [
+    ("Analysts targeted higher prices as the company profited", 3, 0),
+    ("Shares dropped and fell after the downgrade", 0, 3),
+    ("Software update executes on schedule", 0, 0),  # No "up" in update, no "cut" in execute
+    ("UPS shares slide as volumes fall", 0, 1),  # The ticker UPS is not a form of "up"
+    ("Costs were cut as the retailer sold stores", 0, 2),
+])
+def test_matches_whole_words_only(text, bullish, bearish):
+    match = news_matcher.match(text)
+    assert (match.bullish_hits, match.bearish_hits) == (bullish, bearish)
+
+
+def test_single_regex_matches_every_inflection():
+    matcher = KeywordMatcher(NEWS_LEXICON)
+    for term in NEWS_LEXICON:
+        for form in inflections(term):
+            assert matcher.match(form).score != 0, form
+
+
+def test_trie_pattern_is_prefix_factored():
+    assert trie_pattern(["surge", "surged", "surging"]) == "surg(?:e(?:d)?|ing)"
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models.investment_engine import SignalPerformance, SignalPerformanceRollup
+from app.services import signal_performance_service as performance_module
+from app.services.signal_performance_service import SignalPerformanceService, invalidate_metrics_cache
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA"]
+
+
+@pytest.fixture
+def closes(monkeypatch):
+    """Daily closes returned by the (faked) bar store for the signal symbols and SPY"""
+    rng = np.random.default_rng(3)
+    index = pd.date_range(datetime.now(timezone.utc).date() - timedelta(days=89), periods=90, freq="D")
+    frame = pd.DataFrame(
+        100 * np.exp(np.cumsum(rng.normal(0, 0.02, (len(index), len(SYMBOLS) + 1)), axis=0)),
+        index=index, columns=SYMBOLS + ["SPY"]
+    )
+    monkeypatch.setattr(performance_module.bar_store, "get_close_matrix",
+                        lambda symbols, timeframe="1Y": frame[[s for s in symbols if s in frame]])
+    invalidate_metrics_cache()
+    yield frame
+    invalidate_metrics_cache()
+
+
+def record(service, frame, days_ago, signal_types=("BUY", "SELL", "HOLD")):
+    generated_at = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    entry = frame.index.get_indexer([pd.Timestamp(generated_at.date())])[0]
+    return service.record_signals(
+        [
+            {"symbol": symbol, "signal_type": signal_type, "signal_strength": strength,
+             "master_score": 50.0, "entry_price": float(frame[symbol].iloc[entry]), "generated_at": generated_at}
+            for symbol, signal_type, strength in zip(SYMBOLS, signal_types, ["WEAK", "STRONG", "MEDIUM"])
+        ],
+        benchmark_price=float(frame["SPY"].iloc[entry])
+    )
+
+
+def test_accuracy_metrics_match_the_evaluated_rows(db, closes):
+    service = SignalPerformanceService(db)
+    record(service, closes, days_ago=40)
+    record(service, closes, days_ago=20, signal_types=("SELL", "HOLD", "BUY"))
+
+    evaluated = service.evaluate_pending_signals()
+    rows = db.query(SignalPerformance).filter(SignalPerformance.is_pending == False).all()
+    assert evaluated == len(rows) == 15  # The 30-day horizon of the second batch is not due
+
+    metrics = service.get_accuracy_metrics()
+    overall = metrics["overall"]
+    assert overall["total_signals"] == 15
+    assert overall["profitable_signals"] == sum(bool(r.is_profitable) for r in rows)
+    assert overall["avg_return_percent"] == pytest.approx(np.mean([r.return_percent for r in rows]), abs=0.01)
+    assert overall["avg_excess_return_percent"] == pytest.approx(np.mean([r.excess_return for r in rows]), abs=0.01)
+    assert metrics["vs_benchmark"]["outperformed"] == sum(r.excess_return > 0 for r in rows)
+
+    weekly = [r for r in rows if r.timeframe_days == 7]
+    assert metrics["by_timeframe"]["7D"]["count"] == len(weekly) == 6
+
+    buy = service.get_accuracy_metrics(symbol="AAPL", signal_type="BUY")["overall"]
+    aapl_buy = [r for r in rows if r.symbol == "AAPL" and r.signal_type == "BUY"]
+    assert buy["total_signals"] == len(aapl_buy)
+    assert buy["avg_return_percent"] == pytest.approx(np.mean([r.return_percent for r in aapl_buy]), abs=0.01)
+
+
+def test_direction_aware_returns(db, closes):
+    service = SignalPerformanceService(db)
+    record(service, closes, days_ago=10)
+    service.evaluate_pending_signals()
+
+    for row in db.query(SignalPerformance).filter(SignalPerformance.is_pending == False):
+        if row.signal_type == "BUY":
+            assert row.is_profitable == (row.return_percent > 0)
+        elif row.signal_type == "SELL":
+            assert row.is_profitable == (row.return_percent < 0)
+            assert row.excess_return == pytest.approx(row.benchmark_return_percent - row.return_percent)
+        else:
+            assert row.is_profitable == (abs(row.return_percent) <= 2.0)
+
+
+def rollup_rows(db):
+    return sorted(
+        (r.symbol, r.signal_type, r.timeframe_days, r.signal_strength, r.signal_count, r.profitable_count,
+         r.outperformed_count, r.underperformed_count, round(r.return_sum, 6), round(r.excess_return_sum, 6))
+        for r in db.query(SignalPerformanceRollup)
+    )
+
+
+def test_rollups_folded_per_evaluation_match_a_rebuild(db, closes):
+    service = SignalPerformanceService(db)
+    record(service, closes, days_ago=40)
+    service.evaluate_pending_signals(["AAPL"])
+    service.evaluate_pending_signals()
+    record(service, closes, days_ago=20, signal_types=("SELL", "HOLD", "BUY"))
+    service.evaluate_pending_signals()
+
+    folded = rollup_rows(db)
+    assert sum(row[4] for row in folded) == 15
+
+    service.rebuild_rollups()
+    assert rollup_rows(db) == folded
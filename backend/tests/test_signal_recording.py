@@ -0,0 +1,76 @@
+import pytest
+
+from app.services.bar_store import bar_store
+from app.services.signal_performance_service import SignalPerformanceService
+
+
+@pytest.fixture
+def recorded(make_history, on_event_loop, monkeypatch):
+    """Signals passed to record_signals, and whether the event loop thread recorded them"""
+    state = {"signals": [], "on_event_loop": []}
+
+    def record_signals(self, signals, *args, **kwargs):
+        state["signals"].extend(signals)
+        state["on_event_loop"].append(on_event_loop())
+        return len(signals)
+
+    monkeypatch.setattr(SignalPerformanceService, "record_signals", record_signals)
+    monkeypatch.setattr(bar_store, "get_histories",
+                        lambda symbols, timeframe="1M": {s: make_history(300, seed=i) for i, s in enumerate(symbols)})
+    return state
+
+
+def screen(client, auth_headers, profiles):
+    response = client.get("/api/v1/investment-engine/screener", headers=auth_headers,
+                          params={"symbols": "AAPL,MSFT,NVDA", "profiles": profiles})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_screener_computes_off_the_event_loop_and_records_nothing(client, auth_headers, recorded, on_event_loop,
+                                                                   monkeypatch):
+    from app.api.routes import investment_engine
+
+    computed = []
+    screen_components = investment_engine._screen_components
+    monkeypatch.setattr(investment_engine, "_screen_components",
+                        lambda *args: computed.append(on_event_loop()) or screen_components(*args))
+
+    screen(client, auth_headers, "momentum,risk_averse")
+
+    assert computed == [False]
+    assert recorded["signals"] == []
+
+
+def test_recording_uses_the_default_profile_off_the_event_loop(client, auth_headers, recorded):
+    balanced = screen(client, auth_headers, "balanced")["profiles"]["balanced"]
+
+    response = client.post("/api/v1/investment-engine/screener/record-signals", headers=auth_headers,
+                           params={"symbols": "AAPL,MSFT,NVDA"})
+
+    assert response.status_code == 200
+    assert response.json()["profile"] == "balanced"
+    scores = {row["symbol"]: row["master_score"] for row in balanced}
+    assert {s["symbol"]: round(s["master_score"], 2) for s in recorded["signals"]} == scores
+    assert recorded["on_event_loop"] == [False]
+
+
+def test_decision_records_the_default_profile_off_the_event_loop(client, auth_headers, recorded, make_history,
+                                                                 monkeypatch):
+    from app.api.routes import investment_engine
+
+    monkeypatch.setattr(investment_engine, "fetch_yfinance_data", lambda symbol, timeframe: make_history(300))
+    params = {"include_sentiment": False, "include_activity": False}
+
+    def decide(profile):
+        response = client.get("/api/v1/investment-engine/decision/AAPL", headers=auth_headers,
+                              params={**params, "profile": profile})
+        assert response.status_code == 200
+        return response.json()["master_score"]["master_score"]
+
+    balanced = decide("balanced")
+    momentum = decide("momentum")
+
+    assert momentum != balanced
+    assert [s["master_score"] for s in recorded["signals"]] == [balanced, balanced]
+    assert recorded["on_event_loop"] == [False, False]
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from app.services import symbol_search as search_module
+from app.services.symbol_search import SymbolSearchService
+
+
+class Response:
+    def __init__(self, status_code, quotes=()):
+        self.status_code = status_code
+        self._quotes = list(quotes)
+
+    def json(self):
+        return {"quotes": self._quotes}
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    """Queries sent to the (faked) search API and the responses it returns"""
+    state = {"queries": [], "responses": []}
+
+    def get(url, params, **kwargs):
+        state["queries"].append(params["q"])
+        response = state["responses"].pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(search_module.requests, "get", get)
+    return state
+
+
+def quote(symbol, name):
+    return {"symbol": symbol, "shortname": name, "exchange": "NMS", "quoteType": "EQUITY"}
+
+
+def test_fewer_local_hits_than_the_limit_query_upstream(db, remote):
+    service = SymbolSearchService()
+    service.store(db, [{"symbol": "APPL", "name": "Appleton", "exchange": "NMS", "quote_type": "EQUITY"}])
+    remote["responses"].append(Response(200, [quote("AAPL", "Apple Inc."), quote("APP", "AppLovin")]))
+
+    results = asyncio.run(service.search(db, "app", limit=3))
+    assert [r["symbol"] for r in results] == ["APP", "APPL", "AAPL"]
+
+    assert len(asyncio.run(service.search(db, "app", limit=5))) == 3
+    assert remote["queries"] == ["app"]  # Answered upstream within the TTL
+
+
+def test_a_full_local_answer_skips_upstream(db, remote):
+    service = SymbolSearchService()
+    service.store(db, [
+        {"symbol": s, "name": n, "exchange": "NMS", "quote_type": "EQUITY"}
+        for s, n in [("MSFT", "Microsoft"), ("MS", "Morgan Stanley")]
+    ])
+
+    assert [r["symbol"] for r in asyncio.run(service.search(db, "ms", limit=2))] == ["MS", "MSFT"]
+    assert remote["queries"] == []
+
+
+@pytest.mark.parametrize("failure", [Response(503), ConnectionError("offline")])
+def test_failed_remote_queries_are_retried(db, remote, failure):
+    service = SymbolSearchService()
+    remote["responses"] += [failure, Response(200, [quote("NVDA", "NVIDIA")])]
+
+    assert asyncio.run(service.search(db, "nvidia")) == []
+    assert [r["symbol"] for r in asyncio.run(service.search(db, "nvidia"))] == ["NVDA"]
+    assert remote["queries"] == ["nvidia", "nvidia"]
+
+
+def test_loading_and_storing_run_off_the_event_loop(db, remote, on_event_loop, monkeypatch):
+    service = SymbolSearchService()
+    calls = []
+    for name in ("ensure_loaded", "store"):
+        method = getattr(service, name)
+        monkeypatch.setattr(service, name,
+                            lambda *args, name=name, method=method: calls.append((name, on_event_loop())) or method(*args))
+    remote["responses"].append(Response(200, [quote("NVDA", "NVIDIA")]))
+
+    asyncio.run(service.search(db, "nvidia"))
+
+    assert calls == [("ensure_loaded", False), ("store", False)]
@@ -0,0 +1,61 @@
+import json
+
+import pandas as pd
+
+from app.models.investment_engine import UnusualActivity
+from app.services.unusual_activity_service import UnusualActivityService
+
+
+def spike(severity="HIGH", z_score=4.0):
+    return {"type": "VOLUME_SPIKE", "severity": severity, "confidence": 80.0,
+            "details": {"z_score": z_score}, "price_at_detection": 101.0}
+
+
+def evaluation(day):
+    return {"timestamp": pd.Timestamp(day), "current_volume": 5_000_000.0}
+
+
+def active_rows(db):
+    return db.query(UnusualActivity).filter(UnusualActivity.is_active == True).all()
+
+
+def test_detection_on_a_new_bar_resolves_the_previous_row(db):
+    service = UnusualActivityService(db)
+
+    assert service.persist_activities("AAPL", [spike()], evaluation("2024-10-01"), "1D") == [spike()]
+    assert service.persist_activities("AAPL", [spike()], evaluation("2024-10-02"), "1D") == [spike()]
+
+    rows = db.query(UnusualActivity).order_by(UnusualActivity.id).all()
+    assert [row.is_active for row in rows] == [False, True]
+    assert rows[0].resolved_at is not None
+    assert json.loads(rows[1].details)["bar_timestamp"].startswith("2024-10-02")
+
+
+def test_repeated_detection_of_a_bar_updates_its_row(db):
+    service = UnusualActivityService(db)
+    service.persist_activities("AAPL", [spike("MEDIUM", 3.1)], evaluation("2024-10-01"), "1D")
+
+    assert service.persist_activities("AAPL", [spike("EXTREME", 9.5)], evaluation("2024-10-01"), "1D") == []
+
+    rows = active_rows(db)
+    assert len(rows) == 1
+    assert (rows[0].severity, rows[0].benchmark_deviation) == ("EXTREME", 9.5)
+
+
+def test_activity_no_longer_detected_is_resolved(db):
+    service = UnusualActivityService(db)
+    service.persist_activities("AAPL", [spike()], evaluation("2024-10-01"), "1D")
+    service.persist_activities("AAPL", [], evaluation("2024-10-02"), "1D")
+
+    assert active_rows(db) == []
+
+
+def test_other_timeframes_do_not_resolve_active_rows(db):
+    service = UnusualActivityService(db)
+    service.persist_activities("AAPL", [spike()], evaluation("2024-10-01"), "1D")
+
+    service.persist_activities("aapl", [], evaluation("2024-10-01"), "3M")  # On-demand check, as passed by the route
+    service.persist_activities("aapl", [spike()], evaluation("2024-10-02"), "3M")
+
+    rows = active_rows(db)
+    assert sorted((row.symbol, row.timeframe) for row in rows) == [("AAPL", "1D"), ("AAPL", "3M")]
@@ -0,0 +1,74 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import volume_profile as profile_module
+from app.services.volume_profile import VolumeProfileStore, apply_profile, build_profile
+
+
+def intraday(sessions=8, start="2024-10-01"):
+    """5-minute bars from 9:30 to 16:00 with heavy open/close volume"""
+    days = pd.bdate_range(start, periods=sessions)
+    index = pd.DatetimeIndex([
+        ts for day in days for ts in pd.date_range(day + pd.Timedelta("9h30min"), periods=78, freq="5min")
+    ])
+    minutes = np.asarray(index.hour * 60 + index.minute, dtype=float)
+    volume = 1_000 + 50 * np.abs(minutes - 765)
+    volume *= 1 + 0.1 * (np.asarray(index.day) % 3)
+    close = np.full(len(index), 100.0)
+    return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": volume}, index=index)
+
+
+def test_profile_uses_earlier_sessions_per_time_of_day():
+    hist = intraday()
+    last_session = hist.index[-1].date()
+    profile = build_profile(hist, 5, before=last_session)
+
+    opening = hist.index[0]
+    earlier = hist[(hist.index.date < last_session) & (hist.index.time == opening.time())]["Volume"]
+    mean, std, sessions = profile.lookup(opening)
+    assert sessions == 7
+    assert mean == pytest.approx(earlier.mean())
+    assert std == pytest.approx(earlier.std(ddof=0))
+
+
+def test_thin_buckets_are_not_used():
+    hist = intraday(sessions=3)
+    profile = build_profile(hist, 5)
+    evaluation = {"timestamp": hist.index[0], "current_volume": 50_000.0, "average_volume": 2_000.0,
+                  "volume_count": 20, "volume_z_score": 9.0, "volume_baseline": "rolling"}
+
+    assert profile.lookup(hist.index[0]) is None
+    assert apply_profile(dict(evaluation), profile) == evaluation
+
+
+def test_opening_volume_is_compared_with_earlier_openings():
+    hist = intraday()
+    profile = build_profile(hist, 5, before=hist.index[-1].date())
+    opening = hist.index[-78]
+    evaluation = {"timestamp": opening, "current_volume": float(hist["Volume"].iloc[-78]),
+                  "average_volume": float(hist["Volume"].mean()), "volume_count": 20,
+                  "volume_z_score": 5.0, "volume_baseline": "rolling"}
+
+    applied = apply_profile(evaluation, profile)
+    assert applied["volume_baseline"] == "time_of_day"
+    assert abs(applied["volume_z_score"]) < 2
+
+
+def test_profiles_are_built_once_per_session(monkeypatch):
+    hist = intraday()
+    fetches = []
+    monkeypatch.setattr(profile_module.bar_store, "get_histories",
+                        lambda symbols, timeframe: fetches.append(list(symbols)) or {s: hist for s in symbols})
+    store = VolumeProfileStore()
+    session = hist.index[-1].date()
+
+    first = store.get_profiles(["aapl"], "1D", session)
+    second = store.get_profiles(["AAPL"], "1D", session)
+    store.get_profiles(["AAPL"], "1D", date(2024, 10, 11))
+
+    assert second["AAPL"] is first["AAPL"]
+    assert fetches == [["AAPL"], ["AAPL"]]
+    assert store.get_profiles(["AAPL"], "1Y", session) == {}
@@ -18,6 +18,7 @@ export interface MarketData {
   chart_data: number[]
   currency?: string
   currencySymbol?: string
+  priceDivisor?: number
 }
 
 /** Technical Indicators */
@@ -160,6 +161,8 @@ export interface MarketAnalysis {
 export interface CurrencyInfo {
   currency: string
   currencySymbol: string
+  /** Prices divided by this are amounts in currencySymbol (100 for GBp: pence quotes) */
+  priceDivisor?: number
 }
 
 /** Market Analysis Response (from API) */